@@ -1,11 +1,10 @@
 """CF:ICPC API — FastAPI backend."""
 
-import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 # Load .env from backend/ directory (or project root)
 _backend_dir = Path(__file__).parent
@@ -13,30 +12,20 @@ load_dotenv(_backend_dir / ".env")
 load_dotenv(_backend_dir.parent / ".env")
 from fastapi.middleware.cors import CORSMiddleware
 
-from routers import codeforces, contests, editorials, graph, journals, leaderboard, notes, problems, recommendations, regionals, review, rotations, solve_quality, tags, team, upsolve
+from services import warmup
+from routers import codeforces, contests, editorials, graph, journals, leaderboard, notes, problems, recommendations, regionals, review, rotations, search, solve_quality, tags, team, upsolve
 
-logger = logging.getLogger(__name__)
+DATA_DIR = _backend_dir / "data"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Build curated graph on startup if missing (e.g. fresh Heroku deploy)
-    try:
-        from services.graph_builder import build_curated_graph
-        logger.info("Checking for graph.json...")
-        build_curated_graph()
-    except Exception as e:
-        logger.warning(f"Could not build curated graph: {e}")
-
-    # Pre-load embedding model and FAISS index on startup to avoid cold-start 500s
-    try:
-        from services.note_embeddings import _load_index
-        logger.info("Pre-loading FAISS index...")
-        _load_index()
-        logger.info("FAISS index ready.")
-    except Exception as e:
-        logger.warning(f"Could not pre-load FAISS index: {e}")
+    # Graph build (if missing, e.g. fresh Heroku deploy), FAISS load and the
+    # search index run in the background; routes that need them answer 503
+    # until they're ready
+    warmup.start()
     yield
+    warmup.shutdown()
 
 
 app = FastAPI(
@@ -52,6 +41,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 app.include_router(problems.router, prefix="/api/problems", tags=["problems"])
@@ -68,10 +58,46 @@ app.include_router(leaderboard.router, prefix="/api/leaderboard", tags=["leaderb
 app.include_router(tags.router, prefix="/api/tags", tags=["tags"])
 app.include_router(notes.router, prefix="/api/notes", tags=["notes"])
 app.include_router(journals.router, prefix="/api/journals", tags=["journals"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(solve_quality.router, prefix="/api/solve-quality", tags=["solve-quality"])
 app.include_router(rotations.router, prefix="/api/rotations", tags=["rotations"])
 
 
 @app.get("/api/health")
-async def health() -> dict[str, str]:
+async def health() -> dict[str, object]:
+    """Overall status plus each warm-up component's state."""
+    components = warmup.status()
+    states = {c["status"] for c in components.values()}
+    if states <= {"ready"}:
+        overall = "ok"
+    elif states & {"pending", "loading"}:
+        overall = "starting"
+    else:
+        overall = "degraded"
+    return {"status": overall, "components": components}
+
+
+@app.get("/api/health/live")
+async def health_live() -> dict[str, str]:
+    """Liveness: the process is up and serving requests."""
     return {"status": "ok"}
+
+
+@app.get("/api/health/ready")
+async def health_ready(response: Response) -> dict[str, object]:
+    """Readiness: problems.json is in place and the graph warm-up has finished.
+
+    A failed graph warm-up still counts as ready, since graph routes fall back
+    to loading on first use; the body reports it as degraded.
+    """
+    graph = warmup.status()["graph"]
+    checks = {
+        "problems": (DATA_DIR / "problems.json").exists(),
+        "graph": graph["status"] in ("ready", "failed"),
+    }
+    if not all(checks.values()):
+        response.status_code = 503
+        return {"status": "starting", "checks": checks}
+    if graph["status"] == "failed":
+        return {"status": "degraded", "checks": checks, "errors": {"graph": graph["error"]}}
+    return {"status": "ready", "checks": checks}
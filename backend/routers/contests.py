@@ -1,14 +1,17 @@
 """Contests router — virtual contest tracking and trends."""
 
+import base64
 import json
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
 
+from services import combo_store, contest_index, upsolve_index
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 CONTESTS_FILE = DATA_DIR / "contests.json"
 
@@ -109,6 +112,28 @@ def _find_contest(data: dict[str, Any], contest_id: str) -> dict[str, Any]:
     raise HTTPException(status_code=404, detail=f"Contest {contest_id} not found")
 
 
+def _encode_cursor(c: dict[str, Any]) -> str:
+    key = [c["date"], c.get("created_at", ""), c["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str, str]:
+    try:
+        date, created_at, cid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(date), str(created_at), str(cid)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def notify_contest_saved(
+    contests: list[dict[str, Any]], contest_id: str, contest: dict[str, Any] | None
+) -> None:
+    """Keep the materialized views in step after contests.json was saved."""
+    contest_index.apply_contest_change(contests, contest_id, contest)
+    combo_store.apply_contest_change(contests, contest_id, contest)
+    upsolve_index.apply_contest_change(contests, contest_id, contest)
+
+
 def _to_response(c: dict[str, Any]) -> ContestResponse:
     results = c.get("results", [])
     solved = [r for r in results if r.get("solved_by_team")]
@@ -138,64 +163,35 @@ def _to_response(c: dict[str, Any]) -> ContestResponse:
 
 
 @router.get("/")
-async def list_contests() -> list[ContestResponse]:
-    """List all virtual contests, sorted by date descending."""
-    data = load_contests()
-    contests = [_to_response(c) for c in data["contests"]]
-    contests.sort(key=lambda c: c.date, reverse=True)
-    return contests
+async def list_contests(
+    response: Response,
+    cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page"),
+    limit: int | None = Query(default=None, ge=1, le=200, description="Page size (default all)"),
+    date_from: str | None = Query(default=None, description="Earliest date, YYYY-MM-DD"),
+    date_to: str | None = Query(default=None, description="Latest date, YYYY-MM-DD"),
+    team_label: str | None = Query(default=None, description="Only contests with a team of this label"),
+) -> list[ContestResponse]:
+    """List virtual contests, sorted by date descending.
+
+    Paged by cursor: when more contests match, the X-Next-Cursor header holds
+    the cursor for the next page. X-Total-Count is the number of matches.
+    """
+    page, total, last = contest_index.load().page(
+        _decode_cursor(cursor) if cursor else None, limit, date_from, date_to, team_label
+    )
+    response.headers["X-Total-Count"] = str(total)
+    if last is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(last)
+    return [_to_response(c) for c in page]
 
 
 @router.get("/trends")
-async def get_trends() -> TrendsResponse:
-    """Aggregated trend data across all virtual contests."""
-    data = load_contests()
-    sorted_contests = sorted(data["contests"], key=lambda c: c["date"])
-
-    points: list[TrendPoint] = []
-    for c in sorted_contests:
-        results = c.get("results", [])
-        solved = [r for r in results if r.get("solved_by_team")]
-        counts_by_team: dict[str, int] = {}
-        times_by_team: dict[str, list[int]] = {}
-        all_times: list[int] = []
-
-        for r in solved:
-            team = r["solved_by_team"]
-            counts_by_team[team] = counts_by_team.get(team, 0) + 1
-            if r.get("solve_time_minutes") is not None:
-                times_by_team.setdefault(team, []).append(r["solve_time_minutes"])
-                all_times.append(r["solve_time_minutes"])
-
-        avg_time = sum(all_times) / len(all_times) if all_times else None
-        avg_times_by_team = {
-            t: sum(ts) / len(ts) for t, ts in times_by_team.items()
-        }
-
-        points.append(TrendPoint(
-            contest_id=c["id"],
-            date=c["date"],
-            contest_name=c["contest_name"],
-            total_problems=len(results),
-            solved_count=len(solved),
-            solve_counts_by_team=counts_by_team,
-            avg_solve_time_minutes=avg_time,
-            avg_solve_times_by_team=avg_times_by_team,
-        ))
-
-    all_solves = [p.solved_count for p in points]
-    all_avg_times = [p.avg_solve_time_minutes for p in points if p.avg_solve_time_minutes is not None]
-    recent = points[-5:] if len(points) >= 5 else points
-    recent_solves = [p.solved_count for p in recent]
-    recent_times = [p.avg_solve_time_minutes for p in recent if p.avg_solve_time_minutes is not None]
-
-    return TrendsResponse(
-        points=points,
-        overall_avg_solves=sum(all_solves) / len(all_solves) if all_solves else 0,
-        overall_avg_time=sum(all_avg_times) / len(all_avg_times) if all_avg_times else None,
-        recent_avg_solves=sum(recent_solves) / len(recent_solves) if recent_solves else 0,
-        recent_avg_time=sum(recent_times) / len(recent_times) if recent_times else None,
-    )
+async def get_trends(
+    date_from: str | None = Query(default=None, description="Earliest date, YYYY-MM-DD"),
+    date_to: str | None = Query(default=None, description="Latest date, YYYY-MM-DD"),
+) -> TrendsResponse:
+    """Aggregated trend data across virtual contests (optionally a date range)."""
+    return TrendsResponse(**contest_index.load().trends(date_from, date_to))
 
 
 @router.get("/{contest_id}")
@@ -224,6 +220,7 @@ async def create_contest(body: ContestCreate) -> ContestResponse:
     }
     data["contests"].append(entry)
     save_contests(data)
+    notify_contest_saved(data["contests"], entry["id"], entry)
     return _to_response(entry)
 
 
@@ -245,6 +242,7 @@ async def update_contest(contest_id: str, body: ContestUpdate) -> ContestRespons
     if body.notes is not None:
         c["notes"] = body.notes
     save_contests(data)
+    notify_contest_saved(data["contests"], c["id"], c)
     return _to_response(c)
 
 
@@ -257,4 +255,5 @@ async def delete_contest(contest_id: str) -> dict[str, str]:
     if len(data["contests"]) == before:
         raise HTTPException(status_code=404, detail=f"Contest {contest_id} not found")
     save_contests(data)
+    notify_contest_saved(data["contests"], contest_id, None)
     return {"status": "deleted", "id": contest_id}
@@ -1,11 +1,16 @@
 """Graph router — serves problem similarity graph."""
 
 import json
-import re
+import math
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+
+from services import artifacts, catalog_index, cosmos_space, cosmos_tiles, graph_clusters, graph_paths, graph_store
+from services import curated_subgraph as curated_store
 
 router = APIRouter()
 
@@ -20,20 +25,60 @@ def _load_graph() -> dict[str, Any] | None:
         return json.load(f)
 
 
-def _load_problems() -> list[dict[str, Any]]:
-    path = DATA_DIR / "problems.json"
-    if not path.exists():
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+def _accepted_codings(header: str) -> set[str]:
+    """Content-codings the client accepts (q > 0) from an Accept-Encoding header."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
 
 
-def _problem_id_to_graph_key(pid: str) -> str | None:
-    """Convert problem ID like '1A' or '1352C2' to graph key like '1/A' or '1352/C2'."""
-    m = re.match(r"^(\d+)([A-Za-z]\d*)$", pid)
-    if not m:
-        return None
-    return f"{m.group(1)}/{m.group(2)}"
+def _not_modified(request: Request, digest: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag == "*" or tag.split("-", 1)[0] == digest:
+                return True
+        return False
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _artifact_response(request: Request, path: Path) -> Response:
+    """Serve a JSON artifact file as-is: pre-compressed, with ETag/Last-Modified and 304s."""
+    digest = artifacts.digest(path)
+    mtime = path.stat().st_mtime
+    headers = {
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    available = artifacts.encodings(path)
+    accepted = _accepted_codings(request.headers.get("accept-encoding", ""))
+    coding = next((c for c in ("br", "gzip") if c in accepted and c in available), "identity")
+    # Strong validators are per representation; the suffix is ignored when matching
+    headers["ETag"] = f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+
+    if _not_modified(request, digest, mtime):
+        return Response(status_code=304, headers=headers)
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+    return FileResponse(available[coding], media_type="application/json", headers=headers)
 
 
 @router.get("/")
@@ -46,77 +91,266 @@ async def graph_meta() -> dict[str, Any]:
 
 
 @router.get("/curated-subgraph")
-async def curated_subgraph() -> dict[str, Any]:
-    """Return the subgraph of curated problems with mutual similarity edges."""
-    graph = _load_graph()
-    if not graph:
-        raise HTTPException(status_code=404, detail="Graph not built yet.")
+def curated_subgraph(request: Request) -> Response:
+    """Return the subgraph of curated problems with mutual similarity edges.
 
-    problems = _load_problems()
-    if not problems:
+    Precomputed per graph.json / problems.json version and served with an ETag.
+    """
+    if not (DATA_DIR / "graph.json").exists():
+        raise HTTPException(status_code=404, detail="Graph not built yet.")
+    if curated_store.ensure() is None:
         raise HTTPException(status_code=404, detail="No curated problems found.")
+    return _artifact_response(request, curated_store.SUBGRAPH_FILE)
+
+
+@router.get("/clusters")
+def clusters(request: Request) -> Response:
+    """Return graph communities: per-cluster stats plus each problem's cluster id.
+
+    Computed once per graph.json / problems.json / catalog version and served
+    with an ETag.
+    """
+    if graph_clusters.ensure() is None:
+        raise HTTPException(status_code=404, detail="Graph not built yet.")
+    return _artifact_response(request, graph_clusters.CLUSTERS_FILE)
+
 
-    # Build set of curated problem IDs and their graph keys
-    curated_ids: set[str] = set()
-    id_to_key: dict[str, str] = {}
-    key_to_id: dict[str, str] = {}
-    for p in problems:
-        pid = p["id"]
-        gkey = _problem_id_to_graph_key(pid)
-        if gkey:
-            curated_ids.add(pid)
-            id_to_key[pid] = gkey
-            key_to_id[gkey] = pid
-
-    neighbors = graph.get("neighbors", {})
-
-    # Build nodes
-    nodes = [
-        {
-            "id": p["id"],
-            "name": p["name"],
-            "rating": p.get("rating", 0),
-            "topic": p.get("topic", ""),
-        }
-        for p in problems
-        if p["id"] in curated_ids
-    ]
-
-    # Build edges: only between curated problems, deduplicated
-    seen_edges: set[tuple[str, str]] = set()
-    edges: list[dict[str, Any]] = []
-    for pid in curated_ids:
-        gkey = id_to_key.get(pid)
-        if not gkey or gkey not in neighbors:
-            continue
-        for nb in neighbors[gkey]:
-            nb_id = key_to_id.get(nb["id"])
-            if not nb_id or nb_id not in curated_ids:
-                continue
-            edge_key = (min(pid, nb_id), max(pid, nb_id))
-            if edge_key in seen_edges:
-                continue
-            seen_edges.add(edge_key)
-            edges.append({
-                "source": pid,
-                "target": nb_id,
-                "score": nb["score"],
-            })
-
-    return {"nodes": nodes, "edges": edges}
+@router.get("/clusters/{cluster_id}")
+def cluster_detail(cluster_id: int, limit: int = Query(default=500, ge=1, le=5000)) -> dict[str, Any]:
+    """One cluster's stats and its member problems, easiest first."""
+    if graph_clusters.ensure() is None:
+        raise HTTPException(status_code=404, detail="Graph not built yet.")
+    data = graph_clusters.load()
+    if not 0 <= cluster_id < len(data["clusters"]):
+        raise HTTPException(status_code=404, detail=f"Cluster {cluster_id} not found.")
+    keys = [k for k, c in data["assignments"].items() if c == cluster_id]
+    info = _problem_info(keys)
+    members = [{"id": k, **info.get(k, {"name": None, "rating": None})} for k in keys]
+    members.sort(key=lambda m: (m["rating"] or 0, m["id"]))
+    return {**data["clusters"][cluster_id], "members": members[:limit]}
 
 
 @router.get("/cosmos")
-async def cosmos_data() -> dict[str, Any]:
-    """Return all problems with pre-computed 3D positions for the cosmos visualization."""
+def cosmos_data(request: Request) -> Response:
+    """Return all problems with pre-computed 3D positions for the cosmos visualization.
+
+    positions.json is served byte-for-byte (gzip/brotli sidecars when the
+    client accepts them) and revalidates via ETag / Last-Modified.
+    """
     path = DATA_DIR / "positions.json"
     if not path.exists():
         raise HTTPException(
             status_code=404,
             detail="Positions not built yet. Run scripts/build_positions.py first.",
         )
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _artifact_response(request, path)
+
+
+def _ensure_cosmos_tiles() -> None:
+    if not cosmos_tiles.ensure_built():
+        raise HTTPException(
+            status_code=404,
+            detail="Positions not built yet. Run scripts/build_positions.py first.",
+        )
+
+
+@router.get("/cosmos/manifest")
+def cosmos_manifest(request: Request) -> Response:
+    """Binary Cosmos layout: column dtypes, tag list, bounds and octree tiles."""
+    _ensure_cosmos_tiles()
+    return _artifact_response(request, cosmos_tiles.MANIFEST_FILE)
+
+
+@router.get("/cosmos/names")
+def cosmos_names(request: Request) -> Response:
+    """Problem IDs and names in stored point order (fetched lazily by the client)."""
+    _ensure_cosmos_tiles()
+    return _artifact_response(request, cosmos_tiles.NAMES_FILE)
+
+
+@router.get("/cosmos/tiles/{tile_id}")
+def cosmos_tile(
+    request: Request,
+    tile_id: str,
+    v: str | None = Query(default=None, description="Manifest version; makes the response immutable"),
+) -> Response:
+    """One octree tile: xyz float32, tag bitmask uint32, rating uint16 (little-endian)."""
+    _ensure_cosmos_tiles()
+    manifest = cosmos_tiles.load_manifest()
+    tile = next((t for t in manifest["tiles"] if t["id"] == tile_id), None)
+    if tile is None:
+        raise HTTPException(status_code=404, detail=f"Tile {tile_id} not found.")
+
+    etag = f'"{manifest["version"]}-{tile_id}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if v == manifest["version"] else "no-cache",
+    }
+    if request.headers.get("if-none-match", "").strip().removeprefix("W/") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=cosmos_tiles.tile_bytes(manifest, tile),
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+# The layout spans about [-50, 50] per axis, so this covers the whole cloud
+MAX_QUERY_RADIUS = 500.0
+# Far enough out for any query; larger values overflow the squared distances
+MAX_QUERY_COORD = 1e6
+
+
+def _parse_point(value: str | None, name: str) -> tuple[float, float, float] | None:
+    if value is None:
+        return None
+    try:
+        x, y, z = (float(v) for v in value.split(","))
+        # float() also accepts "nan" and "inf", which the KD-tree rejects
+        if not all(math.isfinite(v) and abs(v) <= MAX_QUERY_COORD for v in (x, y, z)):
+            raise ValueError(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be three comma-separated numbers: x,y,z")
+    return (x, y, z)
+
+
+@router.get("/cosmos/query")
+def cosmos_query(
+    mode: str = Query(..., pattern="^(box|radius|knn)$", description="box, radius or knn"),
+    center: str | None = Query(default=None, description="x,y,z (radius/knn)"),
+    problem_id: str | None = Query(default=None, description="Use this problem's position as the center, e.g. 1/A"),
+    r: float | None = Query(default=None, gt=0, le=MAX_QUERY_RADIUS, description="Radius (radius mode)"),
+    k: int = Query(default=20, ge=1, le=1000, description="Neighbors (knn mode)"),
+    box_min: str | None = Query(default=None, alias="min", description="x,y,z (box mode)"),
+    box_max: str | None = Query(default=None, alias="max", description="x,y,z (box mode)"),
+    limit: int = Query(default=500, ge=1, le=5000),
+) -> dict[str, Any]:
+    """Box, radius or k-nearest query over the Cosmos 3D layout."""
+    space = cosmos_space.load()
+    if space is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Positions not built yet. Run scripts/build_positions.py first.",
+        )
+
+    if mode == "box":
+        lo, hi = _parse_point(box_min, "min"), _parse_point(box_max, "max")
+        if lo is None or hi is None:
+            raise HTTPException(status_code=400, detail="box mode needs min and max")
+        if any(a > b for a, b in zip(lo, hi)):
+            raise HTTPException(status_code=400, detail="min must not exceed max on any axis")
+        problems, total = space.box(lo, hi, limit)
+    else:
+        point = _parse_point(center, "center")
+        if problem_id is not None:
+            if problem_id not in space.pos:
+                raise HTTPException(status_code=404, detail=f"Problem {problem_id} not found in cosmos.")
+            p = space.problems[space.pos[problem_id]]
+            point = (p["x"], p["y"], p["z"])
+        if point is None:
+            raise HTTPException(status_code=400, detail=f"{mode} mode needs center or problem_id")
+        if mode == "radius":
+            if r is None:
+                raise HTTPException(status_code=400, detail="radius mode needs r")
+            problems, total = space.radius(point, r, limit)
+        else:
+            problems, total = space.knn(point, min(k, limit))
+
+    return {
+        "mode": mode,
+        "total": total,
+        "truncated": total > len(problems),
+        "problems": problems,
+    }
+
+
+def _graph_node(graph: graph_paths.SimilarityGraph, problem: str) -> int:
+    """Node index for a problem given as a graph key ('1352/C') or compact ID ('1352C')."""
+    key = problem if "/" in problem else graph_store.compact_to_graph_key(problem)
+    if key is None or key not in graph.pos:
+        raise HTTPException(status_code=404, detail=f"Problem {problem} not found in graph.")
+    return graph.pos[key]
+
+
+def _problem_info(keys: list[str]) -> dict[str, dict[str, Any]]:
+    """Name and rating for graph keys, from the CF catalog or the curated list."""
+    info: dict[str, dict[str, Any]] = {}
+    catalog = catalog_index.get_index()
+    if catalog is not None:
+        for key in keys:
+            pos = catalog.by_id.get(key.replace("/", ""))
+            if pos is not None:
+                p = catalog.problems[pos]
+                info[key] = {"name": p["name"], "rating": p["rating"]}
+    missing = [k for k in keys if k not in info]
+    if missing and (DATA_DIR / "problems.json").exists():
+        with open(DATA_DIR / "problems.json", "r", encoding="utf-8") as f:
+            curated = {graph_store.compact_to_graph_key(p["id"]): p for p in json.load(f)}
+        for key in missing:
+            if key in curated:
+                info[key] = {"name": curated[key]["name"], "rating": curated[key].get("rating", 0)}
+    return info
+
+
+@router.get("/khop/{contest_id}/{index}")
+def k_hop_neighborhood(
+    contest_id: int,
+    index: str,
+    k: int = Query(default=2, ge=1, le=4),
+    min_score: float = Query(default=0.0, ge=0.0, le=1.0),
+    limit: int = Query(default=200, ge=1, le=2000),
+) -> dict[str, Any]:
+    """Problems within k hops, over edges scoring at least min_score."""
+    graph = graph_paths.load()
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Graph not built yet.")
+    source = _graph_node(graph, f"{contest_id}/{index}")
+    nodes = graph_paths.k_hop(graph, source, k, min_score)
+    page = nodes[:limit]
+    info = _problem_info([n["id"] for n in page])
+    for n in page:
+        n.update(info.get(n["id"], {"name": None, "rating": None}))
+    return {
+        "source": graph.keys[source],
+        "k": k,
+        "min_score": min_score,
+        "total": len(nodes),
+        "nodes": page,
+    }
+
+
+@router.get("/path")
+def similarity_path(
+    source: str = Query(..., description="Start problem, e.g. 1/A or 1A"),
+    target: str = Query(..., description="Target problem, e.g. 1352/C or 1352C"),
+    min_score: float = Query(default=0.0, ge=0.0, le=1.0),
+) -> dict[str, Any]:
+    """Highest-similarity path (max product of edge scores) between two problems."""
+    graph = graph_paths.load()
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Graph not built yet.")
+    src, dst = _graph_node(graph, source), _graph_node(graph, target)
+    found = graph_paths.best_path(graph, src, dst, min_score)
+    if found is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No path from {graph.keys[src]} to {graph.keys[dst]} with min_score {min_score}.",
+        )
+    nodes, cost = found
+    keys = [graph.keys[i] for i in nodes]
+    info = _problem_info(keys)
+    steps = []
+    for n, key in enumerate(keys):
+        step = {"id": key, **info.get(key, {"name": None, "rating": None})}
+        step["score"] = graph_paths.edge_score(graph, nodes[n - 1], nodes[n]) if n else None
+        steps.append(step)
+    return {
+        "source": keys[0],
+        "target": keys[-1],
+        "hops": len(nodes) - 1,
+        "similarity": round(math.exp(-cost), 6),
+        "path": steps,
+    }
 
 
 @router.get("/neighbors/{contest_id}/{index}")
@@ -1,15 +1,15 @@
 """Journals router — per-member, per-topic journals with custom topics, search, and recommendations."""
 
 import json
-import re
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from services import text_search, warmup
 from services.note_embeddings import recommend_from_text
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -102,22 +102,21 @@ def _load_team_members() -> list[dict[str, Any]]:
     return team.get("members", [])
 
 
-def _search_score(query: str, text: str) -> float:
-    """Score text relevance to a query using token matching."""
-    query_lower = query.lower()
-    text_lower = text.lower()
-
-    # Exact substring match gets highest score
-    if query_lower in text_lower:
-        return 1.0
+def _journal_documents(data: dict[str, Any]) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Search documents: one per journal entry."""
+    for journal in data.get("journals", []):
+        for entry in journal["entries"]:
+            yield entry["id"], entry["content"], {
+                "id": entry["id"],
+                "content": entry["content"],
+                "created_at": entry["created_at"],
+                "member_id": journal["member_id"],
+                "topic_id": journal["topic_id"],
+                "journal_id": journal["id"],
+            }
 
-    # Token-based matching
-    tokens = re.split(r"\s+", query_lower)
-    if not tokens:
-        return 0.0
 
-    matched = sum(1 for t in tokens if t in text_lower)
-    return matched / len(tokens)
+_search_index = text_search.FileIndex(JOURNALS_FILE, _journal_documents)
 
 
 # ---------------------------------------------------------------------------
@@ -222,6 +221,7 @@ async def add_entry(member_id: int, topic_id: str, body: EntryCreate) -> dict[st
         data["journals"].append(journal)
 
     save_journals(data)
+    _search_index.apply(data, entry["id"])
     return journal
 
 
@@ -243,6 +243,7 @@ async def edit_entry(
             entry["content"] = body.content
             journal["updated_at"] = datetime.now(timezone.utc).isoformat()
             save_journals(data)
+            _search_index.apply(data, entry_id)
             return journal
 
     raise HTTPException(status_code=404, detail=f"Entry {entry_id} not found")
@@ -271,6 +272,7 @@ async def delete_entry(member_id: int, topic_id: str, entry_id: str) -> dict[str
         journal["updated_at"] = datetime.now(timezone.utc).isoformat()
 
     save_journals(data)
+    _search_index.apply(data, entry_id)
     return {"status": "deleted", "entry_id": entry_id}
 
 
@@ -325,39 +327,28 @@ async def search_journals(
     topic_id: str | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
 ) -> list[dict[str, Any]]:
-    """Search journal entries by text content.
+    """Search journal entries by text content (BM25 over the inverted index).
 
     Returns entries scored by relevance with member and topic metadata.
     """
-    data = load_journals()
-    members = _load_team_members()
-    member_map = {m["id"]: m["name"] for m in members}
+    def matches(meta: dict[str, Any]) -> bool:
+        if member_id is not None and meta["member_id"] != member_id:
+            return False
+        return topic_id is None or meta["topic_id"] == topic_id
 
-    scored: list[tuple[float, dict[str, Any]]] = []
-    for journal in data["journals"]:
-        if member_id is not None and journal["member_id"] != member_id:
-            continue
-        if topic_id is not None and journal["topic_id"] != topic_id:
-            continue
+    hits = _search_index.get().search(q, limit, matches)
+    if not hits:
+        return []
 
-        for entry in journal["entries"]:
-            score = _search_score(q, entry["content"])
-            if score > 0:
-                scored.append((score, {
-                    "id": entry["id"],
-                    "content": entry["content"],
-                    "created_at": entry["created_at"],
-                    "member_id": journal["member_id"],
-                    "member_name": member_map.get(
-                        journal["member_id"], f"Member {journal['member_id'] + 1}"
-                    ),
-                    "topic_id": journal["topic_id"],
-                    "journal_id": journal["id"],
-                    "score": round(score, 3),
-                }))
-
-    scored.sort(key=lambda x: (-x[0], x[1]["created_at"]))
-    return [item for _, item in scored[:limit]]
+    member_map = {m["id"]: m["name"] for m in _load_team_members()}
+    return [
+        {
+            **meta,
+            "member_name": member_map.get(meta["member_id"], f"Member {meta['member_id'] + 1}"),
+            "score": round(score, 3),
+        }
+        for score, meta in hits
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -372,6 +363,14 @@ def get_journal_recommendations(
     limit: int = Query(default=10, ge=1, le=50),
 ) -> list[dict[str, Any]]:
     """Get problem recommendations based on combined journal entries."""
+    wait = warmup.retry_after("embeddings")
+    if wait is not None:
+        raise HTTPException(
+            status_code=503,
+            detail="Recommendation index is still loading",
+            headers={"Retry-After": str(wait)},
+        )
+
     data = load_journals()
     journal = _find_journal(data, member_id, topic_id)
 
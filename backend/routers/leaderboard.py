@@ -1,11 +1,13 @@
 """Leaderboard & Weekly Reports — rankings, streaks, weekly stats."""
 
 import json
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
+
+from services import activity_store
 
 router = APIRouter()
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -196,6 +198,51 @@ async def get_leaderboard(
     }
 
 
+@router.get("/activity")
+async def get_activity(
+    start: date | None = Query(default=None, description="First day (UTC), default 364 days before end"),
+    end: date | None = Query(default=None, description="Last day (UTC), default today"),
+    member_ids: list[int] | None = Query(default=None, description="Members to include (default all)"),
+    curated_only: bool = Query(default=False, description="Count only curated problems"),
+) -> dict[str, Any]:
+    """Per-member, per-day solve counts for a heatmap, read from the daily aggregate store."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+
+    team = load_team()
+    members = team["members"]
+    if member_ids is not None:
+        wanted = set(member_ids)
+        members = [m for m in members if m["id"] in wanted]
+
+    # One-time seed for members synced before the aggregate store existed;
+    # once everyone is seeded this is a lookup in the cached index
+    missing = activity_store.unseeded(members)
+    if missing:
+        activity_store.backfill_missing(missing, {p["id"] for p in load_problems()})
+
+    rows = []
+    for m in members:
+        days = activity_store.read_range(m["id"], start, end, curated_only=curated_only)
+        rows.append({
+            "id": m["id"],
+            "name": m["name"],
+            "days": days,
+            "total": sum(d["count"] for d in days),
+            "max": max((d["count"] for d in days), default=0),
+        })
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "curated_only": curated_only,
+        "members": rows,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
 @router.get("/weekly-summary")
 async def get_weekly_summary(
     week_offset: int = Query(default=0, ge=0, le=52, description="0=this week, 1=last week"),
@@ -1,14 +1,15 @@
-"""Notes router — per-member problem notes with embedding-based recommendations."""
+"""Notes router — per-member problem notes with full-text search and embedding-based recommendations."""
 
 import json
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from services import text_search, warmup
 from services.note_embeddings import recommend_from_text
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -82,11 +83,59 @@ def _get_member_avg_rating(member_id: int) -> int:
     return round(sum(ratings) / len(ratings)) if ratings else 0
 
 
+def _load_member_names() -> dict[int, str]:
+    if not TEAM_FILE.exists():
+        return {}
+    with open(TEAM_FILE, "r", encoding="utf-8") as f:
+        team = json.load(f)
+    return {m["id"]: m["name"] for m in team.get("members", [])}
+
+
+def _note_documents(data: dict[str, Any]) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    """Search documents: one per note."""
+    for note in data.get("notes", []):
+        yield note["id"], note["content"], dict(note)
+
+
+_search_index = text_search.FileIndex(NOTES_FILE, _note_documents)
+
+
 # ---------------------------------------------------------------------------
-# Endpoints
+# Endpoints — /search MUST come before /{note_id}
 # ---------------------------------------------------------------------------
 
 
+@router.get("/search")
+async def search_notes(
+    q: str = Query(min_length=1),
+    member_id: int | None = Query(default=None),
+    problem_id: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+) -> list[dict[str, Any]]:
+    """Search notes by text content (BM25 over the inverted index).
+
+    Returns notes scored by relevance, with the author's name.
+    """
+    def matches(meta: dict[str, Any]) -> bool:
+        if member_id is not None and meta["member_id"] != member_id:
+            return False
+        return problem_id is None or meta["problem_id"] == problem_id
+
+    hits = _search_index.get().search(q, limit, matches)
+    if not hits:
+        return []
+
+    member_map = _load_member_names()
+    return [
+        {
+            **meta,
+            "member_name": member_map.get(meta["member_id"], f"Member {meta['member_id'] + 1}"),
+            "score": round(score, 3),
+        }
+        for score, meta in hits
+    ]
+
+
 @router.get("/member/{member_id}")
 async def get_member_notes(member_id: int) -> list[dict[str, Any]]:
     """List all notes for a member, sorted by most recently updated."""
@@ -125,6 +174,7 @@ async def save_note(body: NoteCreate) -> dict[str, Any]:
             note["content"] = body.content
             note["updated_at"] = now
             save_notes(data)
+            _search_index.apply(data, note["id"])
             return note
 
     # Create new note
@@ -138,6 +188,7 @@ async def save_note(body: NoteCreate) -> dict[str, Any]:
     }
     data["notes"].append(note)
     save_notes(data)
+    _search_index.apply(data, note["id"])
     return note
 
 
@@ -150,6 +201,7 @@ async def delete_note(note_id: str) -> dict[str, str]:
     if len(data["notes"]) == before:
         raise HTTPException(status_code=404, detail=f"Note {note_id} not found")
     save_notes(data)
+    _search_index.apply(data, note_id)
     return {"status": "deleted", "id": note_id}
 
 
@@ -160,6 +212,14 @@ def get_note_recommendations(
     limit: int = Query(default=10, ge=1, le=50),
 ) -> list[dict[str, Any]]:
     """Get problem recommendations based on a note's content."""
+    wait = warmup.retry_after("embeddings")
+    if wait is not None:
+        raise HTTPException(
+            status_code=503,
+            detail="Recommendation index is still loading",
+            headers={"Retry-After": str(wait)},
+        )
+
     data = load_notes()
 
     note = None
@@ -7,6 +7,9 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query
 
+from services import catalog_index, graph_walk, recommendation_pool
+from services.recommendation_pool import generate_reason, get_avg_rating, get_topic_counts
+
 router = APIRouter()
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -59,61 +62,109 @@ def _find_member(team: dict[str, Any], member_id: int) -> dict[str, Any]:
     raise HTTPException(status_code=404, detail=f"Member {member_id} not found")
 
 
-def _get_avg_rating(
-    solved_ids: set[str],
-    problems_map: dict[str, dict[str, Any]],
-    member: dict[str, Any] | None = None,
-) -> float:
-    """Calculate average rating, blending CF and LC signals.
+# NOTE: must be declared before the /{member_id} routes so "batch" is not parsed as a member ID
+@router.get("/batch")
+def get_batch_recommendations(
+    member_ids: list[int] | None = Query(default=None, description="Members to score (default all active)"),
+    limit: int = Query(default=10, ge=1, le=50),
+    difficulty_range: int = Query(default=200, ge=0, le=400, description="Max rating difference from member's level"),
+) -> dict[str, Any]:
+    """Discovery recommendations for several members in one pass.
 
-    CF ratings are weighted by solve quality (editorial solves count less).
-    LC estimated rating is blended in at 0.5 weight per solve.
+    Problems and topics are loaded once and every member is scored against the
+    same candidate matrix, with solved sets as boolean masks.
     """
-    editorial_flags = (member or {}).get("editorial_flags") or {}
-    solve_quality = (member or {}).get("solve_quality") or {}
+    team = _load_team()
+    if member_ids is None:
+        members = [m for m in team["members"] if m.get("active", True)]
+    else:
+        members = [_find_member(team, mid) for mid in dict.fromkeys(member_ids)]
+
+    matrix = recommendation_pool.get_candidate_matrix()
+    if not matrix.problems:
+        raise HTTPException(status_code=404, detail="No problems found.")
+
+    return {
+        "difficulty_range": difficulty_range,
+        "limit": limit,
+        "members": matrix.score_members(members, difficulty_range, limit),
+    }
 
-    weighted_sum = 0.0
-    cf_weight = 0.0
-    for pid in solved_ids:
-        if pid not in problems_map or not problems_map[pid].get("rating"):
-            continue
-        rating = problems_map[pid]["rating"]
 
-        # Apply solve quality weight
-        if pid in editorial_flags:
-            w = 0.5
-        else:
-            sq = solve_quality.get(pid)
-            w = sq["weight"] if sq else 1.0
+@router.get("/{member_id}/catalog")
+def get_catalog_recommendations(
+    member_id: int,
+    limit: int = Query(default=10, ge=1, le=50),
+    difficulty_range: int = Query(default=200, ge=0, le=400, description="Max rating above member's level"),
+) -> dict[str, Any]:
+    """Recommend from the full Codeforces catalog, not just the curated set.
+
+    Ranks unsolved problems by topic weakness, rating fit, and graph proximity
+    to the member's recent solves, using precomputed rating/topic indexes.
+    """
+    team = _load_team()
+    member = _find_member(team, member_id)
 
-        weighted_sum += rating * w
-        cf_weight += w
+    problems_map = {p["id"]: p for p in _load_problems()}
+    fallback_level = get_avg_rating(set(member.get("solved_curated", [])), problems_map, member)
+    topic_names = {tid: t.get("name", tid) for tid, t in _load_topics().get("topics", {}).items()}
 
-    cf_avg = weighted_sum / cf_weight if cf_weight > 0 else 1200
+    try:
+        result = catalog_index.recommend(member, fallback_level, topic_names, difficulty_range, limit)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    # Blend with LC estimated rating if available
-    lc_data = (member or {}).get("lc_data") or {}
-    lc_estimated = lc_data.get("estimated_cf_rating")
-    if lc_estimated is None:
-        return cf_avg
+    return {
+        "member_id": member_id,
+        "member_name": member["name"],
+        **result,
+    }
 
-    # LC gets 0.5 weight per solve (lower confidence in LC-to-CF mapping)
-    lc_total = lc_data.get("difficulty_stats", {}).get("All", 0)
-    lc_weight = lc_total * 0.5
-    total_weight = max(cf_weight, 1.0) + lc_weight
 
-    return (cf_avg * max(cf_weight, 1.0) + lc_estimated * lc_weight) / total_weight
+@router.get("/{member_id}/walk")
+def get_walk_recommendations(
+    member_id: int,
+    limit: int = Query(default=10, ge=1, le=50),
+    restart: float = Query(default=0.15, gt=0.0, lt=1.0, description="Random-walk restart probability"),
+) -> dict[str, Any]:
+    """Multi-hop recommendations via personalized PageRank from recent solves."""
+    team = _load_team()
+    member = _find_member(team, member_id)
 
+    try:
+        result = graph_walk.walk_recommendations(member, limit, restart)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    problems_map = {p["id"]: p for p in _load_problems()}
+    index = catalog_index.get_index()
+
+    recommendations = []
+    for key, score in result["ranked"]:
+        pid = key.replace("/", "")
+        prob = problems_map.get(pid)
+        if prob is None and index is not None and pid in index.by_id:
+            prob = index.problems[index.by_id[pid]]
+        recommendations.append({
+            "id": pid,
+            "name": prob["name"] if prob else key,
+            "rating": prob.get("rating", 0) if prob else 0,
+            "topic": prob.get("topic", "") if prob else "",
+            "url": prob.get("url", "") if prob else f"https://codeforces.com/problemset/problem/{key}",
+            "curated": pid in problems_map,
+            "score": round(score, 6),
+        })
 
-def _get_topic_counts(solved_ids: set[str], problems_map: dict[str, dict[str, Any]]) -> dict[str, int]:
-    """Count solved problems per topic."""
-    counts: dict[str, int] = {}
-    for pid in solved_ids:
-        if pid in problems_map:
-            topic = problems_map[pid].get("topic", "")
-            if topic:
-                counts[topic] = counts.get(topic, 0) + 1
-    return counts
+    return {
+        "member_id": member_id,
+        "member_name": member["name"],
+        "restart": restart,
+        "from_cache": result["from_cache"],
+        "compute_ms": result["compute_ms"],
+        "recommendations": recommendations,
+    }
 
 
 @router.get("/{member_id}")
@@ -129,17 +180,36 @@ async def get_recommendations(
     If seed_problem is provided, recommendations are based on similar problems in the graph.
     Otherwise, recommendations are based on the member's weakest topics and difficulty progression.
     """
+    team = _load_team()
+    member = _find_member(team, member_id)
+
+    if not seed_problem:
+        # Discovery mode: serve the member's pre-scored candidate pool
+        pool = recommendation_pool.get_pool(member)
+        if not pool["candidates"] and not _load_problems():
+            raise HTTPException(status_code=404, detail="No problems found.")
+        return {
+            "member_id": member_id,
+            "member_name": member["name"],
+            "member_avg_rating": round(pool["avg_rating"]),
+            "solved_count": pool["solved_count"],
+            "seed_problem": None,
+            "lc_skill_applied": pool["lc_skill_applied"],
+            "recommendations": [
+                {**c, "score": round(c["score"], 3)}
+                for c in recommendation_pool.select(pool, difficulty_range, limit)
+            ],
+        }
+
+    # Seed mode: rank graph neighbors of a specific problem
     graph = _load_graph()
-    if not graph and seed_problem:
+    if not graph:
         raise HTTPException(status_code=404, detail="Graph not built yet. Seed-based recommendations require the graph.")
 
     problems = _load_problems()
     if not problems:
         raise HTTPException(status_code=404, detail="No problems found.")
 
-    team = _load_team()
-    member = _find_member(team, member_id)
-
     topics_data = _load_topics()
     topics = topics_data.get("topics", {})
 
@@ -150,119 +220,54 @@ async def get_recommendations(
     solved_curated = set(member.get("solved_curated", []))
 
     # Calculate member's average rating (blending CF + LC)
-    avg_rating = _get_avg_rating(solved_curated, problems_map, member)
+    avg_rating = get_avg_rating(solved_curated, problems_map, member)
 
     # Get member's topic distribution
-    topic_counts = _get_topic_counts(solved_curated, problems_map)
+    topic_counts = get_topic_counts(solved_curated, problems_map)
 
     # Collect candidate problems
     candidates: list[tuple[dict[str, Any], float]] = []  # (problem, score)
 
-    if seed_problem:
-        # Recommendation mode: based on a specific problem
-        if seed_problem not in problems_map:
-            raise HTTPException(status_code=404, detail=f"Seed problem {seed_problem} not found.")
-
-        seed_key = _problem_id_to_graph_key(seed_problem)
-        if not seed_key:
-            raise HTTPException(status_code=400, detail=f"Invalid seed problem ID: {seed_problem}")
+    if seed_problem not in problems_map:
+        raise HTTPException(status_code=404, detail=f"Seed problem {seed_problem} not found.")
 
-        neighbors = graph.get("neighbors", {}).get(seed_key, [])
-        if not neighbors:
-            raise HTTPException(status_code=404, detail=f"No neighbors found for {seed_problem}")
+    seed_key = _problem_id_to_graph_key(seed_problem)
+    if not seed_key:
+        raise HTTPException(status_code=400, detail=f"Invalid seed problem ID: {seed_problem}")
 
-        seed_rating = problems_map[seed_problem].get("rating", avg_rating)
+    neighbors = graph.get("neighbors", {}).get(seed_key, [])
+    if not neighbors:
+        raise HTTPException(status_code=404, detail=f"No neighbors found for {seed_problem}")
 
-        # Score neighbors based on similarity and difficulty progression
-        for nb in neighbors:
-            # Convert graph key back to problem ID
-            nb_key = nb["id"]
-            nb_id = nb_key.replace("/", "")
+    seed_rating = problems_map[seed_problem].get("rating", avg_rating)
 
-            if nb_id not in problems_map or nb_id in solved_curated:
-                continue
+    # Score neighbors based on similarity and difficulty progression
+    for nb in neighbors:
+        # Convert graph key back to problem ID
+        nb_key = nb["id"]
+        nb_id = nb_key.replace("/", "")
 
-            prob = problems_map[nb_id]
-            prob_rating = prob.get("rating", 0)
+        if nb_id not in problems_map or nb_id in solved_curated:
+            continue
 
-            # Filter by difficulty range
-            if abs(prob_rating - seed_rating) > difficulty_range:
-                continue
+        prob = problems_map[nb_id]
+        prob_rating = prob.get("rating", 0)
 
-            # Base score from similarity
-            score = nb["score"]
+        # Filter by difficulty range
+        if abs(prob_rating - seed_rating) > difficulty_range:
+            continue
 
-            # Bonus for slightly harder problems (encourage progression)
-            rating_diff = prob_rating - seed_rating
-            if 0 < rating_diff <= 150:
-                score += 0.05
-            elif rating_diff > 150:
-                score -= 0.02
+        # Base score from similarity
+        score = nb["score"]
 
-            candidates.append((prob, score))
+        # Bonus for slightly harder problems (encourage progression)
+        rating_diff = prob_rating - seed_rating
+        if 0 < rating_diff <= 150:
+            score += 0.05
+        elif rating_diff > 150:
+            score -= 0.02
 
-    else:
-        # Discovery mode: recommend problems based on weak topics and skill level
-        target_min_rating = int(avg_rating - 100)
-        target_max_rating = int(avg_rating + difficulty_range)
-
-        # LC skill data for weak topic adjustment
-        lc_data = member.get("lc_data") or {}
-        lc_topic_skill = lc_data.get("topic_skill", {})
-
-        # Identify weak topics — LC experience can reduce weakness
-        weak_topics: list[str] = []
-        all_topic_ids = list(topics.keys()) if topics else list(topic_counts.keys())
-        for topic_id in all_topic_ids:
-            cf_count = topic_counts.get(topic_id, 0)
-            lc_count = lc_topic_skill.get(topic_id, 0.0)
-            # Not weak if: 5+ CF solves, OR 3+ CF AND 5+ LC (combined signal)
-            combined_sufficient = cf_count >= 3 and lc_count >= 5
-            if cf_count < 5 and not combined_sufficient:
-                weak_topics.append(topic_id)
-
-        # If member has solved < 10 problems total, recommend from foundations
-        if len(solved_curated) < 10:
-            weak_topics = ["implementation", "math_basic", "sorting"]
-
-        for prob in problems:
-            if prob["id"] in solved_curated:
-                continue
-
-            prob_rating = prob.get("rating", 0)
-            prob_topic = prob.get("topic", "")
-
-            # Filter by difficulty
-            if not (target_min_rating <= prob_rating <= target_max_rating):
-                continue
-
-            # Calculate base score
-            score = 0.5
-
-            # Boost if topic is weak
-            if prob_topic in weak_topics:
-                score += 0.3
-
-            # Boost if rating is in sweet spot (slightly above average)
-            rating_diff = prob_rating - avg_rating
-            if 0 <= rating_diff <= 150:
-                score += 0.15
-            elif -100 <= rating_diff < 0:
-                score += 0.05
-
-            # Boost if topic has prerequisites the member has worked on
-            topic_data = topics.get(prob_topic, {})
-            prereqs = topic_data.get("prereqs", [])
-            if prereqs:
-                prereq_coverage = sum(1 for prereq in prereqs if topic_counts.get(prereq, 0) > 0) / len(prereqs)
-                score += prereq_coverage * 0.1
-
-            # Boost if member has LC experience in this topic (ready to transfer)
-            lc_count_for_topic = lc_topic_skill.get(prob_topic, 0.0)
-            if lc_count_for_topic >= 5:
-                score += 0.08
-
-            candidates.append((prob, score))
+        candidates.append((prob, score))
 
     # Sort by score descending
     candidates.sort(key=lambda x: x[1], reverse=True)
@@ -281,7 +286,7 @@ async def get_recommendations(
             "topic": prob.get("topic", ""),
             "url": prob.get("url", ""),
             "score": round(score, 3),
-            "reason": _generate_reason(prob, score, avg_rating, seed_problem, topic_counts, topics, lc_topic_skill),
+            "reason": generate_reason(prob, score, avg_rating, seed_problem, topic_counts, topics, lc_topic_skill),
         }
         for prob, score in candidates[:limit]
     ]
@@ -295,46 +300,3 @@ async def get_recommendations(
         "lc_skill_applied": has_lc_data,
         "recommendations": recommendations,
     }
-
-
-def _generate_reason(
-    prob: dict[str, Any],
-    score: float,
-    avg_rating: float,
-    seed_problem: str | None,
-    topic_counts: dict[str, int],
-    topics: dict[str, Any],
-    lc_topic_skill: dict[str, float] | None = None,
-) -> str:
-    """Generate a human-readable reason for the recommendation."""
-    prob_rating = prob.get("rating", 0)
-    prob_topic = prob.get("topic", "")
-    topic_name = topics.get(prob_topic, {}).get("name", prob_topic)
-    lc_count = (lc_topic_skill or {}).get(prob_topic, 0.0)
-
-    if seed_problem:
-        diff = prob_rating - avg_rating
-        if diff > 100:
-            return f"Similar to your seed problem, but more challenging (+{diff} rating)"
-        elif diff > 0:
-            return f"Similar to your seed problem with slight progression (+{diff} rating)"
-        else:
-            return "Highly similar to your seed problem"
-    else:
-        solved_in_topic = topic_counts.get(prob_topic, 0)
-        diff = prob_rating - avg_rating
-
-        # LC-aware reasons: when CF count is low but LC experience exists
-        if solved_in_topic < 3 and lc_count >= 5:
-            return f"Transfer your LC {topic_name} skills to CF (only {solved_in_topic} CF solved, {int(lc_count)} LC solved)"
-        elif solved_in_topic < 3:
-            if diff > 50:
-                return f"Build strength in {topic_name} (only {solved_in_topic} solved, +{diff} rating)"
-            else:
-                return f"Build strength in {topic_name} (only {solved_in_topic} solved)"
-        elif diff > 100:
-            return f"Challenge problem in {topic_name} (+{diff} rating above your average)"
-        elif diff > 0:
-            return f"Gradual progression in {topic_name} (+{diff} rating)"
-        else:
-            return f"Solidify {topic_name} fundamentals"
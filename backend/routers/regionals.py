@@ -65,14 +65,16 @@ async def get_training_recommendations(
 
 @router.post("/refresh")
 async def refresh_analysis(
-    limit: int = Query(50, ge=1, le=200, description="Max contests to analyze")
+    limit: int = Query(50, ge=1, le=200, description="Max contests to analyze"),
+    restart: bool = Query(False, description="Discard an interrupted refresh instead of resuming it"),
 ):
     """Force refresh the regional analysis by re-fetching from Codeforces API.
 
-    This will take several minutes due to API rate limiting.
+    This will take several minutes due to API rate limiting. An interrupted
+    refresh resumes from its last finished contest unless restart is set.
     """
     try:
-        result = fetch_and_analyze_regionals(limit=limit, force_refresh=True)
+        result = fetch_and_analyze_regionals(limit=limit, force_refresh=True, resume=not restart)
         return {
             "message": "Analysis refreshed successfully",
             "metadata": result["metadata"]
@@ -0,0 +1,65 @@
+"""Search router — hybrid keyword + semantic search across the team's writing and problems."""
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from services import hybrid_search, warmup
+
+router = APIRouter()
+
+
+# ---------------------------------------------------------------------------
+# Pydantic models
+# ---------------------------------------------------------------------------
+
+
+class SearchHit(BaseModel):
+    kind: str
+    id: str
+    title: str
+    snippet: str
+    member_id: int | None
+    problem_id: str | None
+    url: str | None
+    score: float
+    keyword_rank: int | None
+    semantic_rank: int | None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    semantic: bool
+    results: list[SearchHit]
+
+
+# ---------------------------------------------------------------------------
+# Endpoints (sync def — embedding calls block)
+# ---------------------------------------------------------------------------
+
+
+@router.get("/")
+def search(
+    q: str = Query(min_length=1),
+    kinds: list[str] | None = Query(default=None, description="note, journal, editorial, statement (default all)"),
+    member_id: int | None = Query(default=None, description="Only this member's notes and journals"),
+    limit: int = Query(default=20, ge=1, le=100),
+    semantic: bool = Query(default=True, description="Also rank by embedding similarity (false: keywords only)"),
+) -> SearchResponse:
+    """Search notes, journal entries, editorials and statements together.
+
+    BM25 and embedding rankings are fused by reciprocal rank; `semantic` in
+    the response is false when only keywords were used (semantic=false, or
+    the query could not be embedded).
+    """
+    wait = warmup.retry_after("search")
+    if wait is not None:
+        raise HTTPException(
+            status_code=503,
+            detail="Search index is still loading",
+            headers={"Retry-After": str(wait)},
+        )
+    if kinds is not None:
+        unknown = set(kinds) - set(hybrid_search.KINDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+    return SearchResponse(**hybrid_search.search(q, limit, set(kinds) if kinds else None, member_id, semantic))
@@ -6,6 +6,7 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from services import recommendation_pool, team_profiles
 from services.handle_sync import load_team, save_team
 
 router = APIRouter()
@@ -95,6 +96,7 @@ async def flag_editorial(member_id: int, req: EditorialFlagRequest) -> Editorial
 
     if "editorial_flags" not in member or member["editorial_flags"] is None:
         member["editorial_flags"] = {}
+    before = {**member, "editorial_flags": dict(member["editorial_flags"])}
 
     now = datetime.now(timezone.utc).isoformat()
 
@@ -108,6 +110,8 @@ async def flag_editorial(member_id: int, req: EditorialFlagRequest) -> Editorial
         member["editorial_flags"].pop(req.problem_id, None)
 
     save_team(team)
+    recommendation_pool.refresh_member_pool(member)
+    team_profiles.record_member_change(before, member)
 
     return EditorialFlagResponse(
         problem_id=req.problem_id,
@@ -127,8 +131,11 @@ async def unflag_editorial(member_id: int, problem_id: str) -> dict[str, str]:
     if problem_id not in flags:
         raise HTTPException(status_code=404, detail=f"No editorial flag for {problem_id}")
 
+    before = {**member, "editorial_flags": dict(flags)}
     del flags[problem_id]
     member["editorial_flags"] = flags
     save_team(team)
+    recommendation_pool.refresh_member_pool(member)
+    team_profiles.record_member_change(before, member)
 
     return {"status": "ok", "problem_id": problem_id}
@@ -1,16 +1,16 @@
 """Team router — team member management and CF handle sync."""
 
-from itertools import combinations
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from services import activity_store, team_partition, team_profiles
 from services.handle_sync import load_team, save_team, sync_all, sync_member
 from services.team_profiles import (
     MemberProfile,
     compute_profiles,
-    load_problems,
+    get_coverage_table,
     team_coverage,
 )
 
@@ -56,6 +56,19 @@ class SyncResponse(BaseModel):
     last_synced: str
 
 
+class TrioCoverage(BaseModel):
+    member_ids: list[int]
+    member_names: list[str]
+    coverage: dict[str, float]
+    total: float
+
+
+class TrioCoverageResponse(BaseModel):
+    clusters: list[str]
+    total_trios: int
+    trios: list[TrioCoverage]
+
+
 def _member_to_response(m: dict[str, Any]) -> MemberResponse:
     lc_data = m.get("lc_data") or {}
     return MemberResponse(
@@ -117,6 +130,8 @@ async def remove_member(member_id: int) -> dict[str, str]:
     if len(team["members"]) == before:
         raise HTTPException(status_code=404, detail=f"Member {member_id} not found")
     save_team(team)
+    activity_store.remove_member(member_id)
+    team_profiles.remove_member(member_id)
     return {"status": "removed", "id": str(member_id)}
 
 
@@ -130,6 +145,32 @@ async def toggle_member_active(member_id: int, body: ActiveUpdate) -> MemberResp
     return _member_to_response(member)
 
 
+# NOTE: must be declared before /{member_id} so "trio-coverage" is not parsed as a member ID
+@router.get("/trio-coverage")
+async def trio_coverage(
+    member_ids: list[int] | None = Query(default=None, description="Only trios drawn from these members"),
+    limit: int = Query(default=50, ge=1, le=2000),
+) -> TrioCoverageResponse:
+    """Precomputed coverage of every trio, best first — for side-by-side comparisons."""
+    team = load_team()
+    profiles = compute_profiles(team["members"])
+    table = get_coverage_table(profiles)
+    name_map = {m["id"]: m["name"] for m in team["members"]}
+
+    rows = table.rows(member_ids)
+    rows.sort(key=lambda r: -table.totals[r])
+    trios = []
+    for r in rows[:limit]:
+        ids = list(table.trio_key(r))
+        trios.append(TrioCoverage(
+            member_ids=ids,
+            member_names=[name_map.get(i, f"#{i}") for i in ids],
+            coverage={c: float(v) for c, v in zip(table.clusters, table.coverage[r])},
+            total=float(table.totals[r]),
+        ))
+    return TrioCoverageResponse(clusters=table.clusters, total_trios=len(rows), trios=trios)
+
+
 @router.get("/{member_id}")
 async def get_member(member_id: int) -> MemberResponse:
     """Get a single team member's details."""
@@ -206,6 +247,8 @@ class TeamSuggestion(BaseModel):
     score: float
     team_a_coverage: dict[str, float]
     team_b_coverage: dict[str, float]
+    teams: list[list[int]] = []
+    team_coverages: list[dict[str, float]] = []
 
 
 class ComposeResponse(BaseModel):
@@ -213,43 +256,39 @@ class ComposeResponse(BaseModel):
     suggestion: TeamSuggestion
 
 
-def _suggest_split(profiles: list[MemberProfile]) -> TeamSuggestion:
-    """Brute-force all C(n,3)*C(n-3,3)/2 splits, return the best one."""
-    ids = [p.id for p in profiles]
-    best_score = -1.0
-    best: tuple[list[int], list[int], list[int]] = ([], [], [])
-
-    for team_a in combinations(ids, 3):
-        remaining = [i for i in ids if i not in team_a]
-        for team_b in combinations(remaining, 3):
-            # Avoid counting symmetric splits (team_a, team_b) and (team_b, team_a)
-            if team_a[0] > team_b[0]:
-                continue
-            alternates = [i for i in remaining if i not in team_b]
-            cov_a = team_coverage(list(team_a), profiles)
-            cov_b = team_coverage(list(team_b), profiles)
-            # Score = min total coverage of the two teams (maximize the weaker team)
-            score = min(sum(cov_a.values()), sum(cov_b.values()))
-            if score > best_score:
-                best_score = score
-                best = (list(team_a), list(team_b), alternates)
-
-    team_a, team_b, alternates = best
+def _suggest_split(profiles: list[MemberProfile], num_teams: int = 2) -> TeamSuggestion:
+    """Exact best split into num_teams trios (maximize the weakest team)."""
+    result = team_partition.best_partition(profiles, num_teams)
+    if result is None:
+        return TeamSuggestion(
+            team_a=[],
+            team_b=[],
+            alternates=[],
+            score=-1.0,
+            team_a_coverage=team_coverage([], profiles),
+            team_b_coverage=team_coverage([], profiles),
+        )
+
+    teams = result["teams"]
+    coverages = [team_coverage(t, profiles) for t in teams]
     return TeamSuggestion(
-        team_a=team_a,
-        team_b=team_b,
-        alternates=alternates,
-        score=best_score,
-        team_a_coverage=team_coverage(team_a, profiles),
-        team_b_coverage=team_coverage(team_b, profiles),
+        team_a=teams[0],
+        team_b=teams[1] if len(teams) > 1 else [],
+        alternates=result["leftover"],
+        score=result["score"],
+        team_a_coverage=coverages[0],
+        team_b_coverage=coverages[1] if len(teams) > 1 else team_coverage([], profiles),
+        teams=teams,
+        team_coverages=coverages,
     )
 
 
 @router.post("/compose")
-async def compose_teams() -> ComposeResponse:
-    """Analyze member strengths and suggest balanced 2-team split."""
+async def compose_teams(
+    num_teams: int = Query(default=2, ge=1, le=13, description="Number of trios to form"),
+) -> ComposeResponse:
+    """Analyze member strengths and suggest a balanced split into trios."""
     team = load_team()
-    problems = load_problems()
-    profiles = compute_profiles(team["members"], problems)
-    suggestion = _suggest_split(profiles)
+    profiles = compute_profiles(team["members"])
+    suggestion = _suggest_split(profiles, num_teams)
     return ComposeResponse(profiles=profiles, suggestion=suggestion)
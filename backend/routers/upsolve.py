@@ -1,30 +1,17 @@
-"""Upsolve router — derived queue from virtual contests + team solve data."""
+"""Upsolve router — queue and stats served from the materialized upsolve index."""
 
-import json
-from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from .contests import load_contests, save_contests
+from services import upsolve_index
 
-DATA_DIR = Path(__file__).parent.parent / "data"
-TEAM_FILE = DATA_DIR / "team.json"
+from .contests import load_contests, notify_contest_saved, save_contests
 
 router = APIRouter()
 
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def _load_team() -> dict[str, Any]:
-    with open(TEAM_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 # ---------------------------------------------------------------------------
 # Pydantic models
 # ---------------------------------------------------------------------------
@@ -65,6 +52,7 @@ class UpsolveContestGroup(BaseModel):
 
 class UpsolveQueueResponse(BaseModel):
     contests: list[UpsolveContestGroup]
+    total_contests: int
     total_items: int
     total_solved: int
     total_pending: int
@@ -105,99 +93,82 @@ class DismissRequest(BaseModel):
 # ---------------------------------------------------------------------------
 
 
-def _build_queue() -> list[UpsolveContestGroup]:
-    """Build the full upsolve queue from contests + team data."""
-    contests_data = load_contests()
-    team_data = _load_team()
-
-    # Build member lookup: id → {name, accepted_set}
-    member_lookup: dict[int, dict[str, Any]] = {}
-    for m in team_data["members"]:
-        member_lookup[m["id"]] = {
-            "name": m["name"],
-            "accepted": set(m.get("all_accepted", [])),
-        }
+def _participants(entry: dict[str, Any], members: dict[str, Any], member_id: int | None) -> list[int]:
+    """Participants of an index entry that are on the team (only member_id when given)."""
+    if member_id is not None:
+        return [member_id] if member_id in entry["participant_ids"] and str(member_id) in members else []
+    return [mid for mid in entry["participant_ids"] if str(mid) in members]
 
-    groups: list[UpsolveContestGroup] = []
 
-    for contest in contests_data["contests"]:
-        cf_contest_id = contest["cf_contest_id"]
-        dismissed_set = set(contest.get("dismissed_problems", []))
+def _contest_rows(index: dict[str, Any], member_id: int | None) -> list[tuple[dict[str, Any], list[int], int, int]]:
+    """(entry, participants, total, solved) per contest in queue order, from stored counts.
 
-        # Collect participating member IDs
-        participant_ids: list[int] = []
-        seen_ids: set[int] = set()
-        for team in contest.get("teams", []):
-            for mid in team.get("member_ids", []):
-                if mid not in seen_ids:
-                    participant_ids.append(mid)
-                    seen_ids.add(mid)
-
-        if not participant_ids:
+    With member_id, contests that member didn't take part in are left out.
+    """
+    members = index["members"]
+    rows = []
+    for entry in index["contests"]:
+        participants = _participants(entry, members, member_id)
+        if member_id is not None and not participants:
             continue
-
-        items: list[UpsolveItem] = []
-        group_total = 0
-        group_solved = 0
-
-        for result in contest.get("results", []):
-            problem_index = result["problem_index"]
-            problem_cf_id = f"{cf_contest_id}{problem_index}"
-            cf_url = f"https://codeforces.com/contest/{cf_contest_id}/problem/{problem_index}"
-            solved_during = result.get("solved_by_team") is not None
-
-            statuses: list[MemberUpsolveStatus] = []
-            pending = 0
-            solved = 0
-
-            for mid in participant_ids:
-                info = member_lookup.get(mid)
-                if info is None:
-                    continue
-                has_solved = problem_cf_id in info["accepted"]
-                statuses.append(MemberUpsolveStatus(
-                    member_id=mid,
-                    member_name=info["name"],
-                    has_solved=has_solved,
-                ))
-                if has_solved:
-                    solved += 1
-                else:
-                    pending += 1
-
-            group_total += len(statuses)
-            group_solved += solved
-
-            items.append(UpsolveItem(
-                contest_id=contest["id"],
-                cf_contest_id=cf_contest_id,
-                contest_name=contest["contest_name"],
-                contest_date=contest["date"],
-                problem_index=problem_index,
-                problem_name=result["problem_name"],
-                problem_cf_id=problem_cf_id,
-                cf_url=cf_url,
-                solved_during_contest=solved_during,
-                solved_by_team=result.get("solved_by_team"),
-                member_statuses=statuses,
-                pending_count=pending,
-                dismissed=problem_index in dismissed_set,
-            ))
-
-        groups.append(UpsolveContestGroup(
-            contest_id=contest["id"],
+        total = len(participants) * len(entry["problems"])
+        solved = sum(entry["solved"].get(str(mid), 0) for mid in participants)
+        rows.append((entry, participants, total, solved))
+    return rows
+
+
+def _contest_group(
+    entry: dict[str, Any],
+    participants: list[int],
+    total: int,
+    solved: int,
+    members: dict[str, Any],
+    pending_sets: dict[int, set[str]],
+) -> UpsolveContestGroup:
+    """Full queue group (items and member statuses) for one index entry."""
+    dismissed_set = set(entry["dismissed"])
+    cf_contest_id = entry["cf_contest_id"]
+
+    items: list[UpsolveItem] = []
+    for problem in entry["problems"]:
+        problem_index = problem["problem_index"]
+        problem_cf_id = problem["problem_cf_id"]
+        statuses = [
+            MemberUpsolveStatus(
+                member_id=mid,
+                member_name=members[str(mid)]["name"],
+                has_solved=problem_cf_id not in pending_sets.get(mid, ()),
+            )
+            for mid in participants
+        ]
+        item_solved = sum(1 for ms in statuses if ms.has_solved)
+
+        items.append(UpsolveItem(
+            contest_id=entry["contest_id"],
             cf_contest_id=cf_contest_id,
-            contest_name=contest["contest_name"],
-            contest_date=contest["date"],
-            items=items,
-            total_items=group_total,
-            total_solved=group_solved,
-            total_pending=group_total - group_solved,
+            contest_name=entry["contest_name"],
+            contest_date=entry["contest_date"],
+            problem_index=problem_index,
+            problem_name=problem["problem_name"],
+            problem_cf_id=problem_cf_id,
+            cf_url=f"https://codeforces.com/contest/{cf_contest_id}/problem/{problem_index}",
+            solved_during_contest=problem["solved_by_team"] is not None,
+            solved_by_team=problem["solved_by_team"],
+            member_statuses=statuses,
+            pending_count=len(statuses) - item_solved,
+            dismissed=problem_index in dismissed_set,
         ))
 
-    # Sort by date descending
-    groups.sort(key=lambda g: g.contest_date, reverse=True)
-    return groups
+    return UpsolveContestGroup(
+        contest_id=entry["contest_id"],
+        cf_contest_id=cf_contest_id,
+        contest_name=entry["contest_name"],
+        contest_date=entry["contest_date"],
+        items=items,
+        total_items=total,
+        total_solved=solved,
+        total_pending=total - solved,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -206,13 +177,29 @@ def _build_queue() -> list[UpsolveContestGroup]:
 
 
 @router.get("/")
-async def get_upsolve_queue() -> UpsolveQueueResponse:
-    """Full upsolve queue grouped by contest."""
-    groups = _build_queue()
-    total = sum(g.total_items for g in groups)
-    solved = sum(g.total_solved for g in groups)
+async def get_upsolve_queue(
+    member_id: int | None = Query(default=None, description="Only this member's contests and statuses"),
+    offset: int = Query(default=0, ge=0, description="Contest groups to skip"),
+    limit: int | None = Query(default=None, ge=1, le=200, description="Max contest groups (default all)"),
+) -> UpsolveQueueResponse:
+    """Upsolve queue grouped by contest, newest first.
+
+    Totals cover the whole (filtered) queue and come from the index's stored
+    counts; items and member statuses are built only for the requested page.
+    """
+    index = upsolve_index.load()
+    members = index["members"]
+    if member_id is not None and str(member_id) not in members:
+        rows = []
+    else:
+        rows = _contest_rows(index, member_id)
+    total = sum(r[2] for r in rows)
+    solved = sum(r[3] for r in rows)
+    page_rows = rows[offset:] if limit is None else rows[offset:offset + limit]
+    pending_sets = upsolve_index.pending_sets()
     return UpsolveQueueResponse(
-        contests=groups,
+        contests=[_contest_group(*row, members, pending_sets) for row in page_rows],
+        total_contests=len(rows),
         total_items=total,
         total_solved=solved,
         total_pending=total - solved,
@@ -220,43 +207,42 @@ async def get_upsolve_queue() -> UpsolveQueueResponse:
 
 
 @router.get("/stats")
-async def get_upsolve_stats() -> UpsolveStatsResponse:
+async def get_upsolve_stats(
+    member_id: int | None = Query(default=None, description="Only this member's upsolves"),
+) -> UpsolveStatsResponse:
     """Aggregated upsolve statistics."""
-    groups = _build_queue()
+    index = upsolve_index.load()
 
     total = 0
     solved = 0
-    member_agg: dict[int, dict[str, Any]] = {}
+    member_agg: dict[int, dict[str, int]] = {}
     contest_stats: list[ContestUpsolveStatsEntry] = []
 
-    for g in groups:
-        total += g.total_items
-        solved += g.total_solved
+    for entry, participants, c_total, c_solved in _contest_rows(index, member_id):
+        total += c_total
+        solved += c_solved
 
         contest_stats.append(ContestUpsolveStatsEntry(
-            contest_id=g.contest_id,
-            contest_name=g.contest_name,
-            total=g.total_items,
-            solved=g.total_solved,
-            pct=round(g.total_solved / g.total_items * 100, 1) if g.total_items > 0 else 0,
+            contest_id=entry["contest_id"],
+            contest_name=entry["contest_name"],
+            total=c_total,
+            solved=c_solved,
+            pct=round(c_solved / c_total * 100, 1) if c_total > 0 else 0,
         ))
 
-        for item in g.items:
-            for ms in item.member_statuses:
-                if ms.member_id not in member_agg:
-                    member_agg[ms.member_id] = {
-                        "name": ms.member_name,
-                        "total": 0,
-                        "solved": 0,
-                    }
-                member_agg[ms.member_id]["total"] += 1
-                if ms.has_solved:
-                    member_agg[ms.member_id]["solved"] += 1
+        n_problems = len(entry["problems"])
+        if not n_problems:
+            continue
+        for mid in participants:
+            agg = member_agg.setdefault(mid, {"total": 0, "solved": 0})
+            agg["total"] += n_problems
+            agg["solved"] += entry["solved"].get(str(mid), 0)
 
+    members = index["members"]
     per_member = [
         MemberUpsolveStatsEntry(
             member_id=mid,
-            member_name=info["name"],
+            member_name=members[str(mid)]["name"],
             total=info["total"],
             solved=info["solved"],
             pending=info["total"] - info["solved"],
@@ -284,6 +270,7 @@ async def dismiss_problem(body: DismissRequest) -> dict[str, str]:
             if body.problem_index not in dismissed:
                 dismissed.append(body.problem_index)
             save_contests(data)
+            notify_contest_saved(data["contests"], c["id"], c)
             return {"status": "dismissed"}
     raise HTTPException(status_code=404, detail=f"Contest {body.contest_id} not found")
 
@@ -299,5 +286,6 @@ async def undismiss_problem(body: DismissRequest) -> dict[str, str]:
                 dismissed.remove(body.problem_index)
                 c["dismissed_problems"] = dismissed
             save_contests(data)
+            notify_contest_saved(data["contests"], c["id"], c)
             return {"status": "undismissed"}
     raise HTTPException(status_code=404, detail=f"Contest {body.contest_id} not found")
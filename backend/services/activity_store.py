@@ -0,0 +1,144 @@
+"""Daily activity store — per-member, per-day solve counts maintained on sync.
+
+Counts live in activity.json keyed by member and UTC date, so a heatmap over
+any date range is a bisect into each member's sorted day list instead of a
+rescan of every problem timestamp.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+ACTIVITY_FILE = DATA_DIR / "activity.json"
+
+# In-memory sorted view of activity.json, rebuilt when the file changes
+_cache_mtime: float | None = None
+_cache_index: dict[str, tuple[list[str], list[list[int]]]] = {}
+
+
+def _day_of(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+
+
+def load_activity() -> dict[str, Any]:
+    if not ACTIVITY_FILE.exists():
+        return {"members": {}}
+    with open(ACTIVITY_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_activity(data: dict[str, Any]) -> None:
+    # Keep each member's days sorted on disk so loading never needs a sort
+    for entry in data["members"].values():
+        entry["days"] = dict(sorted(entry["days"].items()))
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ACTIVITY_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _bump(days: dict[str, list[int]], day: str, curated: bool, delta: int) -> None:
+    counts = days.setdefault(day, [0, 0])
+    counts[0] += delta
+    if curated:
+        counts[1] += delta
+    if counts[0] <= 0:
+        del days[day]
+
+
+def _apply_diff(
+    entry: dict[str, Any],
+    old_timestamps: dict[str, int],
+    new_timestamps: dict[str, int],
+    curated_ids: set[str],
+) -> None:
+    """Move day counts for every problem whose first-AC timestamp changed."""
+    days = entry.setdefault("days", {})
+    for pid, ts in old_timestamps.items():
+        if new_timestamps.get(pid) != ts:
+            _bump(days, _day_of(ts), pid in curated_ids, -1)
+    for pid, ts in new_timestamps.items():
+        if old_timestamps.get(pid) != ts:
+            _bump(days, _day_of(ts), pid in curated_ids, 1)
+
+
+def record_sync(
+    member_id: int,
+    old_timestamps: dict[str, int],
+    new_timestamps: dict[str, int],
+    curated_ids: set[str],
+) -> None:
+    """Update one member's daily counts after a sync.
+
+    Only problems whose first-AC timestamp was added, removed, or moved are
+    touched. A member with no stored aggregate is backfilled from scratch.
+    """
+    data = load_activity()
+    key = str(member_id)
+    if key not in data["members"]:
+        old_timestamps = {}
+        data["members"][key] = {"days": {}}
+    _apply_diff(data["members"][key], old_timestamps, new_timestamps, curated_ids)
+    save_activity(data)
+
+
+def remove_member(member_id: int) -> None:
+    """Drop a member's aggregate (e.g. when they leave the team)."""
+    data = load_activity()
+    if data["members"].pop(str(member_id), None) is not None:
+        save_activity(data)
+
+
+def unseeded(members: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Members with solve timestamps but no aggregate, checked against the cached index."""
+    index = _load_index()
+    return [m for m in members if str(m["id"]) not in index and m.get("problem_timestamps")]
+
+
+def backfill_missing(members: list[dict[str, Any]], curated_ids: set[str]) -> None:
+    """Seed aggregates for members synced before the store existed."""
+    data = load_activity()
+    changed = False
+    for m in members:
+        key = str(m["id"])
+        timestamps = m.get("problem_timestamps") or {}
+        if key in data["members"] or not timestamps:
+            continue
+        data["members"][key] = {"days": {}}
+        _apply_diff(data["members"][key], {}, timestamps, curated_ids)
+        changed = True
+    if changed:
+        save_activity(data)
+
+
+def _load_index() -> dict[str, tuple[list[str], list[list[int]]]]:
+    """Return {member_id: (sorted_dates, counts)}, cached by file mtime."""
+    global _cache_mtime, _cache_index
+    mtime = ACTIVITY_FILE.stat().st_mtime if ACTIVITY_FILE.exists() else None
+    if mtime is not None and mtime == _cache_mtime:
+        return _cache_index
+
+    index: dict[str, tuple[list[str], list[list[int]]]] = {}
+    for key, entry in load_activity()["members"].items():
+        days = entry.get("days", {})
+        index[key] = (list(days.keys()), list(days.values()))
+    _cache_mtime = mtime
+    _cache_index = index
+    return index
+
+
+def read_range(
+    member_id: int, start: date, end: date, curated_only: bool = False
+) -> list[dict[str, Any]]:
+    """Return non-zero [{date, count}] for a member between start and end inclusive."""
+    dates, counts = _load_index().get(str(member_id), ([], []))
+    lo = bisect_left(dates, start.isoformat())
+    hi = bisect_right(dates, end.isoformat())
+    col = 1 if curated_only else 0
+    return [
+        {"date": dates[i], "count": counts[i][col]}
+        for i in range(lo, hi)
+        if counts[i][col] > 0
+    ]
@@ -0,0 +1,93 @@
+"""Pre-serialized, pre-compressed JSON artifacts for static-ish API payloads.
+
+Large payloads that only change when a build script runs (e.g.
+positions.json) are served as files rather than parsed and re-serialized per
+request. Next to each artifact we keep `<name>.gz` and, when the optional
+`brotli` package is installed, `<name>.br`, plus a content-hash ETag.
+Sidecars are written by the build scripts and regenerated on demand
+whenever the source file is newer than them.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+_lock = threading.Lock()
+# path -> (mtime_ns, size, sha1) so the hash is computed once per version
+_digests: dict[Path, tuple[int, int, str]] = {}
+
+
+def _brotli() -> Any | None:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _sidecar(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_compressed(path: Path) -> list[Path]:
+    """(Re)write the .gz and, if brotli is available, .br sidecars of `path`."""
+    raw = path.read_bytes()
+    written = [_sidecar(path, ".gz")]
+    # mtime=0 keeps the gzip bytes reproducible for identical input
+    _write_atomic(written[0], gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0))
+    brotli = _brotli()
+    br_path = _sidecar(path, ".br")
+    if brotli is not None:
+        _write_atomic(br_path, brotli.compress(raw, quality=BROTLI_QUALITY))
+        written.append(br_path)
+    elif br_path.exists():
+        br_path.unlink()
+    return written
+
+
+def _stale(path: Path, sidecar: Path) -> bool:
+    return not sidecar.exists() or sidecar.stat().st_mtime_ns < path.stat().st_mtime_ns
+
+
+def ensure_compressed(path: Path) -> None:
+    """Regenerate sidecars that are missing or older than `path`."""
+    with _lock:
+        if _stale(path, _sidecar(path, ".gz")) or (
+            _brotli() is not None and _stale(path, _sidecar(path, ".br"))
+        ):
+            write_compressed(path)
+
+
+def digest(path: Path) -> str:
+    """SHA-1 of the file's content, cached per (mtime, size)."""
+    st = path.stat()
+    cached = _digests.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    sha = hashlib.sha1(path.read_bytes()).hexdigest()
+    _digests[path] = (st.st_mtime_ns, st.st_size, sha)
+    return sha
+
+
+def encodings(path: Path) -> dict[str, Path]:
+    """Available representations of `path`: content-coding -> file."""
+    ensure_compressed(path)
+    found = {"identity": path}
+    for coding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        sidecar = _sidecar(path, suffix)
+        if sidecar.exists():
+            found[coding] = sidecar
+    return found
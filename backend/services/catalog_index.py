@@ -0,0 +1,204 @@
+"""Full-catalog recommendations over every problem in cf_problems_raw.json.
+
+The catalog is classified once into our topic taxonomy and bucketed by
+rating, so a request only visits the (weak topic, rating bucket) lists inside
+its difficulty window plus graph neighbors of the member's recent solves —
+a few hundred candidates instead of all ~10K problems.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any
+
+from . import graph_clusters, graph_store
+from .topic_classifier import classify_problem
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+RAW_FILE = DATA_DIR / "cf_problems_raw.json"
+
+BUCKET_SIZE = 100
+RECENT_SEEDS = 20          # recent solves used for graph proximity
+LEVEL_SAMPLE = 30          # recent solves used to estimate current level
+WEAK_TOPIC_COUNT = 6       # weakest topics expanded per request
+TOPIC_SOLVES_FOR_MASTERY = 15
+
+
+class CatalogIndex:
+    """Classified CF catalog with per-rating-bucket and per-topic indexes."""
+
+    def __init__(self, raw: list[dict[str, Any]]) -> None:
+        self.problems: list[dict[str, Any]] = []
+        self.by_id: dict[str, int] = {}
+        self.by_bucket: dict[int, list[int]] = {}
+        self.by_topic_bucket: dict[tuple[str, int], list[int]] = {}
+
+        for p in raw:
+            cid = p.get("contestId")
+            idx = p.get("index")
+            rating = p.get("rating") or 0
+            if cid is None or not idx or not rating:
+                continue
+            cls = classify_problem(p)
+            pos = len(self.problems)
+            compact = f"{cid}{idx}"
+            self.problems.append({
+                "id": compact,
+                "graph_key": f"{cid}/{idx}",
+                "name": p.get("name", ""),
+                "rating": rating,
+                "tags": p.get("tags", []),
+                "topic": cls["primary_topic"],
+                "topics": cls["topics"],
+                "url": f"https://codeforces.com/problemset/problem/{cid}/{idx}",
+            })
+            self.by_id[compact] = pos
+            bucket = rating // BUCKET_SIZE * BUCKET_SIZE
+            self.by_bucket.setdefault(bucket, []).append(pos)
+            for topic in cls["topics"]:
+                self.by_topic_bucket.setdefault((topic, bucket), []).append(pos)
+
+    def buckets_between(self, lo: int, hi: int) -> list[int]:
+        first = lo // BUCKET_SIZE * BUCKET_SIZE
+        return list(range(first, hi + 1, BUCKET_SIZE))
+
+
+_index_mtime: int | None = None
+_index: CatalogIndex | None = None
+
+
+def get_index() -> CatalogIndex | None:
+    """Return the catalog index, building it once per cf_problems_raw.json version."""
+    global _index_mtime, _index
+    if not RAW_FILE.exists():
+        return None
+    mtime = RAW_FILE.stat().st_mtime_ns
+    if mtime != _index_mtime:
+        with open(RAW_FILE, "r", encoding="utf-8") as f:
+            _index = CatalogIndex(json.load(f))
+        _index_mtime = mtime
+    return _index
+
+
+def _rating_fit(rating: int, level: float) -> float:
+    """Peaks slightly above the member's level, like note recommendations."""
+    diff = rating - (level + 100)
+    sigma = 250 if diff < 0 else 350
+    return math.exp(-(diff ** 2) / (2 * sigma ** 2))
+
+
+def _recent_solves(member: dict[str, Any], n: int) -> list[str]:
+    timestamps = member.get("problem_timestamps") or {}
+    return sorted(timestamps, key=timestamps.get, reverse=True)[:n]
+
+
+def recommend(
+    member: dict[str, Any],
+    fallback_level: float,
+    topic_names: dict[str, str],
+    difficulty_range: int,
+    limit: int,
+) -> dict[str, Any]:
+    """Rank unsolved catalog problems for a member.
+
+    Score = 0.4 * topic weakness + 0.35 * rating fit + 0.25 * graph proximity
+    to the member's most recent solves.
+    """
+    index = get_index()
+    if index is None:
+        raise FileNotFoundError("cf_problems_raw.json not found. Run scripts/build_graph.py --step fetch first.")
+
+    solved = set(member.get("all_accepted", [])) | set(member.get("solved_curated", []))
+
+    # Current level: mean rating of recent catalog solves, else the curated estimate
+    recent_ratings = [
+        index.problems[index.by_id[pid]]["rating"]
+        for pid in _recent_solves(member, LEVEL_SAMPLE)
+        if pid in index.by_id
+    ]
+    level = sum(recent_ratings) / len(recent_ratings) if recent_ratings else fallback_level
+    lo = int(level - 100)
+    hi = int(level + difficulty_range)
+
+    # Topic weakness from every accepted catalog problem
+    topic_solves: dict[str, int] = {t: 0 for t in topic_names}
+    for pid in solved:
+        pos = index.by_id.get(pid)
+        if pos is not None:
+            for t in index.problems[pos]["topics"]:
+                topic_solves[t] = topic_solves.get(t, 0) + 1
+    weakness = {
+        t: 1.0 - min(1.0, c / TOPIC_SOLVES_FOR_MASTERY) for t, c in topic_solves.items()
+    }
+    weak_topics = sorted(weakness, key=lambda t: (-weakness[t], t))[:WEAK_TOPIC_COUNT]
+    if len(solved) < 10:
+        # Mirror curated discovery: brand-new members start from foundations
+        weak_topics = ["implementation", "math_basic", "sorting"]
+
+    # Graph proximity: best similarity to any recent solve
+    proximity: dict[int, float] = {}
+    graph = graph_store.load_graph()
+    if graph:
+        neighbors = graph.get("neighbors", {})
+        for pid in _recent_solves(member, RECENT_SEEDS):
+            pos = index.by_id.get(pid)
+            if pos is None:
+                continue
+            for nb in neighbors.get(index.problems[pos]["graph_key"], []):
+                nb_pos = index.by_id.get(nb["id"].replace("/", ""))
+                if nb_pos is not None and nb["score"] > proximity.get(nb_pos, 0.0):
+                    proximity[nb_pos] = nb["score"]
+
+    # Candidate generation: weak-topic buckets in the window + graph neighbors
+    candidate_pos: set[int] = set()
+    for bucket in index.buckets_between(lo, hi):
+        for t in weak_topics:
+            candidate_pos.update(index.by_topic_bucket.get((t, bucket), ()))
+    candidate_pos.update(proximity)
+
+    max_prox = max(proximity.values(), default=0.0) or 1.0
+    scored: list[tuple[float, int]] = []
+    for pos in candidate_pos:
+        prob = index.problems[pos]
+        if prob["id"] in solved or not (lo <= prob["rating"] <= hi):
+            continue
+        score = (
+            0.4 * weakness.get(prob["topic"], 0.0)
+            + 0.35 * _rating_fit(prob["rating"], level)
+            + 0.25 * proximity.get(pos, 0.0) / max_prox
+        )
+        scored.append((score, pos))
+
+    scored.sort(key=lambda x: (-x[0], x[1]))
+
+    clusters = graph_clusters.load()
+    assignments = clusters["assignments"] if clusters else {}
+    recommendations = []
+    for score, pos in scored[:limit]:
+        prob = index.problems[pos]
+        topic_name = topic_names.get(prob["topic"], prob["topic"])
+        if pos in proximity and weakness.get(prob["topic"], 0.0) < 0.5:
+            reason = f"Close to problems you solved recently ({topic_name})"
+        elif pos in proximity:
+            reason = f"Builds {topic_name} from where you've been practicing"
+        else:
+            reason = f"Build strength in {topic_name} ({topic_solves.get(prob['topic'], 0)} solved on CF)"
+        recommendations.append({
+            "id": prob["id"],
+            "name": prob["name"],
+            "rating": prob["rating"],
+            "topic": prob["topic"],
+            "tags": prob["tags"],
+            "url": prob["url"],
+            "cluster": assignments.get(prob["graph_key"]),
+            "score": round(score, 3),
+            "reason": reason,
+        })
+
+    return {
+        "level": round(level),
+        "weak_topics": weak_topics,
+        "candidates_scanned": len(candidate_pos),
+        "catalog_size": len(index.problems),
+        "recommendations": recommendations,
+    }
@@ -1,33 +1,60 @@
-"""Codeforces API client with rate limiting and retry logic."""
+"""Codeforces API client with rate limiting and retry logic.
+
+Every client in the process shares one request budget: each request
+reserves the next free slot, MIN_REQUEST_INTERVAL after the previous one.
+Threads can therefore keep several requests in flight without exceeding
+the CF rate limit, and a 429 pushes every thread's next slot back.
+"""
 
 import json
+import threading
 import time
 from pathlib import Path
 from typing import Any
 
-import requests
-
 BASE_URL = "https://codeforces.com/api"
 DATA_DIR = Path(__file__).parent.parent / "data"
 MIN_REQUEST_INTERVAL = 2.0  # seconds between API requests
 
+_rate_lock = threading.Lock()
+_next_slot = 0.0  # time.monotonic() at which the next request may start
+
+
+def _reserve_slot() -> float:
+    """Claim the next request slot; returns how long to wait for it."""
+    global _next_slot
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot)
+        _next_slot = slot + MIN_REQUEST_INTERVAL
+    return slot - now
+
+
+def _back_off(seconds: float) -> None:
+    """Delay every caller's next request by at least `seconds` from now."""
+    global _next_slot
+    with _rate_lock:
+        _next_slot = max(_next_slot, time.monotonic() + seconds)
+
 
 class CFClient:
     """Rate-limited Codeforces API client."""
 
     def __init__(self) -> None:
-        self._last_request_time = 0.0
+        import requests  # deferred: only syncs need it, not API startup
+
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": "CF-ICPC-Trainer/1.0"})
 
     def _rate_limit(self) -> None:
-        elapsed = time.time() - self._last_request_time
-        if elapsed < MIN_REQUEST_INTERVAL:
-            time.sleep(MIN_REQUEST_INTERVAL - elapsed)
-        self._last_request_time = time.time()
+        wait = _reserve_slot()
+        if wait > 0:
+            time.sleep(wait)
 
     def _request(self, endpoint: str, params: dict[str, str] | None = None, max_retries: int = 3) -> dict[str, Any]:
         """Make a rate-limited request to the CF API with retries."""
+        import requests
+
         for attempt in range(max_retries):
             self._rate_limit()
             try:
@@ -35,7 +62,7 @@ class CFClient:
                 if resp.status_code == 429:
                     wait = 2 ** (attempt + 2)
                     print(f"  Rate limited (429). Waiting {wait}s...")
-                    time.sleep(wait)
+                    _back_off(wait)
                     continue
                 resp.raise_for_status()
                 data = resp.json()
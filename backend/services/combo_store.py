@@ -0,0 +1,169 @@
+"""Materialized per-combo contest statistics, maintained on contest CRUD.
+
+combo_stats.json holds, for every duo/trio that has played a virtual contest,
+running totals (problems faced, solved, solve-time sum/count) and its
+per-contest records in both contests.json order and date order. Rotation
+analytics read this instead of rescanning every contest, team and result.
+"""
+
+import json
+from bisect import insort
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CONTESTS_FILE = DATA_DIR / "contests.json"
+COMBOS_FILE = DATA_DIR / "combo_stats.json"
+
+_cache_mtime: int | None = None
+_cache: dict[str, Any] = {}
+
+
+def combo_key(member_ids: list[int]) -> str:
+    """Canonical combo identifier: sorted IDs joined by hyphens."""
+    return "-".join(str(i) for i in sorted(member_ids))
+
+
+def _contests_version() -> int | None:
+    return CONTESTS_FILE.stat().st_mtime_ns if CONTESTS_FILE.exists() else None
+
+
+def _contest_records(contest: dict[str, Any], seq: int) -> list[tuple[str, dict[str, Any]]]:
+    """(combo_key, record) for every 2- or 3-member team in a contest."""
+    results = contest.get("results", [])
+    records = []
+    for team_index, team_entry in enumerate(contest.get("teams", [])):
+        member_ids = team_entry["member_ids"]
+        if len(member_ids) not in (2, 3):
+            continue
+        label = team_entry["label"]
+        team_solved = [r for r in results if r.get("solved_by_team") == label]
+        solve_times = [
+            r["solve_time_minutes"] for r in team_solved if r.get("solve_time_minutes") is not None
+        ]
+        records.append((combo_key(member_ids), {
+            "seq": seq,
+            "team_index": team_index,
+            "contest_id": contest["id"],
+            "contest_name": contest["contest_name"],
+            "date": contest["date"],
+            "team_label": label,
+            "solved_count": len(team_solved),
+            "total_problems": len(results),
+            "time_sum": sum(solve_times),
+            "time_count": len(solve_times),
+        }))
+    return records
+
+
+def _add(data: dict[str, Any], contest: dict[str, Any], seq: int) -> None:
+    for key, rec in _contest_records(contest, seq):
+        combo = data["combos"].setdefault(key, {
+            "member_ids": [int(x) for x in key.split("-")],
+            "total_problems": 0,
+            "total_solved": 0,
+            "time_sum": 0,
+            "time_count": 0,
+            "records": [],
+            "timeline": [],
+        })
+        combo["total_problems"] += rec["total_problems"]
+        combo["total_solved"] += rec["solved_count"]
+        combo["time_sum"] += rec["time_sum"]
+        combo["time_count"] += rec["time_count"]
+        insort(combo["records"], rec, key=lambda r: r["seq"])
+        insort(combo["timeline"], rec, key=lambda r: (r["date"], r["seq"]))
+
+
+def _remove(data: dict[str, Any], contest_id: str) -> int | None:
+    """Drop a contest's records; returns its sequence number if it was known."""
+    seq = data["seqs"].pop(contest_id, None)
+    for key in list(data["combos"]):
+        combo = data["combos"][key]
+        gone = [r for r in combo["records"] if r["contest_id"] == contest_id]
+        if not gone:
+            continue
+        for rec in gone:
+            combo["total_problems"] -= rec["total_problems"]
+            combo["total_solved"] -= rec["solved_count"]
+            combo["time_sum"] -= rec["time_sum"]
+            combo["time_count"] -= rec["time_count"]
+        combo["records"] = [r for r in combo["records"] if r["contest_id"] != contest_id]
+        combo["timeline"] = [r for r in combo["timeline"] if r["contest_id"] != contest_id]
+        if not combo["records"]:
+            del data["combos"][key]
+    return seq
+
+
+def _save(data: dict[str, Any]) -> None:
+    global _cache_mtime, _cache
+    data["contests_version"] = _contests_version()
+    # Keep combos in order of first appearance in contests.json
+    data["combos"] = dict(sorted(
+        data["combos"].items(),
+        key=lambda kv: (kv[1]["records"][0]["seq"], kv[1]["records"][0]["team_index"]),
+    ))
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(COMBOS_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    _cache = data
+    _cache_mtime = COMBOS_FILE.stat().st_mtime_ns
+
+
+def rebuild() -> dict[str, Any]:
+    """Recompute the whole view from contests.json."""
+    contests: list[dict[str, Any]] = []
+    if CONTESTS_FILE.exists():
+        with open(CONTESTS_FILE, "r", encoding="utf-8") as f:
+            contests = json.load(f).get("contests", [])
+    data: dict[str, Any] = {"combos": {}, "seqs": {}, "next_seq": len(contests)}
+    for seq, c in enumerate(contests):
+        data["seqs"][c["id"]] = seq
+        _add(data, c, seq)
+    _save(data)
+    return data
+
+
+def load() -> dict[str, Any]:
+    """Return the view, rebuilding it if contests.json changed behind our back."""
+    global _cache_mtime, _cache
+    if not COMBOS_FILE.exists():
+        return rebuild()
+    mtime = COMBOS_FILE.stat().st_mtime_ns
+    if mtime != _cache_mtime:
+        with open(COMBOS_FILE, "r", encoding="utf-8") as f:
+            _cache = json.load(f)
+        _cache_mtime = mtime
+    if _cache.get("contests_version") != _contests_version():
+        return rebuild()
+    return _cache
+
+
+def apply_contest_change(
+    contests: list[dict[str, Any]], contest_id: str, contest: dict[str, Any] | None
+) -> None:
+    """Update the view after contests.json was saved.
+
+    `contests` is the saved list; pass the new contest dict after a create or
+    update, or None after a delete. Only combos that played in this contest
+    are touched. If the view doesn't cover exactly the other contests (e.g.
+    contests.json was edited by hand), it is rebuilt instead.
+    """
+    if not COMBOS_FILE.exists():
+        rebuild()
+        return
+    with open(COMBOS_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    others = {c["id"] for c in contests} - {contest_id}
+    if set(data.get("seqs", {})) - {contest_id} != others:
+        rebuild()
+        return
+
+    seq = _remove(data, contest_id)
+    if contest is not None:
+        if seq is None:
+            seq = data["next_seq"]
+            data["next_seq"] += 1
+        data["seqs"][contest_id] = seq
+        _add(data, contest, seq)
+    _save(data)
@@ -0,0 +1,183 @@
+"""In-memory index of contests.json for the contest list and trends.
+
+Contests are kept in listing order (date descending, creation order within a
+date) and in trend order (date ascending), each with its trend point computed
+once. Trend order carries prefix sums of solves and per-contest average solve
+times, so averages over any date range are two lookups. The listing keeps its
+sort keys and, per team label, the positions of the contests with that label,
+so a page is found by bisection rather than by filtering every contest.
+Contest CRUD patches the index in place; it is rebuilt when contests.json
+changes behind our back.
+"""
+
+import json
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CONTESTS_FILE = DATA_DIR / "contests.json"
+
+RECENT_CONTESTS = 5
+
+
+def _trend_point(c: dict[str, Any]) -> dict[str, Any]:
+    results = c.get("results", [])
+    solved = [r for r in results if r.get("solved_by_team")]
+    counts_by_team: dict[str, int] = {}
+    times_by_team: dict[str, list[int]] = {}
+    all_times: list[int] = []
+
+    for r in solved:
+        team = r["solved_by_team"]
+        counts_by_team[team] = counts_by_team.get(team, 0) + 1
+        if r.get("solve_time_minutes") is not None:
+            times_by_team.setdefault(team, []).append(r["solve_time_minutes"])
+            all_times.append(r["solve_time_minutes"])
+
+    return {
+        "contest_id": c["id"],
+        "date": c["date"],
+        "contest_name": c["contest_name"],
+        "total_problems": len(results),
+        "solved_count": len(solved),
+        "solve_counts_by_team": counts_by_team,
+        "avg_solve_time_minutes": sum(all_times) / len(all_times) if all_times else None,
+        "avg_solve_times_by_team": {t: sum(ts) / len(ts) for t, ts in times_by_team.items()},
+    }
+
+
+def _sort_key(c: dict[str, Any]) -> tuple[str, str, str]:
+    return (c["date"], c.get("created_at", ""), c["id"])
+
+
+class ContestIndex:
+    """Contests in listing and trend order, plus trend prefix sums."""
+
+    def __init__(self, contests: list[dict[str, Any]]) -> None:
+        self.contests: dict[str, dict[str, Any]] = {c["id"]: c for c in contests}
+        self.points: dict[str, dict[str, Any]] = {c["id"]: _trend_point(c) for c in contests}
+        self._reorder()
+
+    def _reorder(self) -> None:
+        by_created = sorted(self.contests.values(), key=lambda c: (c.get("created_at", ""), c["id"]))
+        self.trend_order: list[dict[str, Any]] = sorted(by_created, key=lambda c: c["date"])
+        self.listing: list[dict[str, Any]] = sorted(by_created, key=lambda c: c["date"], reverse=True)
+        self.dates: list[str] = [c["date"] for c in self.trend_order]
+        self.listing_keys: list[tuple[str, str, str]] = [_sort_key(c) for c in self.listing]
+        self.label_rows: dict[str, list[int]] = {}
+        for i, c in enumerate(self.listing):
+            for label in {t["label"] for t in c.get("teams", [])}:
+                self.label_rows.setdefault(label, []).append(i)
+
+        # prefix[i] = totals over trend_order[:i]
+        self.prefix_solves = [0]
+        self.prefix_time_sum = [0]
+        self.prefix_time_count = [0]
+        for c in self.trend_order:
+            p = self.points[c["id"]]
+            self.prefix_solves.append(self.prefix_solves[-1] + p["solved_count"])
+            has_time = p["avg_solve_time_minutes"] is not None
+            self.prefix_time_sum.append(
+                self.prefix_time_sum[-1] + p["avg_solve_time_minutes"] if has_time else self.prefix_time_sum[-1]
+            )
+            self.prefix_time_count.append(self.prefix_time_count[-1] + has_time)
+
+    def apply(self, contest_id: str, contest: dict[str, Any] | None) -> None:
+        self.contests.pop(contest_id, None)
+        self.points.pop(contest_id, None)
+        if contest is not None:
+            self.contests[contest_id] = contest
+            self.points[contest_id] = _trend_point(contest)
+        self._reorder()
+
+    def page(
+        self,
+        cursor: tuple[str, str, str] | None,
+        limit: int | None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        team_label: str | None = None,
+    ) -> tuple[list[dict[str, Any]], int, dict[str, Any] | None]:
+        """One page of the listing: (contests, total matching, last contest if more remain).
+
+        `cursor` is the sort key of the last contest already returned.
+        """
+        # self.dates ascends while the listing descends, so each bound counts from the end
+        n = len(self.listing)
+        lo = 0 if date_to is None else n - bisect_right(self.dates, date_to)
+        hi = n if date_from is None else n - bisect_left(self.dates, date_from)
+        hi = max(lo, hi)
+        start = lo
+        if cursor is not None:
+            # Contests on the cursor's date are adjacent, in ascending sort key order
+            day_lo = n - bisect_right(self.dates, cursor[0])
+            day_hi = n - bisect_left(self.dates, cursor[0])
+            start = max(lo, bisect_right(self.listing_keys, tuple(cursor), day_lo, day_hi))
+
+        rows: range | list[int] = range(n) if team_label is None else self.label_rows.get(team_label, [])
+        first, stop = bisect_left(rows, lo), bisect_left(rows, hi)
+        begin = bisect_left(rows, start, first, stop)
+        end = stop if limit is None else min(stop, begin + limit)
+        page = [self.listing[i] for i in rows[begin:end]]
+        last = page[-1] if page and end < stop else None
+        return page, stop - first, last
+
+    def trends(self, date_from: str | None = None, date_to: str | None = None) -> dict[str, Any]:
+        """Trend points in [date_from, date_to] with overall and recent averages."""
+        lo = 0 if date_from is None else bisect_left(self.dates, date_from)
+        hi = len(self.dates) if date_to is None else bisect_right(self.dates, date_to)
+        hi = max(lo, hi)
+        points = [self.points[c["id"]] for c in self.trend_order[lo:hi]]
+
+        n = hi - lo
+        time_count = self.prefix_time_count[hi] - self.prefix_time_count[lo]
+        recent = points[-RECENT_CONTESTS:]
+        recent_times = [p["avg_solve_time_minutes"] for p in recent if p["avg_solve_time_minutes"] is not None]
+        return {
+            "points": points,
+            "overall_avg_solves": (self.prefix_solves[hi] - self.prefix_solves[lo]) / n if n else 0,
+            "overall_avg_time": (
+                (self.prefix_time_sum[hi] - self.prefix_time_sum[lo]) / time_count if time_count else None
+            ),
+            "recent_avg_solves": sum(p["solved_count"] for p in recent) / len(recent) if recent else 0,
+            "recent_avg_time": sum(recent_times) / len(recent_times) if recent_times else None,
+        }
+
+
+_index_mtime: int | None = None
+_index: ContestIndex | None = None
+
+
+def _contests_version() -> int | None:
+    return CONTESTS_FILE.stat().st_mtime_ns if CONTESTS_FILE.exists() else None
+
+
+def load() -> ContestIndex:
+    """Return the index for the current contests.json."""
+    global _index_mtime, _index
+    mtime = _contests_version()
+    if _index is None or mtime != _index_mtime:
+        contests: list[dict[str, Any]] = []
+        if CONTESTS_FILE.exists():
+            with open(CONTESTS_FILE, "r", encoding="utf-8") as f:
+                contests = json.load(f).get("contests", [])
+        _index = ContestIndex(contests)
+        _index_mtime = mtime
+    return _index
+
+
+def apply_contest_change(
+    contests: list[dict[str, Any]], contest_id: str, contest: dict[str, Any] | None
+) -> None:
+    """Patch the index after contests.json was saved (contest=None after a delete).
+
+    If the cached index doesn't cover exactly the other contests, it is
+    dropped and rebuilt on the next load().
+    """
+    global _index_mtime, _index
+    if _index is None or set(_index.contests) - {contest_id} != {c["id"] for c in contests} - {contest_id}:
+        _index = None
+        return
+    _index.apply(contest_id, None if contest is None else dict(contest))
+    _index_mtime = _contests_version()
@@ -0,0 +1,94 @@
+"""Spatial queries over the Cosmos 3D layout, backed by a KD-tree.
+
+A scipy cKDTree over the positions.json coordinates is built once per file
+version. Box, radius and k-nearest queries then touch only the points they
+return, so the Cosmos page can fetch one neighborhood instead of all 10K
+problems.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+POSITIONS_FILE = DATA_DIR / "positions.json"
+
+_lock = threading.Lock()
+_space: "CosmosSpace | None" = None
+_space_mtime: int | None = None
+
+
+class CosmosSpace:
+    """Problems from positions.json plus a KD-tree over their xyz."""
+
+    def __init__(self, problems: list[dict[str, Any]]) -> None:
+        import numpy as np
+        from scipy.spatial import cKDTree
+
+        self.problems = problems
+        self.pos = {p["id"]: i for i, p in enumerate(problems)}
+        self.xyz = np.array([[p["x"], p["y"], p["z"]] for p in problems], dtype=np.float64).reshape(-1, 3)
+        self.tree = cKDTree(self.xyz)
+
+    def _result(self, rows: list[int], dists: list[float] | None = None) -> list[dict[str, Any]]:
+        out = []
+        for n, i in enumerate(rows):
+            item = dict(self.problems[i])
+            if dists is not None:
+                item["distance"] = round(dists[n], 4)
+            out.append(item)
+        return out
+
+    def radius(self, center: tuple[float, float, float], r: float, limit: int) -> tuple[list[dict[str, Any]], int]:
+        """Problems within Euclidean distance r of center, nearest first."""
+        import numpy as np
+
+        rows = np.array(self.tree.query_ball_point(center, r), dtype=np.int64)
+        dists = np.linalg.norm(self.xyz[rows] - center, axis=1) if len(rows) else np.zeros(0)
+        order = np.lexsort((rows, dists))[:limit]
+        return self._result(rows[order].tolist(), dists[order].tolist()), len(rows)
+
+    def knn(self, center: tuple[float, float, float], k: int) -> tuple[list[dict[str, Any]], int]:
+        """The k problems nearest to center."""
+        import numpy as np
+
+        k = min(k, len(self.problems))
+        if k == 0:
+            return [], 0
+        dists, rows = self.tree.query(center, k=k)
+        dists, rows = np.atleast_1d(dists), np.atleast_1d(rows)
+        return self._result(rows.tolist(), dists.tolist()), k
+
+    def box(
+        self, lo: tuple[float, float, float], hi: tuple[float, float, float], limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Problems inside the axis-aligned box [lo, hi], in stored order.
+
+        The tree is searched with the Chebyshev ball around the box center
+        that covers it, then trimmed to the exact box.
+        """
+        import numpy as np
+
+        lo_a, hi_a = np.asarray(lo, dtype=np.float64), np.asarray(hi, dtype=np.float64)
+        center = (lo_a + hi_a) / 2
+        half = float((hi_a - lo_a).max()) / 2
+        rows = np.array(sorted(self.tree.query_ball_point(center, half, p=np.inf)), dtype=np.int64)
+        if len(rows):
+            inside = np.all((self.xyz[rows] >= lo_a) & (self.xyz[rows] <= hi_a), axis=1)
+            rows = rows[inside]
+        return self._result(rows[:limit].tolist()), len(rows)
+
+
+def load() -> CosmosSpace | None:
+    """Return the KD-tree for the current positions.json, or None if it isn't built."""
+    global _space, _space_mtime
+    if not POSITIONS_FILE.exists():
+        return None
+    with _lock:
+        mtime = POSITIONS_FILE.stat().st_mtime_ns
+        if _space is None or mtime != _space_mtime:
+            with open(POSITIONS_FILE, "r", encoding="utf-8") as f:
+                _space = CosmosSpace(json.load(f)["problems"])
+            _space_mtime = mtime
+        return _space
@@ -0,0 +1,218 @@
+"""Columnar binary layout and octree level-of-detail tiles for the Cosmos view.
+
+positions.json repeats id, name, rating, tags and x/y/z for every problem.
+This module turns it into three artifacts:
+
+- cosmos_points.bin — little-endian columns: xyz float32 (n x 3), a tag
+  bitmask uint32 (n x tag_words, bit i = manifest tag i), rating uint16 (n)
+- cosmos_names.json — {"ids": [...], "names": [...]}, fetched lazily
+- cosmos_manifest.json — column layout, tag list, bounds and octree tiles
+
+Points are stored in tile order, so every tile is one contiguous row range
+[start, start + count). The root tile is a spatially even sample of the
+whole cloud; each child covers one octant of its parent and holds an even
+sample of the points its ancestors didn't take. A client renders the root
+first and then fetches only the children that are in view and close enough
+to need more detail.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+POSITIONS_FILE = DATA_DIR / "positions.json"
+POINTS_FILE = DATA_DIR / "cosmos_points.bin"
+NAMES_FILE = DATA_DIR / "cosmos_names.json"
+MANIFEST_FILE = DATA_DIR / "cosmos_manifest.json"
+
+TILE_POINTS = 512
+SAMPLE_GRID = 8  # per-axis cells used to spread a tile's sample over its box
+MAX_DEPTH = 8
+
+_lock = threading.Lock()
+_points_cache: tuple[int, bytes] | None = None
+_manifest_cache: tuple[int, dict[str, Any]] | None = None
+
+
+def _sample(idx: "np.ndarray", xyz: "np.ndarray", lo: "np.ndarray", size: float) -> "np.ndarray":
+    """Boolean mask choosing up to TILE_POINTS of `idx`, one per grid cell first."""
+    import numpy as np
+
+    cell_size = size / SAMPLE_GRID
+    cells = np.clip(((xyz[idx] - lo) / cell_size).astype(np.int64), 0, SAMPLE_GRID - 1)
+    cell_id = (cells[:, 0] * SAMPLE_GRID + cells[:, 1]) * SAMPLE_GRID + cells[:, 2]
+    # Rank of each point within its cell (0 for the first point seen there)
+    order = np.argsort(cell_id, kind="stable")
+    sorted_cells = cell_id[order]
+    group_start = np.r_[0, np.flatnonzero(np.diff(sorted_cells)) + 1]
+    starts = np.repeat(group_start, np.diff(np.r_[group_start, len(order)]))
+    rank = np.empty(len(idx), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - starts
+    chosen = np.argsort(rank, kind="stable")[:TILE_POINTS]
+    mask = np.zeros(len(idx), dtype=bool)
+    mask[chosen] = True
+    return mask
+
+
+def build_tiles(xyz: "np.ndarray") -> tuple[list[dict[str, Any]], "np.ndarray"]:
+    """Octree tiles over the points and the row order that makes each tile contiguous.
+
+    Returns (tiles, order) where tiles are in breadth-first order and
+    order[k] is the original index of the k-th stored point.
+    """
+    import numpy as np
+
+    lo = xyz.min(axis=0) if len(xyz) else np.zeros(3)
+    size = float((xyz.max(axis=0) - lo).max()) if len(xyz) else 1.0
+    size = size or 1.0
+
+    tiles: list[dict[str, Any]] = []
+    members: list[np.ndarray] = []
+    queue: list[tuple[str, np.ndarray, np.ndarray, float, int]] = [
+        ("r", np.arange(len(xyz)), lo.astype(np.float64), size, 0)
+    ]
+    # Breadth-first, so coarse tiles come first in the file
+    while queue:
+        tile_id, idx, box_lo, box_size, depth = queue.pop(0)
+        if len(idx) <= TILE_POINTS or depth == MAX_DEPTH:
+            own, rest = idx, idx[:0]
+        else:
+            mask = _sample(idx, xyz, box_lo, box_size)
+            own, rest = idx[mask], idx[~mask]
+
+        children: list[str] = []
+        if len(rest):
+            half = box_size / 2
+            octant = ((xyz[rest] - box_lo) >= half).astype(np.int64)
+            code = octant[:, 0] * 4 + octant[:, 1] * 2 + octant[:, 2]
+            for c in range(8):
+                sub = rest[code == c]
+                if len(sub):
+                    child_lo = box_lo + half * np.array([c >> 2 & 1, c >> 1 & 1, c & 1])
+                    children.append(f"{tile_id}{c}")
+                    queue.append((children[-1], sub, child_lo, half, depth + 1))
+
+        tiles.append({
+            "id": tile_id,
+            "depth": depth,
+            "min": [round(float(v), 3) for v in box_lo],
+            "max": [round(float(v + box_size), 3) for v in box_lo],
+            "count": int(len(own)),
+            "children": children,
+        })
+        members.append(own)
+
+    start = 0
+    for tile in tiles:
+        tile["start"] = start
+        start += tile["count"]
+    order = np.concatenate(members) if members else np.zeros(0, dtype=np.int64)
+    return tiles, order
+
+
+def write_artifacts(problems: list[dict[str, Any]]) -> dict[str, Any]:
+    """Write points, names and manifest for a positions.json problem list."""
+    import numpy as np
+
+    xyz = np.array([[p["x"], p["y"], p["z"]] for p in problems], dtype=np.float32).reshape(-1, 3)
+    tiles, order = build_tiles(xyz)
+
+    # Most common tags first, so the usual colors live in the first word
+    counts: dict[str, int] = {}
+    for p in problems:
+        for t in p.get("tags", []):
+            counts[t] = counts.get(t, 0) + 1
+    tags = sorted(counts, key=lambda t: (-counts[t], t))
+    bit = {t: i for i, t in enumerate(tags)}
+    tag_words = max(1, -(-len(tags) // 32))
+
+    mask = np.zeros((len(problems), tag_words), dtype="<u4")
+    for row, p in enumerate(problems):
+        for t in p.get("tags", []):
+            mask[row, bit[t] // 32] |= np.uint32(1 << (bit[t] % 32))
+    ratings = np.array([max(0, min(65535, p.get("rating") or 0)) for p in problems], dtype="<u2")
+
+    columns = [
+        ("xyz", xyz[order].astype("<f4")),
+        ("tags", mask[order]),
+        ("rating", ratings[order]),
+    ]
+    blob = b"".join(col.tobytes() for _, col in columns)
+    layout: dict[str, Any] = {}
+    offset = 0
+    for name, col in columns:
+        layout[name] = {
+            "offset": offset,
+            "dtype": col.dtype.name,
+            "width": 1 if col.ndim == 1 else col.shape[1],
+        }
+        offset += col.nbytes
+
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(POINTS_FILE, "wb") as f:
+        f.write(blob)
+    with open(NAMES_FILE, "w", encoding="utf-8") as f:
+        json.dump({
+            "ids": [problems[i]["id"] for i in order],
+            "names": [problems[i].get("name", "") for i in order],
+        }, f, ensure_ascii=False)
+
+    manifest = {
+        "version": hashlib.sha1(blob).hexdigest()[:16],
+        "total": len(problems),
+        "tile_points": TILE_POINTS,
+        "tags": tags,
+        "tag_words": tag_words,
+        "columns": layout,
+        "tiles": tiles,
+    }
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def ensure_built() -> bool:
+    """Rebuild the artifacts if positions.json is newer; False if there's no positions.json."""
+    if not POSITIONS_FILE.exists():
+        return False
+    with _lock:
+        source = POSITIONS_FILE.stat().st_mtime_ns
+        if any(not p.exists() or p.stat().st_mtime_ns < source for p in (POINTS_FILE, NAMES_FILE, MANIFEST_FILE)):
+            with open(POSITIONS_FILE, "r", encoding="utf-8") as f:
+                write_artifacts(json.load(f)["problems"])
+    return True
+
+
+def load_manifest() -> dict[str, Any]:
+    global _manifest_cache
+    mtime = MANIFEST_FILE.stat().st_mtime_ns
+    if _manifest_cache is None or _manifest_cache[0] != mtime:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            _manifest_cache = (mtime, json.load(f))
+    return _manifest_cache[1]
+
+
+def _points() -> bytes:
+    global _points_cache
+    mtime = POINTS_FILE.stat().st_mtime_ns
+    if _points_cache is None or _points_cache[0] != mtime:
+        _points_cache = (mtime, POINTS_FILE.read_bytes())
+    return _points_cache[1]
+
+
+def tile_bytes(manifest: dict[str, Any], tile: dict[str, Any]) -> bytes:
+    """One tile's rows of each column, concatenated in manifest column order."""
+    blob = _points()
+    parts = []
+    for name in ("xyz", "tags", "rating"):
+        col = manifest["columns"][name]
+        row_bytes = col["width"] * (2 if col["dtype"] == "uint16" else 4)
+        start = col["offset"] + tile["start"] * row_bytes
+        parts.append(blob[start:start + tile["count"] * row_bytes])
+    return b"".join(parts)
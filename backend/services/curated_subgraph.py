@@ -0,0 +1,89 @@
+"""Precomputed curated subgraph: curated problems and the edges between them.
+
+The subgraph depends only on graph.json and problems.json, so it is built
+once and stored as curated_subgraph.json, with the content hashes of both
+inputs recorded in curated_subgraph.key. It is rebuilt when either hash
+changes. The key also serves as the endpoint's ETag.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from . import artifacts, graph_store
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PROBLEMS_FILE = DATA_DIR / "problems.json"
+SUBGRAPH_FILE = DATA_DIR / "curated_subgraph.json"
+KEY_FILE = DATA_DIR / "curated_subgraph.key"
+
+_lock = threading.Lock()
+
+
+def input_key() -> str | None:
+    """Hash of the graph.json and problems.json contents, or None if either is missing."""
+    if not graph_store.GRAPH_FILE.exists() or not PROBLEMS_FILE.exists():
+        return None
+    combined = artifacts.digest(graph_store.GRAPH_FILE) + artifacts.digest(PROBLEMS_FILE)
+    return hashlib.sha1(combined.encode("ascii")).hexdigest()[:20]
+
+
+def build(graph: dict[str, Any], problems: list[dict[str, Any]]) -> dict[str, Any]:
+    """Nodes for curated problems in the graph, and their edges, each pair once.
+
+    Edges come in problems.json order: for each problem, its graph
+    neighbors that are curated and not yet paired with it.
+    """
+    key_to_id: dict[str, str] = {}
+    for p in problems:
+        gkey = graph_store.compact_to_graph_key(p["id"])
+        if gkey:
+            key_to_id[gkey] = p["id"]
+
+    neighbors = graph.get("neighbors", {})
+    nodes = [
+        {
+            "id": p["id"],
+            "name": p["name"],
+            "rating": p.get("rating", 0),
+            "topic": p.get("topic", ""),
+        }
+        for p in problems
+        if graph_store.compact_to_graph_key(p["id"])
+    ]
+
+    seen: set[tuple[str, str]] = set()
+    edges: list[dict[str, Any]] = []
+    for gkey, pid in key_to_id.items():
+        for nb in neighbors.get(gkey, []):
+            nb_id = key_to_id.get(nb["id"])
+            if nb_id is None:
+                continue
+            pair = (min(pid, nb_id), max(pid, nb_id))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            edges.append({"source": pid, "target": nb_id, "score": nb["score"]})
+    return {"nodes": nodes, "edges": edges}
+
+
+def ensure() -> str | None:
+    """Make curated_subgraph.json current; returns its key, or None if inputs are missing."""
+    key = input_key()
+    if key is None:
+        return None
+    with _lock:
+        if SUBGRAPH_FILE.exists() and KEY_FILE.exists() and KEY_FILE.read_text(encoding="utf-8") == key:
+            return key
+        graph = graph_store.load_graph()
+        with open(PROBLEMS_FILE, "r", encoding="utf-8") as f:
+            problems = json.load(f)
+        if graph is None or not problems:
+            return None
+        with open(SUBGRAPH_FILE, "w", encoding="utf-8") as f:
+            json.dump(build(graph, problems), f, ensure_ascii=False)
+        artifacts.write_compressed(SUBGRAPH_FILE)
+        KEY_FILE.write_text(key, encoding="utf-8")
+    return key
@@ -5,8 +5,12 @@ import re
 from pathlib import Path
 from typing import Any
 
-import cloudscraper
-from bs4 import BeautifulSoup
+
+def _parse_html(html: str) -> Any:
+    # bs4 and cloudscraper are imported on first use, not at API startup
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, 'html.parser')
 
 
 class EditorialFetcher:
@@ -14,15 +18,24 @@ class EditorialFetcher:
 
     def __init__(self, cache_path: Path):
         self.cache_path = cache_path
-        self.scraper = cloudscraper.create_scraper(
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'mobile': False
-            }
-        )
+        self._scraper = None
         self.cache: dict[str, Any] = self._load_cache()
 
+    @property
+    def scraper(self) -> Any:
+        """cloudscraper session, created on the first uncached lookup."""
+        if self._scraper is None:
+            import cloudscraper
+
+            self._scraper = cloudscraper.create_scraper(
+                browser={
+                    'browser': 'chrome',
+                    'platform': 'windows',
+                    'mobile': False
+                }
+            )
+        return self._scraper
+
     def _load_cache(self) -> dict[str, Any]:
         """Load cached editorial data."""
         if self.cache_path.exists():
@@ -86,7 +99,7 @@ class EditorialFetcher:
             if response.status_code != 200:
                 return None
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = _parse_html(response.text)
 
             # Look for "Tutorial" link in the sidebar or problem menu
             # CF sometimes has a "Tutorial" tab/link
@@ -104,7 +117,7 @@ class EditorialFetcher:
             response = self.scraper.get(contest_url, timeout=10)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = _parse_html(response.text)
                 # Look for "Tutorial" or "Editorial" text in sidebar
                 for link in soup.find_all('a', href=re.compile(r'/blog/entry/\d+')):
                     text = link.get_text(strip=True).lower()
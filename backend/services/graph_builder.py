@@ -12,8 +12,6 @@ scripts/build_graph.py instead.
 
 import json
 import logging
-import math
-import os
 import re
 from datetime import datetime, timezone
 from pathlib import Path
@@ -25,9 +23,6 @@ logger = logging.getLogger(__name__)
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 
-HF_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
-BATCH_SIZE = 50
-
 
 def _problem_id_to_graph_key(pid: str) -> str | None:
     """Convert '1352C' to '1352/C'."""
@@ -37,52 +32,110 @@ def _problem_id_to_graph_key(pid: str) -> str | None:
     return f"{m.group(1)}/{m.group(2)}"
 
 
-def _compute_similarity(p1: dict[str, Any], p2: dict[str, Any]) -> float:
-    """Compute similarity between two curated problems using metadata.
+TOPIC_WEIGHT = 0.5
+RATING_WEIGHT = 0.3
+RATING_SIGMA = 300
+NAME_WEIGHT = 0.2
+SIMILARITY_BLOCK = 1024  # rows scored at a time, bounds memory at ~block * n floats
 
-    Factors: topic match (strongest signal), rating proximity, name word overlap.
-    Returns a score in [0, 1].
-    """
-    score = 0.0
 
-    # Topic match: strongest signal for curated problems
-    if p1.get("topic") and p1["topic"] == p2.get("topic"):
-        score += 0.5
+def _metadata_neighbors(
+    problems: list[dict[str, Any]], problem_ids: list[str], k: int
+) -> dict[str, list[dict[str, Any]]]:
+    """Top-k neighbors per problem by metadata similarity, a score in [0, 1].
 
-    # Rating proximity: closer ratings → more similar
-    r1 = p1.get("rating", 0)
-    r2 = p2.get("rating", 0)
-    if r1 > 0 and r2 > 0:
-        rating_diff = abs(r1 - r2)
-        # Gaussian decay: sigma=300
-        score += 0.3 * math.exp(-(rating_diff ** 2) / (2 * 300 ** 2))
+    score = 0.5 * [same topic]
+          + 0.3 * exp(-rating_diff^2 / (2 * 300^2))   (both rated)
+          + 0.2 * Jaccard(name words)
 
-    # Name word overlap (basic text similarity)
-    words1 = set(p1.get("name", "").lower().split())
-    words2 = set(p2.get("name", "").lower().split())
-    if words1 and words2:
-        overlap = len(words1 & words2)
-        union = len(words1 | words2)
-        score += 0.2 * (overlap / union)
+    Scores are computed for a block of rows at a time. Topic equality is a
+    dense broadcast, the rating Gaussian is looked up from a table over the
+    distinct ratings, and name-word intersections come from a sparse
+    product of the word-incidence matrix, so only pairs sharing a word pay
+    for the Jaccard. Top-k is an argpartition per block; ties go to the
+    earlier problem.
+    """
+    from scipy.sparse import csr_matrix
+
+    n = len(problems)
+    if k <= 0:
+        return {pid: [] for pid in problem_ids}
+    topics = [p.get("topic") or "" for p in problems]
+    topic_ids = {t: i for i, t in enumerate(sorted(set(topics) - {""}))}
+    topic_code = np.array([topic_ids.get(t, -1) for t in topics], dtype=np.int64)
+
+    # Unrated problems (rating 0) get a zero row/column in the Gaussian table
+    distinct, rating_code = np.unique(
+        np.array([p.get("rating", 0) or 0 for p in problems], dtype=np.float64), return_inverse=True
+    )
+    diff = distinct[:, None] - distinct[None, :]
+    gauss = RATING_WEIGHT * np.exp(-(diff ** 2) / (2 * RATING_SIGMA ** 2))
+    gauss[distinct <= 0, :] = 0.0
+    gauss[:, distinct <= 0] = 0.0
+
+    vocab: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, p in enumerate(problems):
+        for word in set(p.get("name", "").lower().split()):
+            rows.append(i)
+            cols.append(vocab.setdefault(word, len(vocab)))
+    words = csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=(n, max(len(vocab), 1)),
+    )
+    word_count = np.asarray(words.sum(axis=1)).ravel()
+    words_t = words.T.tocsc()
 
-    return score
+    neighbors: dict[str, list[dict[str, Any]]] = {}
+    for start in range(0, n, SIMILARITY_BLOCK):
+        stop = min(start + SIMILARITY_BLOCK, n)
+        block = np.arange(start, stop)
+
+        same_topic = (topic_code[block, None] == topic_code[None, :]) & (topic_code[block, None] >= 0)
+        scores = TOPIC_WEIGHT * same_topic
+        scores += gauss[rating_code[block, None], rating_code[None, :]]
+
+        overlap = (words[start:stop] @ words_t).tocoo()
+        union = word_count[overlap.row + start] + word_count[overlap.col] - overlap.data
+        scores[overlap.row, overlap.col] += NAME_WEIGHT * (overlap.data / union)
+        scores[block - start, block] = -np.inf
+
+        # argpartition is exact unless the k-th score is tied past the cut;
+        # those rows are redone so ties go to the earlier problem
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        kth = top_scores.min(axis=1)
+        ambiguous = (scores >= kth[:, None]).sum(axis=1) > k
+
+        for r, i in enumerate(block):
+            row = scores[r]
+            if ambiguous[r]:
+                above = np.flatnonzero(row > kth[r])
+                tied = np.flatnonzero(row == kth[r])[: k - len(above)]
+                idx = np.concatenate([above, tied])
+            else:
+                idx = top[r]
+            idx = idx[np.lexsort((idx, -row[idx]))]
+            neighbors[problem_ids[i]] = [
+                {
+                    "id": problem_ids[j],
+                    "score": round(float(row[j]), 4),
+                    "shared_tags": [topics[i]] if same_topic[r, j] else [],
+                }
+                for j in idx.tolist()
+            ]
+    return neighbors
 
 
 def _try_hf_embeddings(problems: list[dict[str, Any]], problem_ids: list[str]) -> dict[str, list[dict[str, Any]]] | None:
     """Try to build graph using HF API embeddings. Returns None if unavailable."""
-    token = os.environ.get("HF_API_TOKEN") or os.environ.get("HUGGINGFACE_TOKEN")
-    if not token:
-        return None
+    from . import hf_embeddings
 
-    logger.info("HF_API_TOKEN found, using embedding-based graph...")
-
-    try:
-        from huggingface_hub import InferenceClient
-    except ImportError:
-        logger.warning("huggingface_hub not installed, falling back to metadata graph.")
+    if not hf_embeddings.hf_token():
         return None
 
-    client = InferenceClient(token=token)
+    logger.info("HF_API_TOKEN found, using embedding-based graph...")
 
     # Build text representations
     texts = []
@@ -93,25 +146,14 @@ def _try_hf_embeddings(problems: list[dict[str, Any]], problem_ids: list[str]) -
         tier = "beginner" if rating <= 1200 else "intermediate" if rating <= 1600 else "advanced" if rating <= 2000 else "expert"
         texts.append(f"{name} | topic: {topic} | difficulty: {tier} ({rating})")
 
-    # Embed via HF API in batches
-    all_embeddings = []
-    for i in range(0, len(texts), BATCH_SIZE):
-        batch = texts[i : i + BATCH_SIZE]
-        batch_num = i // BATCH_SIZE + 1
-        total_batches = (len(texts) + BATCH_SIZE - 1) // BATCH_SIZE
-        logger.info(f"  Embedding batch {batch_num}/{total_batches}...")
-        try:
-            results = [client.feature_extraction(t, model=HF_MODEL) for t in batch]
-            all_embeddings.append(np.array(results, dtype=np.float32))
-        except Exception as e:
-            logger.warning(f"  HF API failed: {e}")
-            return None
-
-    embeddings = np.vstack(all_embeddings)
-    # L2-normalize
-    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-    norms[norms == 0] = 1
-    embeddings = embeddings / norms
+    try:
+        embeddings = hf_embeddings.embed_texts(texts)
+    except ImportError:
+        logger.warning("huggingface_hub not installed, falling back to metadata graph.")
+        return None
+    except Exception as e:
+        logger.warning(f"  HF API failed: {e}")
+        return None
 
     # Build FAISS index
     import faiss
@@ -185,23 +227,7 @@ def build_curated_graph() -> bool:
     if neighbors is None:
         # Fallback: metadata-based similarity (no external deps)
         logger.info("Building metadata-based graph (no HF token)...")
-        k = min(20, len(valid_problems) - 1)
-        neighbors = {}
-        for i, pid in enumerate(problem_ids):
-            scored: list[tuple[str, float, list[str]]] = []
-            p1 = valid_problems[i]
-            for j, nb_id in enumerate(problem_ids):
-                if i == j:
-                    continue
-                p2 = valid_problems[j]
-                sim = _compute_similarity(p1, p2)
-                shared = [p1["topic"]] if p1.get("topic") and p1["topic"] == p2.get("topic") else []
-                scored.append((nb_id, sim, shared))
-            scored.sort(key=lambda x: x[1], reverse=True)
-            neighbors[pid] = [
-                {"id": nb_id, "score": round(sim, 4), "shared_tags": shared}
-                for nb_id, sim, shared in scored[:k]
-            ]
+        neighbors = _metadata_neighbors(valid_problems, problem_ids, min(20, len(valid_problems) - 1))
 
     graph = {
         "meta": {
@@ -219,4 +245,9 @@ def build_curated_graph() -> bool:
         json.dump(graph, f, ensure_ascii=False)
     logger.info(f"  Saved graph.json: {graph['meta']['total_problems']} problems, {graph['meta']['total_edges']} edges")
 
+    from . import graph_clusters
+    from .curated_subgraph import ensure as build_curated_subgraph
+    build_curated_subgraph()
+    graph_clusters.ensure()
+
     return True
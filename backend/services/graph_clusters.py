@@ -0,0 +1,227 @@
+"""Communities in the similarity graph, with per-cluster summaries.
+
+Weighted label propagation runs over the symmetrized kNN graph. Every
+problem starts in its own cluster and repeatedly joins the label with the
+largest total edge score among its neighbors, until no label changes.
+It runs in a few passes over the edges. Nodes are visited in a fixed
+shuffled order and ties go to the smaller label, so a given graph always
+gives the same clusters.
+
+The result is written to clusters.json as a build step after the graph
+(scripts/build_graph.py, graph_builder.build_curated_graph). It is keyed on
+the content hashes of its inputs (recorded in clusters.key), like
+curated_subgraph.json, and holds:
+
+- assignments — graph key -> cluster id (ids ordered by cluster size)
+- clusters — size, dominant tags, rating range, curated coverage and a
+  representative problem for each cluster
+"""
+
+import hashlib
+import json
+import random
+import statistics
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from . import artifacts, graph_store
+from .graph_paths import SimilarityGraph
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PROBLEMS_FILE = DATA_DIR / "problems.json"
+RAW_FILE = DATA_DIR / "cf_problems_raw.json"
+CLUSTERS_FILE = DATA_DIR / "clusters.json"
+KEY_FILE = DATA_DIR / "clusters.key"
+
+MAX_ITERATIONS = 50
+TOP_TAGS = 5
+SEED = 0
+
+_lock = threading.Lock()
+_clusters_cache: tuple[int, dict[str, Any]] | None = None
+
+
+def input_key() -> str | None:
+    """Hash of graph.json, problems.json and (if present) the CF catalog, or None without a graph."""
+    if not graph_store.GRAPH_FILE.exists():
+        return None
+    parts = [artifacts.digest(p) for p in (graph_store.GRAPH_FILE, PROBLEMS_FILE, RAW_FILE) if p.exists()]
+    return hashlib.sha1("".join(parts).encode("ascii")).hexdigest()[:20]
+
+
+def label_propagation(graph: SimilarityGraph, max_iterations: int = MAX_ITERATIONS) -> tuple[list[int], int]:
+    """Cluster label per node and the number of passes it took to settle."""
+    n = len(graph.keys)
+    labels = list(range(n))
+    order = list(range(n))
+    random.Random(SEED).shuffle(order)
+    indptr, indices, scores = graph.indptr, graph.indices, graph.scores
+
+    passes = 0
+    for passes in range(1, max_iterations + 1):
+        changed = 0
+        for u in order:
+            weight: dict[int, float] = {}
+            for e in range(indptr[u], indptr[u + 1]):
+                label = labels[indices[e]]
+                weight[label] = weight.get(label, 0.0) + scores[e]
+            if not weight:
+                continue
+            top = max(weight.values())
+            # Staying put on a tie keeps the passes from oscillating
+            if weight.get(labels[u], -1.0) >= top:
+                continue
+            labels[u] = min(label for label, w in weight.items() if w == top)
+            changed += 1
+        if not changed:
+            break
+    return labels, passes
+
+
+def _problem_meta() -> tuple[dict[str, dict[str, Any]], set[str]]:
+    """Tags/rating/name per graph key (CF catalog, then curated list) and the curated keys."""
+    meta: dict[str, dict[str, Any]] = {}
+    if RAW_FILE.exists():
+        with open(RAW_FILE, "r", encoding="utf-8") as f:
+            for p in json.load(f):
+                if p.get("contestId") is not None and p.get("index"):
+                    meta[f"{p['contestId']}/{p['index']}"] = {
+                        "name": p.get("name", ""),
+                        "rating": p.get("rating") or 0,
+                        "tags": p.get("tags", []),
+                    }
+    curated: set[str] = set()
+    if PROBLEMS_FILE.exists():
+        with open(PROBLEMS_FILE, "r", encoding="utf-8") as f:
+            for p in json.load(f):
+                key = graph_store.compact_to_graph_key(p["id"])
+                if key is None:
+                    continue
+                curated.add(key)
+                meta.setdefault(key, {
+                    "name": p["name"],
+                    "rating": p.get("rating", 0),
+                    "tags": [p["topic"]] if p.get("topic") else [],
+                })
+    return meta, curated
+
+
+def summarize(
+    graph: SimilarityGraph,
+    labels: list[int],
+    meta: dict[str, dict[str, Any]],
+    curated: set[str],
+) -> tuple[dict[str, int], list[dict[str, Any]]]:
+    """Renumber clusters by size (largest = 0) and compute each one's stats."""
+    members: dict[int, list[int]] = {}
+    for node, label in enumerate(labels):
+        members.setdefault(label, []).append(node)
+    groups = sorted(members.values(), key=lambda m: (-len(m), m[0]))
+
+    assignments: dict[str, int] = {}
+    clusters: list[dict[str, Any]] = []
+    for cid, nodes in enumerate(groups):
+        inside = set(nodes)
+        tag_counts: dict[str, int] = {}
+        ratings: list[int] = []
+        # Representative: the member most strongly tied to the rest of the cluster
+        best_node, best_weight = nodes[0], -1.0
+        for u in nodes:
+            key = graph.keys[u]
+            assignments[key] = cid
+            info = meta.get(key, {})
+            for tag in info.get("tags", []):
+                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            if info.get("rating"):
+                ratings.append(info["rating"])
+            w = sum(
+                graph.scores[e]
+                for e in range(graph.indptr[u], graph.indptr[u + 1])
+                if graph.indices[e] in inside
+            )
+            if w > best_weight:
+                best_node, best_weight = u, w
+
+        top_tags = sorted(tag_counts, key=lambda t: (-tag_counts[t], t))[:TOP_TAGS]
+        n_curated = sum(1 for u in nodes if graph.keys[u] in curated)
+        rep = graph.keys[best_node]
+        clusters.append({
+            "id": cid,
+            "size": len(nodes),
+            "label": " / ".join(top_tags[:2]) or f"cluster {cid}",
+            "top_tags": [
+                {"tag": t, "count": tag_counts[t], "share": round(tag_counts[t] / len(nodes), 3)}
+                for t in top_tags
+            ],
+            "rating": {
+                "min": min(ratings),
+                "median": int(statistics.median(ratings)),
+                "max": max(ratings),
+            } if ratings else None,
+            "curated": {"count": n_curated, "share": round(n_curated / len(nodes), 3)},
+            "representative": {"id": rep, "name": meta.get(rep, {}).get("name")},
+        })
+    return assignments, clusters
+
+
+def build() -> dict[str, Any] | None:
+    """Cluster the current graph.json; None if it isn't built."""
+    adj = graph_store.load_adjacency()
+    if adj is None:
+        return None
+    graph = SimilarityGraph(adj)
+    labels, passes = label_propagation(graph)
+    meta, curated = _problem_meta()
+    assignments, clusters = summarize(graph, labels, meta, curated)
+    return {
+        "meta": {
+            "algorithm": "label_propagation",
+            "iterations": passes,
+            "total_problems": len(assignments),
+            "total_clusters": len(clusters),
+            "singletons": sum(1 for c in clusters if c["size"] == 1),
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "clusters": clusters,
+        "assignments": assignments,
+    }
+
+
+def ensure() -> str | None:
+    """Make clusters.json current; returns its key, or None if there is no graph."""
+    key = input_key()
+    if key is None:
+        return None
+    with _lock:
+        if CLUSTERS_FILE.exists() and KEY_FILE.exists() and KEY_FILE.read_text(encoding="utf-8") == key:
+            return key
+        result = build()
+        if result is None:
+            return None
+        with open(CLUSTERS_FILE, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        artifacts.write_compressed(CLUSTERS_FILE)
+        KEY_FILE.write_text(key, encoding="utf-8")
+    return key
+
+
+def load() -> dict[str, Any] | None:
+    """Parsed clusters.json (cached per file version), or None if it hasn't been built."""
+    global _clusters_cache
+    if not CLUSTERS_FILE.exists():
+        return None
+    mtime = CLUSTERS_FILE.stat().st_mtime_ns
+    if _clusters_cache is None or _clusters_cache[0] != mtime:
+        with open(CLUSTERS_FILE, "r", encoding="utf-8") as f:
+            _clusters_cache = (mtime, json.load(f))
+    return _clusters_cache[1]
+
+
+def cluster_of(graph_key: str) -> int | None:
+    """Cluster id of a problem ('1352/C'), or None if unclustered."""
+    clusters = load()
+    if clusters is None:
+        return None
+    return clusters["assignments"].get(graph_key)
@@ -0,0 +1,139 @@
+"""Multi-hop traversal of the similarity graph: k-hop neighborhoods and best paths.
+
+Both queries walk the symmetrized CSR adjacency (an edge exists if either
+problem lists the other as a neighbor; its score is the larger of the
+two). The adjacency is flattened to Python lists once per graph version, so
+a query only touches the nodes it visits.
+
+The highest-similarity path maximizes the product of edge scores, which
+is a shortest path under cost -log(score). It is found with bidirectional
+Dijkstra.
+"""
+
+import heapq
+import math
+from typing import Any
+
+from . import graph_store
+
+_graph_version: int | None = None
+_graph: "SimilarityGraph | None" = None
+
+
+class SimilarityGraph:
+    """Undirected CSR view of the similarity graph with per-edge path costs."""
+
+    def __init__(self, adj: graph_store.Adjacency) -> None:
+        sym = adj.matrix.maximum(adj.matrix.T).tocsr()
+        self.keys: list[str] = adj.keys
+        self.pos: dict[str, int] = adj.pos
+        self.indptr: list[int] = sym.indptr.tolist()
+        self.indices: list[int] = sym.indices.tolist()
+        self.scores: list[float] = [round(float(s), 4) for s in sym.data]
+        # Scores are similarities in (0, 1]; clamp so costs stay non-negative
+        self.costs: list[float] = [-math.log(min(s, 1.0)) if s > 0 else math.inf for s in self.scores]
+
+    def edges(self, i: int, min_score: float) -> list[tuple[int, float, float]]:
+        """(neighbor, score, cost) for node i's edges scoring at least min_score."""
+        return [
+            (self.indices[e], self.scores[e], self.costs[e])
+            for e in range(self.indptr[i], self.indptr[i + 1])
+            if self.scores[e] >= min_score and self.scores[e] > 0
+        ]
+
+
+def load() -> SimilarityGraph | None:
+    """Return the traversal graph for the current graph.json, or None if it isn't built."""
+    global _graph_version, _graph
+    adj = graph_store.load_adjacency()
+    if adj is None:
+        return None
+    version = graph_store.graph_version()
+    if _graph is None or version != _graph_version:
+        _graph = SimilarityGraph(adj)
+        _graph_version = version
+    return _graph
+
+
+def k_hop(graph: SimilarityGraph, source: int, k: int, min_score: float) -> list[dict[str, Any]]:
+    """Nodes within k hops of source over edges scoring >= min_score.
+
+    Each node is reported at its smallest hop count, reached via the
+    previous-hop node it shares the highest-scoring edge with. Ordered by
+    hops, then edge score descending.
+    """
+    seen = {source}
+    frontier = [source]
+    found: list[dict[str, Any]] = []
+    for hop in range(1, k + 1):
+        best: dict[int, tuple[float, int]] = {}
+        for u in frontier:
+            for v, score, _ in graph.edges(u, min_score):
+                if v in seen:
+                    continue
+                if v not in best or score > best[v][0] or (score == best[v][0] and u < best[v][1]):
+                    best[v] = (score, u)
+        if not best:
+            break
+        layer = sorted(best.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        for v, (score, u) in layer:
+            found.append({"id": graph.keys[v], "hops": hop, "via": graph.keys[u], "score": score})
+        seen.update(best)
+        frontier = [v for v, _ in layer]
+    return found
+
+
+def best_path(graph: SimilarityGraph, source: int, target: int, min_score: float) -> tuple[list[int], float] | None:
+    """Highest-product-similarity path from source to target, or None if unreachable.
+
+    Bidirectional Dijkstra on cost -log(score): it stops once the two
+    frontiers' smallest distances sum to at least the best meeting cost.
+    """
+    if source == target:
+        return [source], 0.0
+
+    dist = ({source: 0.0}, {target: 0.0})
+    parent: tuple[dict[int, int], dict[int, int]] = ({}, {})
+    heaps: tuple[list[tuple[float, int]], list[tuple[float, int]]] = ([(0.0, source)], [(0.0, target)])
+    done: tuple[set[int], set[int]] = (set(), set())
+    best_cost = math.inf
+    meet: int | None = None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_cost:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in done[side]:
+            continue
+        done[side].add(u)
+        for v, _, cost in graph.edges(u, min_score):
+            nd = d + cost
+            if nd < dist[side].get(v, math.inf):
+                dist[side][v] = nd
+                parent[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+            other = dist[1 - side].get(v)
+            if other is not None and dist[side][v] + other < best_cost:
+                best_cost = dist[side][v] + other
+                meet = v
+
+    if meet is None:
+        return None
+    forward = [meet]
+    while forward[-1] != source:
+        forward.append(parent[0][forward[-1]])
+    backward = []
+    node = meet
+    while node != target:
+        node = parent[1][node]
+        backward.append(node)
+    return forward[::-1] + backward, best_cost
+
+
+def edge_score(graph: SimilarityGraph, u: int, v: int) -> float:
+    """Score of the edge u-v, or 0.0 if there is none."""
+    for e in range(graph.indptr[u], graph.indptr[u + 1]):
+        if graph.indices[e] == v:
+            return graph.scores[e]
+    return 0.0
@@ -0,0 +1,91 @@
+"""Process-wide cache of graph.json — parsed once, reloaded when the file changes."""
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+GRAPH_FILE = DATA_DIR / "graph.json"
+
+_graph_mtime: int | None = None
+_graph: dict[str, Any] | None = None
+
+
+def compact_to_graph_key(pid: str) -> str | None:
+    """Convert '1352C' to '1352/C'."""
+    m = re.match(r"^(\d+)([A-Za-z]\d*)$", pid)
+    if not m:
+        return None
+    return f"{m.group(1)}/{m.group(2)}"
+
+
+def graph_version() -> int | None:
+    """mtime of graph.json, or None if the graph has not been built."""
+    return GRAPH_FILE.stat().st_mtime_ns if GRAPH_FILE.exists() else None
+
+
+def load_graph() -> dict[str, Any] | None:
+    """Return the parsed similarity graph, or None if graph.json is missing."""
+    global _graph_mtime, _graph
+    mtime = graph_version()
+    if mtime is None:
+        return None
+    if mtime != _graph_mtime:
+        with open(GRAPH_FILE, "r", encoding="utf-8") as f:
+            _graph = json.load(f)
+        _graph_mtime = mtime
+    return _graph
+
+
+class Adjacency:
+    """Sparse similarity graph: node keys plus a CSR matrix of edge scores."""
+
+    def __init__(self, graph: dict[str, Any]) -> None:
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        neighbors = graph.get("neighbors", {})
+        keys: list[str] = list(neighbors.keys())
+        pos: dict[str, int] = {k: i for i, k in enumerate(keys)}
+        # Neighbor-only keys (e.g. trimmed graphs) still get a node
+        for nbs in neighbors.values():
+            for nb in nbs:
+                if nb["id"] not in pos:
+                    pos[nb["id"]] = len(keys)
+                    keys.append(nb["id"])
+
+        rows: list[int] = []
+        cols: list[int] = []
+        vals: list[float] = []
+        for key, nbs in neighbors.items():
+            i = pos[key]
+            for nb in nbs:
+                rows.append(i)
+                cols.append(pos[nb["id"]])
+                vals.append(max(float(nb["score"]), 0.0))
+
+        n = len(keys)
+        self.keys = keys
+        self.pos = pos
+        self.matrix = csr_matrix(
+            (np.array(vals, dtype=np.float32), (np.array(rows), np.array(cols))),
+            shape=(n, n),
+        )
+        self.matrix.sum_duplicates()
+
+
+_adj_mtime: int | None = None
+_adj: Adjacency | None = None
+
+
+def load_adjacency() -> Adjacency | None:
+    """Return the CSR adjacency for graph.json, built once per graph version."""
+    global _adj_mtime, _adj
+    graph = load_graph()
+    if graph is None:
+        return None
+    if _graph_mtime != _adj_mtime:
+        _adj = Adjacency(graph)
+        _adj_mtime = _graph_mtime
+    return _adj
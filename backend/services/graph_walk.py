@@ -0,0 +1,127 @@
+"""Personalized PageRank over the problem similarity graph.
+
+Random walks restart at a member's recently solved problems, so problems
+several hops away that are reachable through many of those solves still
+surface — unlike seed mode, which only looks at one seed's direct neighbors.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from . import graph_store
+
+if TYPE_CHECKING:
+    import numpy as np
+
+RESTART_PROB = 0.15
+MAX_ITERATIONS = 30
+TOLERANCE = 1e-6
+RECENT_SEEDS = 20
+CACHED_RESULTS = 200
+
+# Cached transition matrices per graph version, and PPR results per member
+_transition_version: int | None = None
+_transition = None
+_member_cache: dict[int, tuple[tuple[Any, ...], list[tuple[int, float]]]] = {}
+
+
+def _transition_matrix(adj: graph_store.Adjacency):
+    """Column-stochastic transpose of the symmetrized, row-normalized graph."""
+    import numpy as np
+
+    global _transition_version, _transition
+    version = graph_store.graph_version()
+    if version != _transition_version:
+        sym = adj.matrix.maximum(adj.matrix.T).tocsr()
+        out_weight = np.asarray(sym.sum(axis=1)).ravel()
+        out_weight[out_weight == 0] = 1.0
+        # P[i, j] = w(i, j) / sum_j w(i, j); iterate with P^T
+        inv = 1.0 / out_weight
+        _transition = sym.multiply(inv[:, None]).T.tocsr().astype(np.float32)
+        _transition_version = version
+    return _transition
+
+
+def personalized_pagerank(
+    adj: graph_store.Adjacency,
+    seeds: dict[int, float],
+    restart: float = RESTART_PROB,
+) -> "np.ndarray":
+    """Power-iterate r = restart * s + (1 - restart) * P^T r from the seed distribution."""
+    import numpy as np
+
+    pt = _transition_matrix(adj)
+    n = pt.shape[0]
+    s = np.zeros(n, dtype=np.float32)
+    for i, w in seeds.items():
+        s[i] = w
+    s /= s.sum()
+
+    r = s.copy()
+    for _ in range(MAX_ITERATIONS):
+        nxt = restart * s + (1.0 - restart) * (pt @ r)
+        if np.abs(nxt - r).sum() < TOLERANCE:
+            r = nxt
+            break
+        r = nxt
+    return r
+
+
+def _seed_weights(member: dict[str, Any], adj: graph_store.Adjacency) -> dict[int, float]:
+    """Most recent solves get the most restart mass (linear decay by recency)."""
+    timestamps = member.get("problem_timestamps") or {}
+    recent = sorted(timestamps, key=timestamps.get, reverse=True)
+    seeds: dict[int, float] = {}
+    for pid in recent:
+        key = graph_store.compact_to_graph_key(pid)
+        if key is None or key not in adj.pos:
+            continue
+        seeds[adj.pos[key]] = float(RECENT_SEEDS - len(seeds))
+        if len(seeds) >= RECENT_SEEDS:
+            break
+    return seeds
+
+
+def walk_recommendations(
+    member: dict[str, Any], limit: int, restart: float = RESTART_PROB
+) -> dict[str, Any]:
+    """Rank unsolved graph problems by PPR mass from the member's recent solves.
+
+    Results are cached per member until their next sync or a graph rebuild.
+    """
+    import numpy as np
+
+    adj = graph_store.load_adjacency()
+    if adj is None:
+        raise FileNotFoundError("Graph not built yet. Run scripts/build_graph.py first.")
+
+    start = time.perf_counter()
+    cache_key = (member.get("last_synced"), graph_store.graph_version(), restart)
+    cached = _member_cache.get(member["id"])
+    if cached is not None and cached[0] == cache_key:
+        ranked = cached[1]
+        from_cache = True
+    else:
+        seeds = _seed_weights(member, adj)
+        if not seeds:
+            raise ValueError("Member has no solves in the graph yet. Sync their CF handle first.")
+
+        scores = personalized_pagerank(adj, seeds, restart)
+        solved = set(member.get("all_accepted", [])) | set(member.get("solved_curated", []))
+        for pid in solved:
+            key = graph_store.compact_to_graph_key(pid)
+            if key is not None and key in adj.pos:
+                scores[adj.pos[key]] = 0.0
+
+        k = min(CACHED_RESULTS, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ranked = [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+        _member_cache[member["id"]] = (cache_key, ranked)
+        from_cache = False
+
+    return {
+        "ranked": [(adj.keys[i], score) for i, score in ranked[:limit]],
+        "from_cache": from_cache,
+        "compute_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
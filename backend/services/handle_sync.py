@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from . import activity_store, recommendation_pool, team_profiles, upsolve_index
 from .cf_client import CFClient
 
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -159,6 +160,8 @@ def sync_member(member_id: int) -> dict[str, Any]:
         raise ValueError(f"Member {member_id} ({member['name']}) has no CF handle set")
 
     old_curated = set(member.get("solved_curated", []))
+    old_timestamps = member.get("problem_timestamps") or {}
+    before = dict(member)
 
     client = CFClient()
     submissions = client.fetch_user_submissions(member["cf_handle"])
@@ -172,6 +175,10 @@ def sync_member(member_id: int) -> dict[str, Any]:
     member["last_synced"] = now
 
     save_team(team)
+    activity_store.record_sync(member_id, old_timestamps, timestamps, load_curated_ids())
+    recommendation_pool.refresh_member_pool(member)
+    team_profiles.record_member_change(before, member)
+    upsolve_index.record_member_sync(member)
 
     new_solved = sorted(set(curated_solved) - old_curated)
     return {
@@ -0,0 +1,111 @@
+"""Batched sentence embeddings from the HuggingFace Inference API.
+
+Texts go out BATCH_SIZE at a time as a single feature_extraction request
+with a list input, with up to MAX_WORKERS requests in flight. A batch that
+fails is retried with exponential backoff; client errors (bad token,
+unknown model, ...) are not retried. If any batch still fails, the whole
+call raises.
+
+Build-time jobs keep the default retries. Per-request callers pass
+retries=0 and a short timeout, so an unreachable endpoint fails fast and
+the route can fall back instead of sleeping through the backoff.
+
+Callers run in sync code, including inside async routes, so the pool is
+threads rather than an event loop.
+
+Set HF_INFERENCE_URL to send requests somewhere other than the hosted
+model, e.g. the offline stand-in in scripts/hf_stub_server.py.
+"""
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    from huggingface_hub import InferenceClient
+
+logger = logging.getLogger(__name__)
+
+HF_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+BATCH_SIZE = 32
+MAX_WORKERS = 4
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+NO_RETRY_STATUS = {400, 401, 403, 404, 422}
+QUERY_TIMEOUT_SECONDS = 5.0
+
+
+def hf_token() -> str | None:
+    return os.environ.get("HF_API_TOKEN") or os.environ.get("HUGGINGFACE_TOKEN")
+
+
+def hf_model() -> str:
+    """Model ID, or the HF_INFERENCE_URL endpoint when one is configured."""
+    return os.environ.get("HF_INFERENCE_URL") or HF_MODEL
+
+
+def make_client(timeout: float | None = None) -> "InferenceClient":
+    from huggingface_hub import InferenceClient
+
+    return InferenceClient(token=hf_token(), timeout=timeout)
+
+
+def _embed_batch(client: "InferenceClient", batch: list[str], label: str, retries: int) -> "np.ndarray":
+    """One feature_extraction request for `batch`, retried up to `retries` times with backoff."""
+    import numpy as np
+
+    attempt = 0
+    while True:
+        try:
+            result = client.feature_extraction(batch, model=hf_model())
+            return np.asarray(result, dtype=np.float32).reshape(len(batch), -1)
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if attempt >= retries or status in NO_RETRY_STATUS:
+                raise
+            delay = BACKOFF_SECONDS * 2 ** attempt * (1 + random.random())
+            attempt += 1
+            logger.warning(f"  Embedding batch {label} failed ({e}), retry {attempt}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def embed_texts(
+    texts: list[str],
+    client: "InferenceClient | None" = None,
+    retries: int = MAX_RETRIES,
+    timeout: float | None = None,
+) -> "np.ndarray":
+    """L2-normalized (len(texts), dim) float32 embeddings, in input order.
+
+    `timeout` (seconds per request) applies to the client created here when
+    none is passed; a passed client keeps its own.
+    """
+    import numpy as np
+
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    client = client or make_client(timeout)
+    batches = [texts[i : i + BATCH_SIZE] for i in range(0, len(texts), BATCH_SIZE)]
+    labels = [f"{n}/{len(batches)}" for n in range(1, len(batches) + 1)]
+
+    if len(batches) == 1:
+        parts = [_embed_batch(client, batches[0], labels[0], retries)]
+    else:
+        logger.info(f"  Embedding {len(texts)} texts in {len(batches)} batches...")
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="hf-embed") as pool:
+            futures = [pool.submit(_embed_batch, client, b, label, retries) for b, label in zip(batches, labels)]
+            try:
+                parts = [f.result() for f in futures]
+            except Exception:
+                for f in futures:
+                    f.cancel()
+                raise
+
+    embeddings = np.vstack(parts)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return embeddings / norms
@@ -0,0 +1,398 @@
+"""Hybrid keyword + semantic search over the team's notes, journals and problems.
+
+Four corpora are searched together: problem notes, journal entries,
+editorial links (editorials.json) and scraped statements
+(statements_cache.json). Every document is in one BM25 index
+(text_search.SearchIndex) and, where a vector exists, in one vector matrix,
+so a query is embedded once and scored against all corpora in a single
+matrix product. The two rankings are merged with reciprocal rank fusion.
+
+Vectors for notes and journal entries live in a persistent store
+(search_vectors.npy + search_vectors.json, keyed by document ID and content
+hash) and are embedded only when new or edited. That embedding runs in the
+background (warm-up, or a thread started when documents change), never
+inside a search request; until it finishes, new documents are keyword-only.
+Editorials and statements reuse the precomputed problem embeddings
+(embeddings.npy), which already encode name, tags and statement with the
+same model.
+
+If the embedding API is unavailable, search degrades to BM25 alone. A
+failed backfill is not retried for BACKFILL_RETRY_SECONDS.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import text_search
+from .graph_store import compact_to_graph_key
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+NOTES_FILE = DATA_DIR / "notes.json"
+JOURNALS_FILE = DATA_DIR / "journals.json"
+EDITORIALS_FILE = DATA_DIR / "editorials.json"
+STATEMENTS_FILE = DATA_DIR / "statements_cache.json"
+PROBLEMS_FILE = DATA_DIR / "problems.json"
+EMBEDDINGS_FILE = DATA_DIR / "embeddings.npy"
+PROBLEM_IDS_FILE = DATA_DIR / "problem_ids.json"
+VECTORS_FILE = DATA_DIR / "search_vectors.npy"
+VECTOR_IDS_FILE = DATA_DIR / "search_vectors.json"
+
+KINDS = ("note", "journal", "editorial", "statement")
+RRF_K = 60
+CANDIDATES = 100
+SNIPPET_CHARS = 200
+BACKFILL_RETRY_SECONDS = 300
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _version(path: Path) -> int | None:
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _user_documents() -> list[tuple[str, str, dict[str, Any]]]:
+    """(doc_id, text, meta) for every note and journal entry."""
+    docs: list[tuple[str, str, dict[str, Any]]] = []
+    for note in _read_json(NOTES_FILE, {"notes": []}).get("notes", []):
+        doc_id = f"note:{note['id']}"
+        docs.append((doc_id, note["content"], {
+            "doc_id": doc_id,
+            "kind": "note",
+            "id": note["id"],
+            "title": f"Note on {note['problem_id']}",
+            "content": note["content"],
+            "member_id": note["member_id"],
+            "problem_id": note["problem_id"],
+            "url": None,
+            "created_at": note["created_at"],
+        }))
+
+    for journal in _read_json(JOURNALS_FILE, {"journals": []}).get("journals", []):
+        for entry in journal["entries"]:
+            doc_id = f"journal:{entry['id']}"
+            docs.append((doc_id, entry["content"], {
+                "doc_id": doc_id,
+                "kind": "journal",
+                "id": entry["id"],
+                "title": f"Journal: {journal['topic_id']}",
+                "content": entry["content"],
+                "member_id": journal["member_id"],
+                "problem_id": None,
+                "url": None,
+                "created_at": entry["created_at"],
+            }))
+    return docs
+
+
+def _problem_documents() -> list[tuple[str, str, dict[str, Any]]]:
+    """(doc_id, text, meta) for editorial links and scraped statements.
+
+    meta["problem_key"] names the precomputed problem embedding to reuse.
+    """
+    problems = {p["id"]: p for p in _read_json(PROBLEMS_FILE, [])}
+    docs: list[tuple[str, str, dict[str, Any]]] = []
+
+    for pid, info in _read_json(EDITORIALS_FILE, {}).items():
+        if not info.get("url"):
+            continue
+        prob = problems.get(pid, {})
+        name = prob.get("name", pid)
+        text = " ".join([name, "editorial", prob.get("topic", ""), " ".join(prob.get("tags", []))])
+        doc_id = f"editorial:{pid}"
+        docs.append((doc_id, text, {
+            "doc_id": doc_id,
+            "kind": "editorial",
+            "id": pid,
+            "title": f"Editorial: {name}",
+            "content": text,
+            "member_id": None,
+            "problem_id": pid,
+            "url": info["url"],
+            "created_at": "",
+            "problem_key": compact_to_graph_key(pid),
+        }))
+
+    for key, statement in _read_json(STATEMENTS_FILE, {}).items():
+        pid = key.replace("/", "")
+        name = problems.get(pid, {}).get("name", key)
+        doc_id = f"statement:{key}"
+        docs.append((doc_id, f"{name} {statement}", {
+            "doc_id": doc_id,
+            "kind": "statement",
+            "id": pid,
+            "title": name,
+            "content": statement,
+            "member_id": None,
+            "problem_id": pid,
+            "url": f"https://codeforces.com/problemset/problem/{key}",
+            "created_at": "",
+            "problem_key": key,
+        }))
+    return docs
+
+
+class HybridIndex:
+    """BM25 index over all corpora plus the row-aligned vector matrix."""
+
+    def __init__(self) -> None:
+        self.keyword = text_search.SearchIndex()
+        self.texts: dict[str, str] = {}
+        self.doc_ids: list[str] = []
+        self.vectors: "np.ndarray | None" = None
+
+    def replace(self, kinds: tuple[str, ...], docs: list[tuple[str, str, dict[str, Any]]]) -> None:
+        """Make the documents of `kinds` equal to `docs`, re-indexing only changes."""
+        fresh = {doc_id for doc_id, _, _ in docs}
+        for doc_id in [d for d in self.texts if d.split(":", 1)[0] in kinds and d not in fresh]:
+            self.keyword.remove(doc_id)
+            del self.texts[doc_id]
+        for doc_id, text, meta in docs:
+            if self.texts.get(doc_id) != text or self.keyword.meta.get(doc_id) != meta:
+                self.keyword.add(doc_id, text, meta)
+                self.texts[doc_id] = text
+
+    def set_vectors(self, vectors: dict[str, "np.ndarray"]) -> None:
+        import numpy as np
+
+        self.doc_ids = [d for d in self.texts if d in vectors]
+        self.vectors = np.stack([vectors[d] for d in self.doc_ids]) if self.doc_ids else None
+
+
+def _load_problem_vectors() -> dict[str, "np.ndarray"]:
+    import numpy as np
+
+    if not EMBEDDINGS_FILE.exists() or not PROBLEM_IDS_FILE.exists():
+        return {}
+    emb = np.load(EMBEDDINGS_FILE)
+    keys = _read_json(PROBLEM_IDS_FILE, [])
+    return {k: emb[i] for i, k in enumerate(keys)}
+
+
+def _load_store() -> dict[str, tuple[str, "np.ndarray"]]:
+    """Persisted user-document vectors: doc_id -> (content hash, vector)."""
+    import numpy as np
+
+    if not VECTORS_FILE.exists() or not VECTOR_IDS_FILE.exists():
+        return {}
+    meta = _read_json(VECTOR_IDS_FILE, {"ids": [], "hashes": []})
+    vecs = np.load(VECTORS_FILE)
+    return {d: (h, vecs[i]) for i, (d, h) in enumerate(zip(meta["ids"], meta["hashes"]))}
+
+
+def _save_store(store: dict[str, tuple[str, "np.ndarray"]]) -> None:
+    import numpy as np
+
+    ids = list(store)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    vectors = np.stack([store[d][1] for d in ids]) if ids else np.zeros((0, 0))
+    np.save(VECTORS_FILE, vectors.astype(np.float32))
+    with open(VECTOR_IDS_FILE, "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "hashes": [store[d][0] for d in ids]}, f)
+
+
+def _user_texts(index: HybridIndex) -> dict[str, str]:
+    return {d: text for d, text in index.texts.items() if index.keyword.meta[d]["kind"] in ("note", "journal")}
+
+
+_lock = threading.Lock()
+_backfill_lock = threading.Lock()
+_index = HybridIndex()
+_store: dict[str, tuple[str, "np.ndarray"]] | None = None
+_problem_vectors: dict[str, "np.ndarray"] = {}
+_user_version: tuple[Any, ...] | None = None
+_problem_version: tuple[Any, ...] | None = None
+_index_complete = False
+_backfill_thread: threading.Thread | None = None
+_backfill_failed_at: float | None = None
+
+
+def _attach_vectors() -> bool:
+    """Give the index every vector that is current; returns False if some note or journal entry lacks one."""
+    global _store
+    if _store is None:
+        _store = _load_store()
+    vectors: dict[str, "np.ndarray"] = {}
+    complete = True
+    for d, text in _user_texts(_index).items():
+        stored = _store.get(d)
+        if stored is not None and stored[0] == _content_hash(text):
+            vectors[d] = stored[1]
+        else:
+            complete = False
+    for d in _index.texts:
+        key = _index.keyword.meta[d].get("problem_key")
+        if key and key in _problem_vectors:
+            vectors[d] = _problem_vectors[key]
+    _index.set_vectors(vectors)
+    return complete
+
+
+def backfill() -> bool:
+    """Embed new/edited notes and journal entries into the store; returns False if embedding failed.
+
+    Call off the request path: from warm-up, or via the thread get_index() starts.
+    """
+    global _store, _index_complete, _backfill_failed_at
+    from .note_embeddings import _embed_texts
+
+    with _backfill_lock:
+        with _lock:
+            _refresh()
+            texts = _user_texts(_index)
+            store = dict(_store or {})
+        stale = [d for d in store if d not in texts]
+        for d in stale:
+            del store[d]
+        pending = {d: _content_hash(text) for d, text in texts.items()}
+        pending = {d: h for d, h in pending.items() if d not in store or store[d][0] != h}
+        if pending:
+            try:
+                vecs = _embed_texts([texts[d] for d in pending])
+            except Exception as e:
+                logger.warning(f"Embedding failed, keyword-only for {BACKFILL_RETRY_SECONDS}s: {e}")
+                _backfill_failed_at = time.monotonic()
+                return False
+            for row, (d, h) in enumerate(pending.items()):
+                store[d] = (h, vecs[row])
+        _backfill_failed_at = None
+        if stale or pending:
+            with _lock:
+                _save_store(store)
+                _store = store
+                _index_complete = False
+    return True
+
+
+def _start_backfill() -> None:
+    """Start a background backfill unless one is running or the last one failed recently."""
+    global _backfill_thread
+    if _backfill_thread is not None and _backfill_thread.is_alive():
+        return
+    if _backfill_failed_at is not None and time.monotonic() - _backfill_failed_at < BACKFILL_RETRY_SECONDS:
+        return
+    _backfill_thread = threading.Thread(target=backfill, name="search-backfill", daemon=True)
+    _backfill_thread.start()
+
+
+def _refresh() -> None:
+    """Re-index corpus groups whose source files changed and attach current vectors (hold _lock)."""
+    global _user_version, _problem_version, _index_complete, _problem_vectors
+    user_version = (_version(NOTES_FILE), _version(JOURNALS_FILE))
+    problem_version = tuple(
+        _version(p) for p in (EDITORIALS_FILE, STATEMENTS_FILE, PROBLEMS_FILE, EMBEDDINGS_FILE, PROBLEM_IDS_FILE)
+    )
+    if user_version != _user_version:
+        _index.replace(("note", "journal"), _user_documents())
+        _user_version = user_version
+        _index_complete = False
+    if problem_version != _problem_version:
+        _index.replace(("editorial", "statement"), _problem_documents())
+        _problem_vectors = _load_problem_vectors()
+        _problem_version = problem_version
+        _index_complete = False
+    if not _index_complete:
+        _index_complete = _attach_vectors()
+
+
+def get_index() -> tuple[HybridIndex, bool]:
+    """Return the hybrid index and whether every document has its vector.
+
+    Each corpus group is refreshed when its source files change. Documents
+    without a current vector are embedded by a background backfill; this
+    call never embeds.
+    """
+    with _lock:
+        _refresh()
+        if not _index_complete:
+            _start_backfill()
+        return _index, _index_complete
+
+
+def search(
+    query: str,
+    limit: int = 20,
+    kinds: set[str] | None = None,
+    member_id: int | None = None,
+    semantic: bool = True,
+) -> dict[str, Any]:
+    """Hybrid search: BM25 and embedding rankings fused by reciprocal rank.
+
+    `member_id` restricts notes and journal entries to that member's own;
+    editorials and statements are shared. With `semantic` False the query
+    is not embedded and only BM25 ranks.
+    """
+    import numpy as np
+
+    from .note_embeddings import _embed_text
+
+    index, _ = get_index()
+
+    def allowed(meta: dict[str, Any]) -> bool:
+        if kinds is not None and meta["kind"] not in kinds:
+            return False
+        return member_id is None or meta["member_id"] in (None, member_id)
+
+    bm25_ids = [meta["doc_id"] for _, meta in index.keyword.search(query, CANDIDATES, allowed)]
+
+    vector_ids: list[str] = []
+    used_semantic = False
+    if semantic and index.vectors is not None and query.strip():
+        try:
+            qvec = _embed_text(query)[0]
+            used_semantic = True
+        except Exception as e:
+            logger.warning(f"Query embedding failed, keyword-only: {e}")
+        if used_semantic:
+            sims = index.vectors @ qvec
+            for i in np.argsort(-sims, kind="stable"):
+                if sims[i] <= 0:
+                    break
+                doc_id = index.doc_ids[int(i)]
+                if allowed(index.keyword.meta[doc_id]):
+                    vector_ids.append(doc_id)
+                    if len(vector_ids) == CANDIDATES:
+                        break
+
+    fused: dict[str, dict[str, Any]] = {}
+    for ranking, field in ((bm25_ids, "keyword_rank"), (vector_ids, "semantic_rank")):
+        for rank, doc_id in enumerate(ranking, start=1):
+            hit = fused.setdefault(doc_id, {"score": 0.0, "keyword_rank": None, "semantic_rank": None})
+            hit["score"] += 1.0 / (RRF_K + rank)
+            hit[field] = rank
+
+    ordered = sorted(fused.items(), key=lambda kv: -kv[1]["score"])[:limit]
+    results = []
+    for doc_id, hit in ordered:
+        meta = index.keyword.meta[doc_id]
+        results.append({
+            "kind": meta["kind"],
+            "id": meta["id"],
+            "title": meta["title"],
+            "snippet": meta["content"][:SNIPPET_CHARS],
+            "member_id": meta["member_id"],
+            "problem_id": meta["problem_id"],
+            "url": meta["url"],
+            "score": round(hit["score"], 6),
+            "keyword_rank": hit["keyword_rank"],
+            "semantic_rank": hit["semantic_rank"],
+        })
+    return {"query": query, "semantic": used_semantic, "results": results}
@@ -3,8 +3,6 @@
 import time
 from typing import Any
 
-import requests
-
 LC_GRAPHQL_URL = "https://leetcode.com/graphql"
 MIN_REQUEST_INTERVAL = 1.0  # LC is less strict than CF but still be polite
 
@@ -13,6 +11,8 @@ class LCClient:
     """Public LeetCode GraphQL client."""
 
     def __init__(self) -> None:
+        import requests  # deferred: only syncs need it, not API startup
+
         self._last_request_time = 0.0
         self.session = requests.Session()
         self.session.headers.update({
@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from typing import Any
 
+from . import recommendation_pool
 from .handle_sync import load_team, save_team
 from .lc_client import LCClient
 from .lc_tag_mapping import estimate_cf_rating_from_lc, map_lc_tags_to_topics
@@ -50,6 +51,7 @@ def sync_lc_member(member_id: int) -> dict[str, Any]:
     }
 
     save_team(team)
+    recommendation_pool.refresh_member_pool(member)
 
     return {
         "member_id": member_id,
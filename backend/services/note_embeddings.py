@@ -1,34 +1,36 @@
-"""Embedding-based recommendations from arbitrary text (notes, journal entries)."""
+"""Embedding-based recommendations from arbitrary text (notes, journal entries).
+
+numpy, faiss and huggingface_hub are imported on first use, not at import
+time, so routers that depend on this module don't slow down API startup.
+"""
 
 import json
 import math
-import os
 import re
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
-from huggingface_hub import InferenceClient
+if TYPE_CHECKING:
+    import numpy as np
+    from huggingface_hub import InferenceClient
 
-DATA_DIR = Path(__file__).parent.parent / "data"
+from . import hf_embeddings
 
-HF_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DATA_DIR = Path(__file__).parent.parent / "data"
 
-# Lazy-loaded HF client singleton
-_hf_client: InferenceClient | None = None
+# Lazy-loaded HF clients, one per request timeout
+_hf_clients: dict[float | None, "InferenceClient"] = {}
 
 
-def _get_hf_client() -> InferenceClient:
-    """Get or create the HuggingFace InferenceClient."""
-    global _hf_client
-    if _hf_client is None:
-        token = os.environ.get("HF_API_TOKEN") or os.environ.get("HUGGINGFACE_TOKEN")
-        _hf_client = InferenceClient(token=token)
-    return _hf_client
+def _get_hf_client(timeout: float | None = None) -> "InferenceClient":
+    """Get or create the HuggingFace InferenceClient for this timeout."""
+    if timeout not in _hf_clients:
+        _hf_clients[timeout] = hf_embeddings.make_client(timeout)
+    return _hf_clients[timeout]
 
 # Lazy-loaded module-level singletons
 _faiss_index = None
-_embeddings: np.ndarray | None = None
+_embeddings: "np.ndarray | None" = None
 _problem_ids: list[str] | None = None
 _cf_ratings: dict[str, int] | None = None
 
@@ -46,7 +48,7 @@ def _compact_to_graph_key(pid: str) -> str | None:
     return f"{m.group(1)}/{m.group(2)}"
 
 
-def _load_index() -> tuple[Any, np.ndarray, list[str]]:
+def _load_index() -> tuple[Any, "np.ndarray", list[str]]:
     """Load FAISS index, embeddings, and problem IDs. Cached after first call."""
     global _faiss_index, _embeddings, _problem_ids
 
@@ -54,6 +56,7 @@ def _load_index() -> tuple[Any, np.ndarray, list[str]]:
         return _faiss_index, _embeddings, _problem_ids
 
     import faiss
+    import numpy as np
 
     _embeddings = np.load(DATA_DIR / "embeddings.npy")
     with open(DATA_DIR / "problem_ids.json", "r", encoding="utf-8") as f:
@@ -66,19 +69,20 @@ def _load_index() -> tuple[Any, np.ndarray, list[str]]:
     return _faiss_index, _embeddings, _problem_ids
 
 
-def _embed_text(text: str) -> np.ndarray:
+def _embed_text(text: str) -> "np.ndarray":
     """Embed text via the HuggingFace Inference API (all-MiniLM-L6-v2).
 
     Returns a normalized (1, 384) float32 array compatible with the FAISS index.
+    Used on request paths, so it makes one attempt with a short timeout.
     """
-    client = _get_hf_client()
-    result = client.feature_extraction(text, model=HF_MODEL)
-    vec = np.array(result, dtype=np.float32).reshape(1, -1)
-    # L2-normalize to match pre-computed embeddings
-    norm = np.linalg.norm(vec)
-    if norm > 0:
-        vec /= norm
-    return vec
+    return hf_embeddings.embed_texts(
+        [text], client=_get_hf_client(hf_embeddings.QUERY_TIMEOUT_SECONDS), retries=0
+    )
+
+
+def _embed_texts(texts: list[str]) -> "np.ndarray":
+    """Embed many texts in batched requests; normalized (n, 384) float32, in order."""
+    return hf_embeddings.embed_texts(texts, client=_get_hf_client())
 
 
 def _load_problems_map() -> dict[str, dict[str, Any]]:
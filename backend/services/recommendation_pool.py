@@ -0,0 +1,494 @@
+"""Recommendation candidate pools — pre-scored discovery candidates per member.
+
+Discovery-mode scoring depends only on a member's solved set, solve quality,
+editorial flags and LC data (plus the curated problem/topic files), so the
+scored, sorted candidate list is stored per member in recommendation_pools.json
+and reused until one of those inputs changes. Requests only apply the
+difficulty window and limit.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+POOLS_FILE = DATA_DIR / "recommendation_pools.json"
+
+# Widest difficulty_range the API accepts — pools are built to cover it
+MAX_DIFFICULTY_RANGE = 400
+
+# In-memory copy of recommendation_pools.json, reloaded when the file changes
+_pools_mtime: float | None = None
+_pools: dict[str, Any] = {"members": {}}
+
+
+def load_problems() -> list[dict[str, Any]]:
+    path = DATA_DIR / "problems.json"
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_topics() -> dict[str, Any]:
+    path = DATA_DIR / "topics.json"
+    if not path.exists():
+        return {"topics": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_avg_rating(
+    solved_ids: set[str],
+    problems_map: dict[str, dict[str, Any]],
+    member: dict[str, Any] | None = None,
+) -> float:
+    """Calculate average rating, blending CF and LC signals.
+
+    CF ratings are weighted by solve quality (editorial solves count less).
+    LC estimated rating is blended in at 0.5 weight per solve.
+    """
+    editorial_flags = (member or {}).get("editorial_flags") or {}
+    solve_quality = (member or {}).get("solve_quality") or {}
+
+    weighted_sum = 0.0
+    cf_weight = 0.0
+    for pid in solved_ids:
+        if pid not in problems_map or not problems_map[pid].get("rating"):
+            continue
+        rating = problems_map[pid]["rating"]
+
+        # Apply solve quality weight
+        if pid in editorial_flags:
+            w = 0.5
+        else:
+            sq = solve_quality.get(pid)
+            w = sq["weight"] if sq else 1.0
+
+        weighted_sum += rating * w
+        cf_weight += w
+
+    cf_avg = weighted_sum / cf_weight if cf_weight > 0 else 1200
+
+    # Blend with LC estimated rating if available
+    lc_data = (member or {}).get("lc_data") or {}
+    lc_estimated = lc_data.get("estimated_cf_rating")
+    if lc_estimated is None:
+        return cf_avg
+
+    # LC gets 0.5 weight per solve (lower confidence in LC-to-CF mapping)
+    lc_total = lc_data.get("difficulty_stats", {}).get("All", 0)
+    lc_weight = lc_total * 0.5
+    total_weight = max(cf_weight, 1.0) + lc_weight
+
+    return (cf_avg * max(cf_weight, 1.0) + lc_estimated * lc_weight) / total_weight
+
+
+def get_topic_counts(solved_ids: set[str], problems_map: dict[str, dict[str, Any]]) -> dict[str, int]:
+    """Count solved problems per topic."""
+    counts: dict[str, int] = {}
+    for pid in solved_ids:
+        if pid in problems_map:
+            topic = problems_map[pid].get("topic", "")
+            if topic:
+                counts[topic] = counts.get(topic, 0) + 1
+    return counts
+
+
+def find_weak_topics(
+    topics: dict[str, Any],
+    topic_counts: dict[str, int],
+    lc_topic_skill: dict[str, float],
+    solved_count: int,
+) -> list[str]:
+    """Topics the member should work on — LC experience can reduce weakness."""
+    # If member has solved < 10 problems total, recommend from foundations
+    if solved_count < 10:
+        return ["implementation", "math_basic", "sorting"]
+
+    weak_topics: list[str] = []
+    all_topic_ids = list(topics.keys()) if topics else list(topic_counts.keys())
+    for topic_id in all_topic_ids:
+        cf_count = topic_counts.get(topic_id, 0)
+        lc_count = lc_topic_skill.get(topic_id, 0.0)
+        # Not weak if: 5+ CF solves, OR 3+ CF AND 5+ LC (combined signal)
+        combined_sufficient = cf_count >= 3 and lc_count >= 5
+        if cf_count < 5 and not combined_sufficient:
+            weak_topics.append(topic_id)
+    return weak_topics
+
+
+def score_discovery(
+    prob: dict[str, Any],
+    avg_rating: float,
+    weak_topics: set[str],
+    topic_counts: dict[str, int],
+    topics: dict[str, Any],
+    lc_topic_skill: dict[str, float],
+) -> float:
+    """Discovery-mode score for one unsolved curated problem."""
+    prob_rating = prob.get("rating", 0)
+    prob_topic = prob.get("topic", "")
+
+    # Calculate base score
+    score = 0.5
+
+    # Boost if topic is weak
+    if prob_topic in weak_topics:
+        score += 0.3
+
+    # Boost if rating is in sweet spot (slightly above average)
+    rating_diff = prob_rating - avg_rating
+    if 0 <= rating_diff <= 150:
+        score += 0.15
+    elif -100 <= rating_diff < 0:
+        score += 0.05
+
+    # Boost if topic has prerequisites the member has worked on
+    topic_data = topics.get(prob_topic, {})
+    prereqs = topic_data.get("prereqs", [])
+    if prereqs:
+        prereq_coverage = sum(1 for prereq in prereqs if topic_counts.get(prereq, 0) > 0) / len(prereqs)
+        score += prereq_coverage * 0.1
+
+    # Boost if member has LC experience in this topic (ready to transfer)
+    lc_count_for_topic = lc_topic_skill.get(prob_topic, 0.0)
+    if lc_count_for_topic >= 5:
+        score += 0.08
+
+    return score
+
+
+def generate_reason(
+    prob: dict[str, Any],
+    score: float,
+    avg_rating: float,
+    seed_problem: str | None,
+    topic_counts: dict[str, int],
+    topics: dict[str, Any],
+    lc_topic_skill: dict[str, float] | None = None,
+) -> str:
+    """Generate a human-readable reason for the recommendation."""
+    prob_rating = prob.get("rating", 0)
+    prob_topic = prob.get("topic", "")
+    topic_name = topics.get(prob_topic, {}).get("name", prob_topic)
+    lc_count = (lc_topic_skill or {}).get(prob_topic, 0.0)
+
+    if seed_problem:
+        diff = prob_rating - avg_rating
+        if diff > 100:
+            return f"Similar to your seed problem, but more challenging (+{diff} rating)"
+        elif diff > 0:
+            return f"Similar to your seed problem with slight progression (+{diff} rating)"
+        else:
+            return "Highly similar to your seed problem"
+    else:
+        solved_in_topic = topic_counts.get(prob_topic, 0)
+        diff = prob_rating - avg_rating
+
+        # LC-aware reasons: when CF count is low but LC experience exists
+        if solved_in_topic < 3 and lc_count >= 5:
+            return f"Transfer your LC {topic_name} skills to CF (only {solved_in_topic} CF solved, {int(lc_count)} LC solved)"
+        elif solved_in_topic < 3:
+            if diff > 50:
+                return f"Build strength in {topic_name} (only {solved_in_topic} solved, +{diff} rating)"
+            else:
+                return f"Build strength in {topic_name} (only {solved_in_topic} solved)"
+        elif diff > 100:
+            return f"Challenge problem in {topic_name} (+{diff} rating above your average)"
+        elif diff > 0:
+            return f"Gradual progression in {topic_name} (+{diff} rating)"
+        else:
+            return f"Solidify {topic_name} fundamentals"
+
+
+# ---------------------------------------------------------------------------
+# Pool storage
+# ---------------------------------------------------------------------------
+
+
+def _data_version() -> str:
+    """Identify the problems/topics files the pools were scored against."""
+    parts = []
+    for name in ("problems.json", "topics.json"):
+        path = DATA_DIR / name
+        parts.append(f"{path.stat().st_mtime_ns}" if path.exists() else "-")
+    return ":".join(parts)
+
+
+def member_fingerprint(member: dict[str, Any]) -> str:
+    """Hash of every member field discovery scoring reads."""
+    lc_data = member.get("lc_data") or {}
+    payload = {
+        "solved_curated": sorted(member.get("solved_curated", [])),
+        "solve_quality": member.get("solve_quality") or {},
+        "editorial_flags": sorted((member.get("editorial_flags") or {}).keys()),
+        "lc": {
+            "topic_skill": lc_data.get("topic_skill", {}),
+            "estimated_cf_rating": lc_data.get("estimated_cf_rating"),
+            "all": lc_data.get("difficulty_stats", {}).get("All", 0),
+        },
+        "data": _data_version(),
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _load_pools() -> dict[str, Any]:
+    global _pools_mtime, _pools
+    mtime = POOLS_FILE.stat().st_mtime_ns if POOLS_FILE.exists() else None
+    if mtime is None:
+        return _pools
+    if mtime != _pools_mtime:
+        with open(POOLS_FILE, "r", encoding="utf-8") as f:
+            _pools = json.load(f)
+        _pools_mtime = mtime
+    return _pools
+
+
+def _save_pools(data: dict[str, Any]) -> None:
+    global _pools_mtime, _pools
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(POOLS_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    _pools = data
+    _pools_mtime = POOLS_FILE.stat().st_mtime_ns
+
+
+def build_pool(
+    member: dict[str, Any],
+    problems: list[dict[str, Any]],
+    topics: dict[str, Any],
+) -> dict[str, Any]:
+    """Score every unsolved curated problem within the widest difficulty window."""
+    problems_map = {p["id"]: p for p in problems}
+    solved_curated = set(member.get("solved_curated", []))
+    avg_rating = get_avg_rating(solved_curated, problems_map, member)
+    topic_counts = get_topic_counts(solved_curated, problems_map)
+
+    lc_data = member.get("lc_data") or {}
+    lc_topic_skill = lc_data.get("topic_skill", {})
+    weak_topics = set(find_weak_topics(topics, topic_counts, lc_topic_skill, len(solved_curated)))
+
+    target_min_rating = int(avg_rating - 100)
+    target_max_rating = int(avg_rating + MAX_DIFFICULTY_RANGE)
+
+    candidates: list[tuple[dict[str, Any], float]] = []
+    for prob in problems:
+        if prob["id"] in solved_curated:
+            continue
+        if not (target_min_rating <= prob.get("rating", 0) <= target_max_rating):
+            continue
+        score = score_discovery(prob, avg_rating, weak_topics, topic_counts, topics, lc_topic_skill)
+        candidates.append((prob, score))
+
+    candidates.sort(key=lambda x: x[1], reverse=True)
+
+    return {
+        "fingerprint": member_fingerprint(member),
+        "avg_rating": avg_rating,
+        "solved_count": len(solved_curated),
+        "lc_skill_applied": bool(lc_topic_skill),
+        "candidates": [
+            {
+                "id": prob["id"],
+                "name": prob["name"],
+                "rating": prob.get("rating", 0),
+                "topic": prob.get("topic", ""),
+                "url": prob.get("url", ""),
+                "score": score,
+                "reason": generate_reason(prob, score, avg_rating, None, topic_counts, topics, lc_topic_skill),
+            }
+            for prob, score in candidates
+        ],
+    }
+
+
+def refresh_member_pool(member: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild and persist one member's pool (called after sync / solve events)."""
+    pool = build_pool(member, load_problems(), load_topics().get("topics", {}))
+    data = _load_pools()
+    data = {"members": {**data.get("members", {}), str(member["id"]): pool}}
+    _save_pools(data)
+    return pool
+
+
+def get_pool(member: dict[str, Any]) -> dict[str, Any]:
+    """Return the member's stored pool, rebuilding it if any scoring input changed."""
+    pool = _load_pools().get("members", {}).get(str(member["id"]))
+    if pool is not None and pool.get("fingerprint") == member_fingerprint(member):
+        return pool
+    return refresh_member_pool(member)
+
+
+def select(pool: dict[str, Any], difficulty_range: int, limit: int) -> list[dict[str, Any]]:
+    """Apply a request's difficulty window and limit to a pre-sorted pool."""
+    target_max_rating = int(pool["avg_rating"] + difficulty_range)
+    picked: list[dict[str, Any]] = []
+    for c in pool["candidates"]:
+        if c["rating"] > target_max_rating:
+            continue
+        picked.append(c)
+        if len(picked) >= limit:
+            break
+    return picked
+
+
+# ---------------------------------------------------------------------------
+# Batched scoring
+# ---------------------------------------------------------------------------
+
+
+class CandidateMatrix:
+    """Curated problems as parallel arrays, shared across every member scored in a batch.
+
+    Each member's solved set becomes a boolean mask over the problem index, and
+    discovery scores for all members are computed as one (members x problems)
+    array with the same arithmetic as score_discovery.
+    """
+
+    def __init__(self, problems: list[dict[str, Any]], topics: dict[str, Any]) -> None:
+        import numpy as np
+
+        self.problems = problems
+        self.topics = topics
+        self.problems_map = {p["id"]: p for p in problems}
+        self.index = {p["id"]: i for i, p in enumerate(problems)}
+
+        topic_ids = list(topics.keys())
+        seen = set(topic_ids)
+        for t in [p.get("topic", "") for p in problems] + [
+            q for data in topics.values() for q in data.get("prereqs", [])
+        ]:
+            if t not in seen:
+                seen.add(t)
+                topic_ids.append(t)
+        self.topic_ids = topic_ids
+        self.topic_code = {t: i for i, t in enumerate(topic_ids)}
+
+        self.ratings = np.array([p.get("rating", 0) for p in problems], dtype=np.float64)
+        self.topic_of = np.array([self.topic_code[p.get("topic", "")] for p in problems], dtype=np.int64)
+
+        # prereq_of[t, q] = 1 if q is a prerequisite of t
+        n_topics = len(topic_ids)
+        self.prereq_of = np.zeros((n_topics, n_topics), dtype=np.int64)
+        self.prereq_len = np.zeros(n_topics, dtype=np.int64)
+        for t, data in topics.items():
+            prereqs = data.get("prereqs", [])
+            self.prereq_len[self.topic_code[t]] = len(prereqs)
+            for q in prereqs:
+                self.prereq_of[self.topic_code[t], self.topic_code[q]] += 1
+
+    def solved_mask(self, member: dict[str, Any]):
+        import numpy as np
+
+        mask = np.zeros(len(self.problems), dtype=bool)
+        for pid in member.get("solved_curated", []):
+            i = self.index.get(pid)
+            if i is not None:
+                mask[i] = True
+        return mask
+
+    def score_members(
+        self,
+        members: list[dict[str, Any]],
+        difficulty_range: int,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        """Discovery recommendations for every member from one shared matrix."""
+        import numpy as np
+
+        n_members = len(members)
+        n_topics = len(self.topic_ids)
+        masks = np.zeros((n_members, len(self.problems)), dtype=bool)
+        for r, m in enumerate(members):
+            masks[r] = self.solved_mask(m)
+
+        avg = np.zeros(n_members)
+        avg_ratings: list[float] = []  # unconverted, so reasons format like build_pool's
+        weak = np.zeros((n_members, n_topics), dtype=bool)
+        lc_ready = np.zeros((n_members, n_topics), dtype=bool)
+        topic_counts_list: list[dict[str, int]] = []
+        lc_skills: list[dict[str, float]] = []
+        for r, m in enumerate(members):
+            solved = set(m.get("solved_curated", []))
+            avg_ratings.append(get_avg_rating(solved, self.problems_map, m))
+            avg[r] = avg_ratings[r]
+            topic_counts = get_topic_counts(solved, self.problems_map)
+            lc_skill = (m.get("lc_data") or {}).get("topic_skill", {})
+            for t in find_weak_topics(self.topics, topic_counts, lc_skill, len(solved)):
+                if t in self.topic_code:
+                    weak[r, self.topic_code[t]] = True
+            for t, count in lc_skill.items():
+                if count >= 5 and t in self.topic_code:
+                    lc_ready[r, self.topic_code[t]] = True
+            topic_counts_list.append(topic_counts)
+            lc_skills.append(lc_skill)
+
+        # Per-member topic counts as a matrix, then prereq coverage per topic
+        has_topic = np.zeros((n_members, n_topics), dtype=np.int64)
+        for r, counts in enumerate(topic_counts_list):
+            for t, c in counts.items():
+                if c > 0 and t in self.topic_code:
+                    has_topic[r, self.topic_code[t]] = 1
+        covered = has_topic @ self.prereq_of.T
+        safe_len = np.where(self.prereq_len > 0, self.prereq_len, 1)
+        coverage = np.where(self.prereq_len > 0, covered / safe_len, 0.0)
+
+        # Same additions, in the same order, as score_discovery
+        t = self.topic_of
+        diff = self.ratings[None, :] - avg[:, None]
+        scores = np.full((n_members, len(self.problems)), 0.5)
+        scores = scores + np.where(weak[:, t], 0.3, 0.0)
+        scores = scores + np.where((diff >= 0) & (diff <= 150), 0.15, np.where((diff >= -100) & (diff < 0), 0.05, 0.0))
+        scores = scores + coverage[:, t] * 0.1
+        scores = scores + np.where(lc_ready[:, t], 0.08, 0.0)
+
+        # int() truncation, as in build_pool
+        lo = np.trunc(avg - 100)
+        hi = np.trunc(avg + difficulty_range)
+        valid = ~masks & (self.ratings[None, :] >= lo[:, None]) & (self.ratings[None, :] <= hi[:, None])
+
+        results: list[dict[str, Any]] = []
+        for r, m in enumerate(members):
+            cand = np.flatnonzero(valid[r])
+            order = cand[np.argsort(-scores[r, cand], kind="stable")][:limit]
+            results.append({
+                "member_id": m["id"],
+                "member_name": m["name"],
+                "member_avg_rating": round(avg_ratings[r]),
+                "solved_count": len(set(m.get("solved_curated", []))),
+                "seed_problem": None,
+                "lc_skill_applied": bool(lc_skills[r]),
+                "recommendations": [
+                    {
+                        "id": self.problems[i]["id"],
+                        "name": self.problems[i]["name"],
+                        "rating": self.problems[i].get("rating", 0),
+                        "topic": self.problems[i].get("topic", ""),
+                        "url": self.problems[i].get("url", ""),
+                        "score": round(float(scores[r, i]), 3),
+                        "reason": generate_reason(
+                            self.problems[i], float(scores[r, i]), avg_ratings[r], None,
+                            topic_counts_list[r], self.topics, lc_skills[r],
+                        ),
+                    }
+                    for i in order
+                ],
+            })
+        return results
+
+
+_matrix_version: str | None = None
+_matrix: CandidateMatrix | None = None
+
+
+def get_candidate_matrix() -> CandidateMatrix:
+    """Return the shared candidate matrix, rebuilt when problems/topics change."""
+    global _matrix_version, _matrix
+    version = _data_version()
+    if _matrix is None or version != _matrix_version:
+        _matrix = CandidateMatrix(load_problems(), load_topics().get("topics", {}))
+        _matrix_version = version
+    return _matrix
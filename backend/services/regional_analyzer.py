@@ -1,7 +1,9 @@
 """Service for analyzing ICPC regional contests and their topic distributions."""
 
 import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
@@ -11,38 +13,27 @@ from .topic_classifier import classify_contest, classify_problem
 DATA_DIR = Path(__file__).parent.parent / "data"
 REGIONALS_FILE = DATA_DIR / "regionals.json"
 ICPC_PROBLEMS_FILE = DATA_DIR / "icpc_problems.json"
+CHECKPOINT_FILE = DATA_DIR / "regionals_checkpoint.json"
 
+FETCH_WORKERS = 4  # standings requests in flight; CFClient spaces their starts
 
-def is_icpc_regional(contest: dict[str, Any]) -> bool:
-    """Check if a contest is likely an ICPC regional based on name."""
-    name = contest.get("name", "").lower()
-
-    # Common patterns in ICPC regional names
-    icpc_patterns = [
-        r"icpc",
-        r"regional",
-        r"acm-icpc",
-        r"acm icpc",
-        r"world finals",
-        r"subregional",
-    ]
-
-    # Exclude practice/training contests
-    exclude_patterns = [
-        r"practice",
-        r"training",
-        r"upsolving",
-        r"mirror",
-        r"unofficial",
-    ]
+# Common patterns in ICPC regional names
+ICPC_PATTERNS = ("icpc", "regional", "acm-icpc", "acm icpc", "world finals", "subregional")
+# Exclude practice/training contests
+EXCLUDE_PATTERNS = ("practice", "training", "upsolving", "mirror", "unofficial")
 
-    # Check if name matches ICPC patterns
-    is_icpc = any(re.search(pattern, name) for pattern in icpc_patterns)
+# One pass per name: the lookahead rejects any excluded word, then any ICPC pattern must appear
+_REGIONAL_RE = re.compile(
+    r"^(?!.*(?:" + "|".join(map(re.escape, EXCLUDE_PATTERNS)) + r"))"
+    r".*(?:" + "|".join(map(re.escape, ICPC_PATTERNS)) + r")",
+    re.DOTALL,
+)
+_YEAR_RE = re.compile(r"20\d{2}")
 
-    # Exclude if matches exclude patterns
-    is_excluded = any(re.search(pattern, name) for pattern in exclude_patterns)
 
-    return is_icpc and not is_excluded
+def is_icpc_regional(contest: dict[str, Any]) -> bool:
+    """Check if a contest is likely an ICPC regional based on name."""
+    return _REGIONAL_RE.match(contest.get("name", "").lower()) is not None
 
 
 def analyze_prescraped_problems() -> dict[str, Any]:
@@ -136,15 +127,61 @@ def analyze_prescraped_problems() -> dict[str, Any]:
     return result
 
 
+def _load_checkpoint(limit: int) -> dict[str, Any] | None:
+    """Progress of an interrupted refresh with the same limit, if any."""
+    if not CHECKPOINT_FILE.exists():
+        return None
+    try:
+        with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return checkpoint if checkpoint.get("limit") == limit else None
+
+
+def _save_checkpoint(checkpoint: dict[str, Any]) -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = CHECKPOINT_FILE.with_name(CHECKPOINT_FILE.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+def _analyze_contest(client: CFClient, contest: dict[str, Any]) -> dict[str, Any] | None:
+    """Fetch a contest's problems via standings and classify them; None if it has none."""
+    contest_name = contest["name"]
+    standings = client.fetch_contest_standings(contest["id"], count=1)
+    problems = standings.get("problems", [])
+    if not problems:
+        return None
+
+    # Classify all problems
+    analysis = classify_contest(problems)
+    return {
+        "contest_id": contest["id"],
+        "name": contest_name,
+        "year": extract_year(contest_name),
+        "region": extract_region(contest_name),
+        "start_time": contest.get("startTimeSeconds"),
+        "duration": contest.get("durationSeconds"),
+        "analysis": analysis,
+    }
+
+
 def fetch_and_analyze_regionals(
     limit: int = 50,
-    force_refresh: bool = False
+    force_refresh: bool = False,
+    resume: bool = True,
 ) -> dict[str, Any]:
     """Fetch ICPC regional contests and analyze their topic distributions.
 
+    Progress is checkpointed after every contest, so a refresh that is
+    interrupted (or hits errors) picks up where it left off next time.
+
     Args:
         limit: Maximum number of contests to analyze
         force_refresh: If True, re-fetch even if cached
+        resume: If False, discard any checkpoint and start from the contest list
 
     Returns:
         dict with analyzed regional contests
@@ -162,55 +199,56 @@ def fetch_and_analyze_regionals(
     print("Fetching and analyzing ICPC regional contests...")
     client = CFClient()
 
-    # Fetch gym contests
-    all_contests = client.fetch_contests(gym=True)
-
-    # Filter to ICPC regionals
-    icpc_contests = [c for c in all_contests if is_icpc_regional(c)]
-    print(f"  Found {len(icpc_contests)} ICPC regional contests out of {len(all_contests)} gym contests")
-
-    # Analyze contests (newest first, limited)
-    analyzed_contests = []
-    successful = 0
-    failed = 0
-
-    for i, contest in enumerate(icpc_contests[:limit]):
-        contest_id = contest["id"]
-        contest_name = contest["name"]
-
-        print(f"\n[{i+1}/{min(limit, len(icpc_contests))}] Analyzing: {contest_name} (ID: {contest_id})")
-
-        try:
-            # Fetch contest problems via standings
-            standings = client.fetch_contest_standings(contest_id, count=1)
-            problems = standings.get("problems", [])
-
-            if not problems:
-                print(f"  WARNING No problems found, skipping")
-                failed += 1
+    # Resume an interrupted refresh with the same contest list
+    if not resume:
+        CHECKPOINT_FILE.unlink(missing_ok=True)
+    checkpoint = _load_checkpoint(limit)
+    if checkpoint is not None:
+        selected = checkpoint["contests"]
+        print(f"  Resuming: {len(checkpoint['done'])}/{len(selected)} contests already processed")
+    else:
+        # Fetch gym contests
+        all_contests = client.fetch_contests(gym=True)
+
+        # Filter to ICPC regionals
+        icpc_contests = [c for c in all_contests if is_icpc_regional(c)]
+        print(f"  Found {len(icpc_contests)} ICPC regional contests out of {len(all_contests)} gym contests")
+
+        # Newest first, limited
+        selected = [
+            {k: c.get(k) for k in ("id", "name", "startTimeSeconds", "durationSeconds")}
+            for c in icpc_contests[:limit]
+        ]
+        checkpoint = {"limit": limit, "contests": selected, "done": {}}
+        _save_checkpoint(checkpoint)
+
+    done: dict[str, dict[str, Any] | None] = checkpoint["done"]
+    todo = [c for c in selected if str(c["id"]) not in done]
+    resumed = len(selected) - len(todo)
+
+    # Standings are fetched concurrently; the shared CF rate limit spaces the requests
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="regionals") as pool:
+        futures = {pool.submit(_analyze_contest, client, c): c for c in todo}
+        for n, future in enumerate(as_completed(futures), resumed + 1):
+            contest = futures[future]
+            print(f"\n[{n}/{len(selected)}] {contest['name']} (ID: {contest['id']})")
+            try:
+                entry = future.result()
+            except Exception as e:
+                # Not checkpointed: retried when the refresh is resumed
+                print(f"  FAIL Failed: {e}")
                 continue
+            if entry is None:
+                print(f"  WARNING No problems found, skipping")
+            else:
+                print(f"  OK Classified {entry['analysis']['total_problems']} problems")
+            done[str(contest["id"])] = entry
+            _save_checkpoint(checkpoint)
 
-            # Classify all problems
-            analysis = classify_contest(problems)
-
-            # Store result
-            analyzed_contests.append({
-                "contest_id": contest_id,
-                "name": contest_name,
-                "year": extract_year(contest_name),
-                "region": extract_region(contest_name),
-                "start_time": contest.get("startTimeSeconds"),
-                "duration": contest.get("durationSeconds"),
-                "analysis": analysis,
-            })
-
-            successful += 1
-            print(f"  OK Classified {analysis['total_problems']} problems")
-
-        except Exception as e:
-            print(f"  FAIL Failed: {e}")
-            failed += 1
-            continue
+    # Keep contest-list order regardless of completion order
+    analyzed_contests = [done[str(c["id"])] for c in selected if done.get(str(c["id"])) is not None]
+    successful = len(analyzed_contests)
+    failed = len(selected) - successful
 
     print(f"\n{'='*60}")
     print(f"Analysis complete: {successful} contests analyzed, {failed} failed")
@@ -226,6 +264,7 @@ def fetch_and_analyze_regionals(
             "total_problems": sum(c["analysis"]["total_problems"] for c in analyzed_contests),
             "successful": successful,
             "failed": failed,
+            "resumed": resumed,
         }
     }
 
@@ -234,6 +273,10 @@ def fetch_and_analyze_regionals(
     with open(REGIONALS_FILE, "w", encoding="utf-8") as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
 
+    # Only a fully processed list clears the checkpoint; errored contests are retried next refresh
+    if all(str(c["id"]) in done for c in selected):
+        CHECKPOINT_FILE.unlink(missing_ok=True)
+
     print(f"Saved analysis to {REGIONALS_FILE}")
     return result
 
@@ -270,7 +313,7 @@ def compute_aggregate_stats(contests: list[dict[str, Any]]) -> dict[str, Any]:
 def extract_year(contest_name: str) -> int | None:
     """Extract year from contest name (e.g., '2019-2020', '2023')."""
     # Look for 4-digit year
-    match = re.search(r"20\d{2}", contest_name)
+    match = _YEAR_RE.search(contest_name)
     return int(match.group()) if match else None
 
 
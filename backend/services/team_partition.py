@@ -0,0 +1,176 @@
+"""Exact team partitioning — maximize the weakest team's coverage.
+
+Every trio's coverage is scored once up front. The best achievable minimum is
+then found by binary searching a threshold T over the distinct trio scores and
+solving a small set-packing MILP (scipy/HiGHS branch-and-bound) per step: can
+the roster be split into the requested number of trios that all score at
+least T? This stays exact for club-sized rosters (20-40 members, several
+teams) where enumerating nested combinations() is no longer feasible.
+"""
+
+from itertools import combinations
+from typing import Any
+
+from .team_profiles import ROLE_CLUSTERS, MemberProfile, get_coverage_table
+
+TEAM_SIZE = 3
+
+
+def group_score(member_ids: tuple[int, ...], cluster_scores: dict[int, dict[str, float]]) -> float:
+    """Total coverage of a group: sum over clusters of the best member's score."""
+    return sum(
+        max((cluster_scores[mid].get(cluster, 0.0) for mid in member_ids), default=0.0)
+        for cluster in ROLE_CLUSTERS
+    )
+
+
+def trio_scores(profiles: list[MemberProfile]) -> dict[tuple[int, ...], float]:
+    """Coverage of every trio, keyed by sorted member IDs (from the cached table)."""
+    return get_coverage_table(profiles).trio_scores()
+
+
+def _feasible(
+    n: int,
+    groups: list[tuple[int, ...]],
+    num_teams: int,
+    leftover_groups: list[tuple[int, ...]],
+    preferred: list[bool] | None,
+) -> list[tuple[int, ...]] | None:
+    """Pick num_teams disjoint groups (plus one leftover group, if given) via MILP.
+
+    A pure feasibility program, so HiGHS can stop at its first integer
+    solution. Returns the chosen team groups, or None if none exists.
+    """
+    import numpy as np
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+
+    cols = groups + leftover_groups
+    n_cols = len(cols)
+    rows = [mid for g in cols for mid in g]
+    col_idx = [j for j, g in enumerate(cols) for _ in g]
+    membership = coo_matrix((np.ones(len(rows)), (rows, col_idx)), shape=(n, n_cols)).tocsr()
+
+    is_team = np.zeros(n_cols)
+    is_team[:len(groups)] = 1.0
+    constraints = [LinearConstraint(is_team[None, :], num_teams, num_teams)]
+    if leftover_groups:
+        # Exact partition: every member is on a team or in the leftover group
+        constraints.append(LinearConstraint(membership, 1, 1))
+        constraints.append(LinearConstraint(1.0 - is_team[None, :], 1, 1))
+    else:
+        constraints.append(LinearConstraint(membership, 0, 1))
+    if preferred is not None:
+        if not any(preferred):
+            return None
+        want = np.zeros(n_cols)
+        want[:len(groups)] = preferred
+        constraints.append(LinearConstraint(want[None, :], 1, np.inf))
+
+    res = milp(np.zeros(n_cols), constraints=constraints, integrality=np.ones(n_cols), bounds=Bounds(0, 1))
+    if res.status != 0 or res.x is None:
+        return None
+    return [groups[j] for j in range(len(groups)) if res.x[j] > 0.5]
+
+
+def best_partition(
+    profiles: list[MemberProfile],
+    num_teams: int,
+    remainder_is_team: bool = False,
+    preferred: set[tuple[int, ...]] | None = None,
+    scores: dict[tuple[int, ...], float] | None = None,
+) -> dict[str, Any] | None:
+    """Split members into `num_teams` trios, maximizing the weakest trio's coverage.
+
+    Binary searches the threshold T over the distinct candidate scores; each
+    step asks whether num_teams disjoint trios scoring at least T exist.
+    Members not placed in a trio are returned as `leftover`. With
+    `remainder_is_team`, the leftover group plays as a team too and must also
+    reach T — meant for the n % 3 remainder, since every possible leftover
+    group is enumerated. With `preferred`, at least one trio must come from
+    that set (e.g. untested combos). Returns None if that is impossible, or
+    if there are fewer than 3 * num_teams members.
+    """
+    cluster_scores = {p.id: p.cluster_scores for p in profiles}
+    ids = sorted(cluster_scores)
+    n = len(ids)
+    if num_teams < 1 or n < TEAM_SIZE * num_teams:
+        return None
+    if scores is None:
+        scores = trio_scores(profiles)
+    pos = {mid: i for i, mid in enumerate(ids)}
+    trios = [t for t in combinations(ids, TEAM_SIZE) if t in scores]
+
+    preferred_trios = {t for t in (preferred or set()) if t in scores}
+    if preferred is not None and not preferred_trios:
+        return None
+
+    leftover_size = n - TEAM_SIZE * num_teams
+    leftover_scores: dict[tuple[int, ...], float] = {}
+    if remainder_is_team and leftover_size > 0:
+        leftover_scores = {
+            g: group_score(g, cluster_scores) for g in combinations(ids, leftover_size)
+        }
+
+    def attempt(threshold: float) -> list[tuple[int, ...]] | None:
+        eligible = [t for t in trios if scores[t] >= threshold]
+        if len(eligible) < num_teams:
+            return None
+        leftovers = [g for g, s in leftover_scores.items() if s >= threshold]
+        if leftover_scores and not leftovers:
+            return None
+        chosen = _feasible(
+            n,
+            [tuple(pos[mid] for mid in t) for t in eligible],
+            num_teams,
+            [tuple(pos[mid] for mid in g) for g in leftovers],
+            [t in preferred_trios for t in eligible] if preferred is not None else None,
+        )
+        if chosen is None:
+            return None
+        return [tuple(ids[i] for i in g) for g in chosen]
+
+    # Upper bound: the weakest team is at most the average team, and across
+    # num_teams disjoint teams a cluster contributes at most its top num_teams scores
+    upper = sum(
+        sum(sorted((cs.get(cluster, 0.0) for cs in cluster_scores.values()), reverse=True)[:num_teams])
+        for cluster in ROLE_CLUSTERS
+    ) / num_teams
+    thresholds = sorted(
+        s for s in set(scores[t] for t in trios) | set(leftover_scores.values()) if s <= upper + 1e-9
+    )
+
+    # Lower bound: greedily take the best disjoint trios (enough when leftovers sit out)
+    if not leftover_scores and preferred is None:
+        taken: set[int] = set()
+        best = []
+        for t in sorted(trios, key=lambda t: -scores[t]):
+            if not taken.intersection(t):
+                best.append(t)
+                taken.update(t)
+                if len(best) == num_teams:
+                    break
+        lo = thresholds.index(min(scores[t] for t in best))
+    else:
+        best = attempt(thresholds[0])
+        if best is None:
+            return None
+        lo = 0
+
+    # Largest threshold that still admits a partition
+    hi = len(thresholds) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        found = attempt(thresholds[mid])
+        if found is not None:
+            lo, best = mid, found
+        else:
+            hi = mid - 1
+
+    teams = sorted(list(t) for t in best)
+    placed = {mid for t in teams for mid in t}
+    leftover = [mid for mid in ids if mid not in placed]
+    team_scores = [scores[tuple(t)] for t in teams]
+    if remainder_is_team and leftover:
+        team_scores.append(group_score(tuple(leftover), cluster_scores))
+    return {"teams": teams, "leftover": leftover, "score": min(team_scores)}
@@ -1,6 +1,8 @@
 """Shared team profiling logic — member strengths and team coverage."""
 
+import hashlib
 import json
+from itertools import combinations
 from pathlib import Path
 from typing import Any
 
@@ -27,32 +29,191 @@ def load_problems() -> list[dict[str, Any]]:
         return json.load(f)
 
 
-def compute_profiles(
-    members: list[dict[str, Any]], problems: list[dict[str, Any]]
-) -> list[MemberProfile]:
-    """Compute per-member topic mastery and cluster scores."""
-    # Count total problems per topic
-    topic_totals: dict[str, int] = {}
-    for p in problems:
-        topic_totals[p["topic"]] = topic_totals.get(p["topic"], 0) + 1
+# ---------------------------------------------------------------------------
+# Persisted topic counters
+# ---------------------------------------------------------------------------
+#
+# profile_counters.json keeps, per member, how many curated solves they have
+# in each topic at each solve-quality weight ({topic: {"1.0": 12, "0.5": 2}}).
+# Syncs and editorial-flag toggles adjust only the problems that changed, so
+# building a profile reads O(topics) counters instead of every problem.
 
-    profiles: list[MemberProfile] = []
+PROFILES_FILE = DATA_DIR / "profile_counters.json"
+
+_store_mtime: int | None = None
+_store: dict[str, Any] = {}
+_topics_version: int | None = None
+_problem_topics: dict[str, str] = {}
+
+
+def _problems_version() -> int | None:
+    path = DATA_DIR / "problems.json"
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def _load_problem_topics() -> dict[str, str]:
+    """{problem_id: topic} for the curated set, cached per problems.json version."""
+    global _topics_version, _problem_topics
+    version = _problems_version()
+    if version != _topics_version:
+        _problem_topics = {p["id"]: p["topic"] for p in load_problems()} if version else {}
+        _topics_version = version
+    return _problem_topics
+
+
+def _load_store() -> dict[str, Any]:
+    global _store_mtime, _store
+    mtime = PROFILES_FILE.stat().st_mtime_ns if PROFILES_FILE.exists() else None
+    if mtime is None:
+        return {"problems_version": None, "topic_totals": {}, "members": {}}
+    if mtime != _store_mtime:
+        with open(PROFILES_FILE, "r", encoding="utf-8") as f:
+            _store = json.load(f)
+        _store_mtime = mtime
+    return _store
+
+
+def _save_store(data: dict[str, Any]) -> None:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(PROFILES_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _member_key(member: dict[str, Any]) -> str:
+    """Hash of the member state a counter entry was built from (solves, flags, weights).
+
+    Hashing the contents rather than e.g. the list length catches hand
+    edits to team.json that swap solved problems.
+    """
+    state = [
+        sorted(set(member.get("solved_curated", []))),
+        sorted((member.get("editorial_flags") or {}).keys()),
+        sorted((pid, (sq or {}).get("weight")) for pid, sq in (member.get("solve_quality") or {}).items()),
+    ]
+    return hashlib.sha1(json.dumps(state).encode("utf-8")).hexdigest()
+
+
+def solve_weight(member: dict[str, Any], pid: str) -> float:
+    """Effective weight of a solve (editorial override > auto-classification)."""
+    if pid in (member.get("editorial_flags") or {}):
+        return 0.5
+    sq = (member.get("solve_quality") or {}).get(pid)
+    return sq["weight"] if sq else 1.0
+
+
+def _bump(counters: dict[str, dict[str, int]], topic: str, weight: float, delta: int) -> None:
+    by_weight = counters.setdefault(topic, {})
+    key = repr(float(weight))
+    by_weight[key] = by_weight.get(key, 0) + delta
+    if by_weight[key] <= 0:
+        del by_weight[key]
+    if not by_weight:
+        del counters[topic]
+
+
+def _build_counters(member: dict[str, Any], problem_topics: dict[str, str]) -> dict[str, dict[str, int]]:
+    counters: dict[str, dict[str, int]] = {}
+    for pid in set(member.get("solved_curated", [])):
+        if pid in problem_topics:
+            _bump(counters, problem_topics[pid], solve_weight(member, pid), 1)
+    return counters
+
+
+def _fresh_store(problem_topics: dict[str, str]) -> dict[str, Any]:
+    totals: dict[str, int] = {}
+    for topic in problem_topics.values():
+        totals[topic] = totals.get(topic, 0) + 1
+    return {"problems_version": _problems_version(), "topic_totals": totals, "members": {}}
+
+
+def record_member_change(before: dict[str, Any], member: dict[str, Any]) -> None:
+    """Adjust a member's topic counters after a sync or editorial-flag change.
+
+    `before` is the member as it was prior to the change. Only problems whose
+    solved state or weight differs are touched; a member without a matching
+    entry is rebuilt from their solved list.
+    """
+    problem_topics = _load_problem_topics()
+    data = _load_store()
+    if data.get("problems_version") != _problems_version():
+        data = _fresh_store(problem_topics)
+    else:
+        data = {**data, "members": dict(data["members"])}
+
+    key = str(member["id"])
+    entry = data["members"].get(key)
+    if entry is None or entry.get("key") != _member_key(before):
+        counters = _build_counters(member, problem_topics)
+    else:
+        counters = {t: dict(w) for t, w in entry["counters"].items()}
+        old_solved = set(before.get("solved_curated", []))
+        new_solved = set(member.get("solved_curated", []))
+        old_flags = set((before.get("editorial_flags") or {}).keys())
+        new_flags = set((member.get("editorial_flags") or {}).keys())
+        old_sq = before.get("solve_quality") or {}
+        new_sq = member.get("solve_quality") or {}
+        changed = (old_solved ^ new_solved) | (old_flags ^ new_flags)
+        if old_sq is not new_sq:
+            changed |= {
+                pid for pid in old_solved & new_solved
+                if (old_sq.get(pid) or {}).get("weight") != (new_sq.get(pid) or {}).get("weight")
+            }
+        for pid in changed:
+            topic = problem_topics.get(pid)
+            if topic is None:
+                continue
+            if pid in old_solved:
+                _bump(counters, topic, solve_weight(before, pid), -1)
+            if pid in new_solved:
+                _bump(counters, topic, solve_weight(member, pid), 1)
+
+    data["members"][key] = {"key": _member_key(member), "counters": counters}
+    _save_store(data)
+
+
+def remove_member(member_id: int) -> None:
+    """Drop a member's counters (e.g. when they leave the team)."""
+    data = _load_store()
+    if str(member_id) in data.get("members", {}):
+        data = {**data, "members": {k: v for k, v in data["members"].items() if k != str(member_id)}}
+        _save_store(data)
+
+
+def _member_counters(members: list[dict[str, Any]]) -> tuple[dict[str, int], list[dict[str, dict[str, int]]]]:
+    """Topic totals and each member's counters, rebuilding any stale entries."""
+    data = _load_store()
+    dirty = False
+    if data.get("problems_version") != _problems_version():
+        data = _fresh_store(_load_problem_topics())
+        dirty = True
+
+    result: list[dict[str, dict[str, int]]] = []
     for m in members:
-        solved = set(m.get("solved_curated", []))
-        editorial_flags = m.get("editorial_flags") or {}
-        solve_quality = m.get("solve_quality") or {}
-
-        # Count solved per topic, weighted by solve quality
-        topic_solved_weighted: dict[str, float] = {}
-        for p in problems:
-            if p["id"] in solved:
-                # Get effective weight (editorial override > auto-classification)
-                if p["id"] in editorial_flags:
-                    weight = 0.5
-                else:
-                    sq = solve_quality.get(p["id"])
-                    weight = sq["weight"] if sq else 1.0
-                topic_solved_weighted[p["topic"]] = topic_solved_weighted.get(p["topic"], 0.0) + weight
+        entry = data["members"].get(str(m["id"]))
+        if entry is None or entry.get("key") != _member_key(m):
+            if not dirty:
+                data = {**data, "members": dict(data["members"])}
+            entry = {"key": _member_key(m), "counters": _build_counters(m, _load_problem_topics())}
+            data["members"][str(m["id"])] = entry
+            dirty = True
+        result.append(entry["counters"])
+
+    if dirty:
+        _save_store(data)
+    return data["topic_totals"], result
+
+
+def compute_profiles(members: list[dict[str, Any]]) -> list[MemberProfile]:
+    """Compute per-member topic mastery and cluster scores from stored counters."""
+    topic_totals, all_counters = _member_counters(members)
+
+    profiles: list[MemberProfile] = []
+    for m, counters in zip(members, all_counters):
+        # Weighted solves per topic, from the per-weight counts
+        topic_solved_weighted: dict[str, float] = {
+            topic: sum(float(w) * n for w, n in by_weight.items())
+            for topic, by_weight in counters.items()
+        }
 
         # CF mastery = weighted solved / total for each topic (0.0 to 1.0)
         strengths: dict[str, float] = {}
@@ -97,3 +258,68 @@ def team_coverage(
             default=0.0,
         )
     return coverage
+
+
+class CoverageTable:
+    """Coverage of every trio, computed in one vectorized pass.
+
+    Member cluster scores form an (n_members x n_clusters) array; every
+    C(n, 3) trio's coverage is np.maximum.reduce over its three rows.
+    """
+
+    def __init__(self, profiles: list[MemberProfile]) -> None:
+        import numpy as np
+
+        ordered = sorted(profiles, key=lambda p: p.id)
+        self.ids = [p.id for p in ordered]
+        self.clusters = list(ROLE_CLUSTERS)
+        self.scores = np.array(
+            [[p.cluster_scores.get(c, 0.0) for c in self.clusters] for p in ordered],
+            dtype=np.float64,
+        ).reshape(len(ordered), len(self.clusters))
+
+        self.triples = np.array(list(combinations(range(len(ordered)), 3)), dtype=np.int64).reshape(-1, 3)
+        self.coverage = np.maximum.reduce(
+            [self.scores[self.triples[:, k]] for k in range(3)]
+        ) if len(self.triples) else np.zeros((0, len(self.clusters)))
+        # Summed cluster by cluster, in the same order team_coverage's dict is summed
+        self.totals = np.zeros(len(self.triples))
+        for k in range(len(self.clusters)):
+            self.totals = self.totals + self.coverage[:, k]
+        self._scores: dict[tuple[int, ...], float] | None = None
+
+    def trio_key(self, row: int) -> tuple[int, int, int]:
+        a, b, c = self.triples[row]
+        return (self.ids[a], self.ids[b], self.ids[c])
+
+    def trio_scores(self) -> dict[tuple[int, ...], float]:
+        """{sorted member IDs: total coverage} for every trio."""
+        if self._scores is None:
+            self._scores = {self.trio_key(r): float(self.totals[r]) for r in range(len(self.triples))}
+        return self._scores
+
+    def rows(self, member_ids: list[int] | None = None) -> list[int]:
+        """Row indices of trios drawn only from member_ids (default: all)."""
+        if member_ids is None:
+            return list(range(len(self.triples)))
+        import numpy as np
+
+        allowed = np.isin(np.array(self.ids, dtype=np.int64), list(member_ids))
+        return np.flatnonzero(allowed[self.triples].all(axis=1)).tolist()
+
+
+# One table per roster (e.g. all members for compose, active ones for rotations),
+# each kept until any of its members' cluster scores change
+_tables: dict[tuple[int, ...], tuple[tuple[Any, ...], CoverageTable]] = {}
+
+
+def get_coverage_table(profiles: list[MemberProfile]) -> CoverageTable:
+    """Return the trio coverage table for these profiles, cached per roster."""
+    roster = tuple(sorted(p.id for p in profiles))
+    key = tuple(sorted((p.id, tuple(sorted(p.cluster_scores.items()))) for p in profiles))
+    cached = _tables.get(roster)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    table = CoverageTable(profiles)
+    _tables[roster] = (key, table)
+    return table
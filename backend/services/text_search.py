@@ -0,0 +1,165 @@
+"""Full-text search — tokenized inverted index with BM25 ranking.
+
+Each SearchIndex maps terms to postings ({doc_id: term frequency}) and keeps
+document lengths, so a query only touches the postings of its own terms.
+The last query term also matches as a prefix (search-as-you-type), found by
+bisecting the sorted vocabulary.
+
+FileIndex wraps a SearchIndex built from one JSON store. It is built lazily,
+rebuilt when the file changes on disk, and patched in place by the routers
+on create/edit/delete so writes don't force a rebuild.
+"""
+
+import json
+import math
+import re
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_TERMS = 50
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index over short documents, each carrying a metadata dict."""
+
+    def __init__(self) -> None:
+        self.postings: dict[str, dict[str, int]] = {}
+        self.vocab: list[str] = []
+        self.doc_len: dict[str, int] = {}
+        self.doc_terms: dict[str, set[str]] = {}
+        self.meta: dict[str, dict[str, Any]] = {}
+        self.total_len = 0
+
+    def add(self, doc_id: str, text: str, meta: dict[str, Any]) -> None:
+        """Index a document, replacing any previous version of it."""
+        self.remove(doc_id)
+        tokens = tokenize(text)
+        for term in tokens:
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self.vocab, term)
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+        self.doc_len[doc_id] = len(tokens)
+        self.doc_terms[doc_id] = set(tokens)
+        self.meta[doc_id] = meta
+        self.total_len += len(tokens)
+
+    def remove(self, doc_id: str) -> None:
+        if doc_id not in self.doc_len:
+            return
+        for term in self.doc_terms.pop(doc_id):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.vocab[bisect_left(self.vocab, term)]
+        self.total_len -= self.doc_len.pop(doc_id)
+        del self.meta[doc_id]
+
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        terms = []
+        i = bisect_left(self.vocab, prefix)
+        while i < len(self.vocab) and self.vocab[i].startswith(prefix) and len(terms) < MAX_PREFIX_TERMS:
+            terms.append(self.vocab[i])
+            i += 1
+        return terms
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        where: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """Top `limit` (score, meta) pairs by BM25, ties broken by created_at."""
+        tokens = tokenize(query)
+        n_docs = len(self.doc_len)
+        if not tokens or not n_docs:
+            return []
+
+        # Each query position scores its best-matching term (exact, or prefix for the last)
+        avg_len = self.total_len / n_docs
+        scores: dict[str, float] = {}
+        unique = list(dict.fromkeys(tokens))
+        for pos, token in enumerate(unique):
+            if pos == len(unique) - 1:
+                terms = self._prefix_terms(token)
+            else:
+                terms = [token] if token in self.postings else []
+            best: dict[str, float] = {}
+            for term in terms:
+                postings = self.postings[term]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / avg_len)
+                    s = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    if s > best.get(doc_id, 0.0):
+                        best[doc_id] = s
+            for doc_id, s in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + s
+
+        hits = [
+            (score, self.meta[doc_id])
+            for doc_id, score in scores.items()
+            if where is None or where(self.meta[doc_id])
+        ]
+        hits.sort(key=lambda h: (-h[0], h[1].get("created_at", "")))
+        return hits[:limit]
+
+
+class FileIndex:
+    """A SearchIndex over one JSON file, kept in step with that file."""
+
+    def __init__(
+        self,
+        path: Path,
+        documents: Callable[[dict[str, Any]], Iterable[tuple[str, str, dict[str, Any]]]],
+    ) -> None:
+        self.path = path
+        self.documents = documents
+        self._index: SearchIndex | None = None
+        self._mtime: int | None = None
+
+    def _version(self) -> int | None:
+        return self.path.stat().st_mtime_ns if self.path.exists() else None
+
+    def get(self) -> SearchIndex:
+        """Return the index, (re)building it if the file changed on disk."""
+        mtime = self._version()
+        if self._index is None or mtime != self._mtime:
+            index = SearchIndex()
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for doc_id, text, meta in self.documents(data):
+                    index.add(doc_id, text, meta)
+            self._index = index
+            self._mtime = mtime
+        return self._index
+
+    def apply(self, data: dict[str, Any], doc_id: str) -> None:
+        """Re-index one document after `data` was saved (removed if it's gone).
+
+        If the index doesn't hold exactly the saved file's other documents,
+        it is dropped and rebuilt on the next get().
+        """
+        if self._index is None:
+            return
+        docs = {d: (text, meta) for d, text, meta in self.documents(data)}
+        if set(self._index.doc_len) - {doc_id} != set(docs) - {doc_id}:
+            self._index = None
+            return
+        if doc_id in docs:
+            self._index.add(doc_id, *docs[doc_id])
+        else:
+            self._index.remove(doc_id)
+        self._mtime = self._version()
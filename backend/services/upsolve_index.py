@@ -0,0 +1,244 @@
+"""Materialized upsolve index — contest problems plus per-member pending sets.
+
+upsolve_index.json holds every virtual contest that had participants (in
+queue order: date descending, contests.json order within a date) with its
+problems, and for every team member the set of contest problem CF IDs they
+took part in but have not accepted yet. Each contest also stores how many
+of its problems every participant has solved, so queue totals and stats are
+sums of stored counts; only the page of the queue being returned looks at
+the pending sets (built once per index version, see pending_sets()).
+
+Contest CRUD and (un)dismissals patch single contests; a sync refreshes the
+synced member's pending set. Edits made behind our back are still picked up:
+a changed contests.json rebuilds the index, a changed team.json refreshes
+only the members whose name, sync time or accepted count moved.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CONTESTS_FILE = DATA_DIR / "contests.json"
+TEAM_FILE = DATA_DIR / "team.json"
+INDEX_FILE = DATA_DIR / "upsolve_index.json"
+FORMAT = 2  # bump when the stored layout changes; older files are rebuilt
+
+_cache_mtime: int | None = None
+_cache: dict[str, Any] = {}
+_pending_cache: tuple[int | None, dict[int, set[str]]] | None = None
+
+
+def _version(path: Path) -> int | None:
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _member_key(member: dict[str, Any]) -> list[Any]:
+    """Changes whenever the member's name or accepted list can have changed."""
+    return [member["name"], member.get("last_synced"), len(member.get("all_accepted", []))]
+
+
+def _contest_entry(contest: dict[str, Any]) -> dict[str, Any] | None:
+    """Index entry for a contest, or None if nobody took part."""
+    participant_ids: list[int] = []
+    for team in contest.get("teams", []):
+        for mid in team.get("member_ids", []):
+            if mid not in participant_ids:
+                participant_ids.append(mid)
+    if not participant_ids:
+        return None
+
+    cf_contest_id = contest["cf_contest_id"]
+    return {
+        "contest_id": contest["id"],
+        "cf_contest_id": cf_contest_id,
+        "contest_name": contest["contest_name"],
+        "contest_date": contest["date"],
+        "participant_ids": participant_ids,
+        "dismissed": list(contest.get("dismissed_problems", [])),
+        # member id (str) -> problems solved; filled in by _set_member
+        "solved": {},
+        "problems": [
+            {
+                "problem_index": r["problem_index"],
+                "problem_name": r["problem_name"],
+                "problem_cf_id": f"{cf_contest_id}{r['problem_index']}",
+                "solved_by_team": r.get("solved_by_team"),
+            }
+            for r in contest.get("results", [])
+        ],
+    }
+
+
+def _pending_for(member: dict[str, Any], entries: list[dict[str, Any]]) -> list[str]:
+    """Problem CF IDs from the member's contests that they haven't accepted."""
+    accepted = set(member.get("all_accepted", []))
+    pending = {
+        p["problem_cf_id"]
+        for e in entries if member["id"] in e["participant_ids"]
+        for p in e["problems"] if p["problem_cf_id"] not in accepted
+    }
+    return sorted(pending)
+
+
+def _set_member(data: dict[str, Any], member: dict[str, Any]) -> None:
+    mid = str(member["id"])
+    pending = _pending_for(member, data["contests"])
+    data["members"][mid] = {
+        "name": member["name"],
+        "key": _member_key(member),
+        "pending": pending,
+    }
+    pending_set = set(pending)
+    for e in data["contests"]:
+        if member["id"] in e["participant_ids"]:
+            e["solved"][mid] = sum(1 for p in e["problems"] if p["problem_cf_id"] not in pending_set)
+
+
+def _set_contests(data: dict[str, Any], contests: list[dict[str, Any]]) -> None:
+    entries = [e for e in (_contest_entry(c) for c in contests) if e is not None]
+    # Queue order: newest first; stable, so same-date contests keep file order
+    entries.sort(key=lambda e: e["contest_date"], reverse=True)
+    data["contests"] = entries
+
+
+def _save(data: dict[str, Any]) -> None:
+    global _cache_mtime, _cache
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    _cache = data
+    _cache_mtime = INDEX_FILE.stat().st_mtime_ns
+
+
+def rebuild() -> dict[str, Any]:
+    """Recompute the whole index from contests.json and team.json."""
+    data: dict[str, Any] = {
+        "format": FORMAT,
+        "contests_version": _version(CONTESTS_FILE),
+        "team_version": _version(TEAM_FILE),
+        "members": {},
+    }
+    _set_contests(data, _read_json(CONTESTS_FILE, {"contests": []}).get("contests", []))
+    for m in _read_json(TEAM_FILE, {"members": []}).get("members", []):
+        _set_member(data, m)
+    _save(data)
+    return data
+
+
+def _sync_team(data: dict[str, Any]) -> None:
+    """Refresh members whose key changed and drop members no longer on the team."""
+    members = _read_json(TEAM_FILE, {"members": []}).get("members", [])
+    current = {str(m["id"]) for m in members}
+    for mid in list(data["members"]):
+        if mid not in current:
+            del data["members"][mid]
+            for e in data["contests"]:
+                e["solved"].pop(mid, None)
+    for m in members:
+        stored = data["members"].get(str(m["id"]))
+        if stored is None or stored["key"] != _member_key(m):
+            _set_member(data, m)
+    data["team_version"] = _version(TEAM_FILE)
+
+
+def load() -> dict[str, Any]:
+    """Return the index, catching up with any contests.json / team.json edits."""
+    global _cache_mtime, _cache
+    if not INDEX_FILE.exists():
+        return rebuild()
+    mtime = INDEX_FILE.stat().st_mtime_ns
+    if mtime != _cache_mtime:
+        with open(INDEX_FILE, "r", encoding="utf-8") as f:
+            _cache = json.load(f)
+        _cache_mtime = mtime
+    if _cache.get("format") != FORMAT or _cache.get("contests_version") != _version(CONTESTS_FILE):
+        return rebuild()
+    if _cache.get("team_version") != _version(TEAM_FILE):
+        data = dict(_cache)
+        _sync_team(data)
+        _save(data)
+    return _cache
+
+
+def pending_sets() -> dict[int, set[str]]:
+    """Each member's pending problem CF IDs as a set, built once per index version."""
+    global _pending_cache
+    index = load()
+    if _pending_cache is None or _pending_cache[0] != _cache_mtime:
+        _pending_cache = (
+            _cache_mtime,
+            {int(mid): set(info["pending"]) for mid, info in index["members"].items()},
+        )
+    return _pending_cache[1]
+
+
+def apply_contest_change(
+    contests: list[dict[str, Any]], contest_id: str, contest: dict[str, Any] | None
+) -> None:
+    """Update the index after contests.json was saved.
+
+    `contests` is the saved list; pass the new contest dict after a create,
+    update or (un)dismissal, or None after a delete. Only the pending sets of
+    the contest's old and new participants are recomputed. If the index
+    doesn't cover exactly the other contests, it is rebuilt instead.
+    """
+    if not INDEX_FILE.exists():
+        rebuild()
+        return
+    with open(INDEX_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT:
+        rebuild()
+        return
+    by_id = {e["contest_id"]: e for e in data["contests"]}
+    indexed_others = set(by_id) - {contest_id}
+    others_with_participants = {
+        c["id"] for c in contests if c["id"] != contest_id and _contest_entry(c) is not None
+    }
+    if indexed_others != others_with_participants:
+        rebuild()
+        return
+
+    affected = set(by_id[contest_id]["participant_ids"]) if contest_id in by_id else set()
+    by_id.pop(contest_id, None)
+    if contest is not None:
+        entry = _contest_entry(contest)
+        if entry is not None:
+            by_id[contest_id] = entry
+            affected.update(entry["participant_ids"])
+    # Re-sort from contests.json order so same-date ties match a full rebuild
+    data["contests"] = [by_id[c["id"]] for c in contests if c["id"] in by_id]
+    data["contests"].sort(key=lambda e: e["contest_date"], reverse=True)
+    data["contests_version"] = _version(CONTESTS_FILE)
+
+    if affected:
+        if data.get("team_version") != _version(TEAM_FILE):
+            _sync_team(data)
+        for m in _read_json(TEAM_FILE, {"members": []}).get("members", []):
+            if m["id"] in affected:
+                _set_member(data, m)
+    _save(data)
+
+
+def record_member_sync(member: dict[str, Any]) -> None:
+    """Refresh one member's pending set after a sync saved their new accepts."""
+    if not INDEX_FILE.exists():
+        rebuild()
+        return
+    with open(INDEX_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FORMAT or data.get("contests_version") != _version(CONTESTS_FILE):
+        rebuild()
+        return
+    _set_member(data, member)
+    # team_version is left alone: other members may have changed too, and
+    # load() will compare their keys (this member's now matches)
+    _save(data)
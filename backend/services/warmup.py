@@ -0,0 +1,120 @@
+"""Background warm-up of slow startup work, with per-component readiness.
+
+The lifespan hook submits each component's loader to a small thread pool
+and starts serving immediately. Routes that need a component check
+`retry_after()` and answer 503 with a Retry-After header until it is ready;
+/api/health reports every component's state.
+
+A component that fails to warm up is not retried in the background: its
+routes fall back to loading on first use (and report their own errors).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+RETRY_AFTER_SECONDS = 5
+
+
+def _warm_graph() -> None:
+    from . import curated_subgraph, graph_clusters, graph_store
+
+    if not (DATA_DIR / "graph.json").exists():
+        from .graph_builder import build_curated_graph
+
+        logger.info("graph.json missing, building curated graph...")
+        if not build_curated_graph():
+            raise RuntimeError("curated graph could not be built")
+    graph_store.load_adjacency()
+    curated_subgraph.ensure()
+    graph_clusters.ensure()
+
+
+def _warm_embeddings() -> None:
+    from .note_embeddings import _load_index
+
+    _load_index()
+
+
+def _warm_search() -> None:
+    from . import hybrid_search
+
+    # Builds the BM25 index and attaches stored vectors; missing note
+    # vectors are embedded by the backfill thread this starts
+    hybrid_search.get_index()
+
+
+def _warm_cosmos() -> None:
+    from . import artifacts, cosmos_space, cosmos_tiles
+
+    cosmos_space.load()
+    if cosmos_tiles.ensure_built():
+        for path in (cosmos_tiles.POSITIONS_FILE, cosmos_tiles.MANIFEST_FILE, cosmos_tiles.NAMES_FILE):
+            artifacts.ensure_compressed(path)
+            artifacts.digest(path)
+
+
+COMPONENTS: dict[str, Callable[[], None]] = {
+    "graph": _warm_graph,
+    "embeddings": _warm_embeddings,
+    "search": _warm_search,
+    "cosmos": _warm_cosmos,
+}
+
+_lock = threading.Lock()
+_state: dict[str, dict[str, Any]] = {
+    name: {"status": "pending", "seconds": None, "error": None} for name in COMPONENTS
+}
+_executor: ThreadPoolExecutor | None = None
+
+
+def _run(name: str) -> None:
+    with _lock:
+        _state[name]["status"] = "loading"
+    start = time.perf_counter()
+    try:
+        COMPONENTS[name]()
+        status, error = "ready", None
+        logger.info(f"Warm-up: {name} ready in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        status, error = "failed", str(e)
+        logger.warning(f"Warm-up: {name} failed: {e}")
+    with _lock:
+        _state[name].update(status=status, seconds=round(time.perf_counter() - start, 3), error=error)
+
+
+def start() -> None:
+    """Submit every component's warm-up to the background pool."""
+    global _executor
+    if _executor is not None:
+        return
+    _executor = ThreadPoolExecutor(max_workers=len(COMPONENTS), thread_name_prefix="warmup")
+    for name in COMPONENTS:
+        _executor.submit(_run, name)
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def status() -> dict[str, dict[str, Any]]:
+    """Snapshot of every component's status, warm-up time and error."""
+    with _lock:
+        return {name: dict(s) for name, s in _state.items()}
+
+
+def retry_after(name: str) -> int | None:
+    """Seconds a client should wait if `name` is still warming up, else None."""
+    with _lock:
+        if _executor is not None and _state[name]["status"] in ("pending", "loading"):
+            return RETRY_AFTER_SECONDS
+    return None
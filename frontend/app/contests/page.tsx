@@ -11,7 +11,8 @@ import { TrendBarChart } from "@/components/trend-bar-chart";
 import { TrendLineChart } from "@/components/trend-line-chart";
 
 export default function Contests() {
-  const { contests, loading, error, refetch } = useContests();
+  const { contests, total, hasMore, loading, loadingMore, error, refetch, loadMore } =
+    useContests();
   const { members, loading: membersLoading } = useTeam();
   const [trends, setTrends] = useState<TrendsResponse | null>(null);
   const [showForm, setShowForm] = useState(false);
@@ -80,7 +81,7 @@ export default function Contests() {
         <div>
           <h1 className="font-heading text-2xl font-bold">Contests</h1>
           <p className="mt-1 text-sm text-muted">
-            {contests.length} virtual contest{contests.length !== 1 ? "s" : ""}{" "}
+            {total} virtual contest{total !== 1 ? "s" : ""}{" "}
             logged
           </p>
         </div>
@@ -156,6 +157,16 @@ export default function Contests() {
               onDelete={handleDelete}
             />
           ))}
+          {hasMore && (
+            <button
+              type="button"
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="w-full rounded-md border border-border bg-surface py-2 text-[13px] text-muted transition-all hover:text-foreground disabled:opacity-50"
+            >
+              {loadingMore ? "Loading..." : `Load more (${contests.length} of ${total})`}
+            </button>
+          )}
         </div>
       )}
 
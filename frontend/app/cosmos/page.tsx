@@ -1,9 +1,10 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
 import dynamic from "next/dynamic";
 import { api } from "@/lib/api";
-import type { CosmosData } from "@/lib/types";
+import { decodeCosmosTile, tilesToProblems, type DecodedTile } from "@/lib/cosmos";
+import type { CosmosManifest, CosmosNames, CosmosProblem } from "@/lib/types";
 
 const CosmosView = dynamic(
   () =>
@@ -11,16 +12,90 @@ const CosmosView = dynamic(
   { ssr: false },
 );
 
+/** Delay between background fetches of tiles the viewport hasn't asked for yet */
+const BACKGROUND_FILL_MS = 300;
+
 export default function CosmosPage() {
-  const [data, setData] = useState<CosmosData | null>(null);
+  const [manifest, setManifest] = useState<CosmosManifest | null>(null);
+  const [tiles, setTiles] = useState<DecodedTile[]>([]);
+  const [names, setNames] = useState<CosmosNames | null>(null);
   const [error, setError] = useState<string | null>(null);
+  const requested = useRef(new Set<string>());
+  /** Decoded points per tile id, for the names they were decoded with */
+  const tilePoints = useRef({ names: null as CosmosNames | null, byTile: new Map<string, CosmosProblem[]>() });
+
+  /** Fetch and decode tiles not requested yet; false if the fetch failed */
+  const loadTiles = useCallback(async (m: CosmosManifest, ids: string[]) => {
+    const byId = new Map(m.tiles.map((t) => [t.id, t]));
+    const fresh = ids.filter((id) => byId.has(id) && !requested.current.has(id));
+    if (fresh.length === 0) return true;
+    fresh.forEach((id) => requested.current.add(id));
+    try {
+      const decoded = await Promise.all(
+        fresh.map(async (id) =>
+          decodeCosmosTile(m, byId.get(id)!, await api.getCosmosTile(id, m.version)),
+        ),
+      );
+      setTiles((prev) => [...prev, ...decoded]);
+      return true;
+    } catch {
+      // Let the refiner / background fill retry these later
+      fresh.forEach((id) => requested.current.delete(id));
+      return false;
+    }
+  }, []);
 
+  // Coarse root tile first; names (for tooltips/search) load alongside
   useEffect(() => {
     api
-      .getCosmosData()
-      .then(setData)
+      .getCosmosManifest()
+      .then(async (m) => {
+        setManifest(m);
+        if (m.tiles.length > 0 && !(await loadTiles(m, [m.tiles[0].id]))) {
+          setError("Could not load the cosmos point tiles.");
+        }
+      })
       .catch((err: Error) => setError(err.message));
-  }, []);
+    api
+      .getCosmosNames()
+      .then(setNames)
+      .catch(() => {});
+  }, [loadTiles]);
+
+  // Fill in the tiles the viewport didn't need, coarsest first, so search covers everything
+  useEffect(() => {
+    if (!manifest || tiles.length === 0) return;
+    const next = manifest.tiles.find((t) => !requested.current.has(t.id));
+    if (!next) return;
+    const timer = setTimeout(() => loadTiles(manifest, [next.id]), BACKGROUND_FILL_MS);
+    return () => clearTimeout(timer);
+  }, [manifest, tiles, loadTiles]);
+
+  // Each tile is decoded once, and new tiles land at the end, so ProblemCloud
+  // only has to write the new points (names arriving re-decodes everything once)
+  const problems = useMemo(() => {
+    if (!manifest) return [];
+    const cache = tilePoints.current;
+    if (cache.names !== names) {
+      cache.names = names;
+      cache.byTile = new Map();
+    }
+    return tiles.flatMap((t) => {
+      let points = cache.byTile.get(t.tile.id);
+      if (!points) {
+        points = tilesToProblems(manifest, [t], names);
+        cache.byTile.set(t.tile.id, points);
+      }
+      return points;
+    });
+  }, [manifest, tiles, names]);
+  const loadedTiles = useMemo(() => new Set(tiles.map((t) => t.tile.id)), [tiles]);
+  const requestTiles = useCallback(
+    (ids: string[]) => {
+      if (manifest) loadTiles(manifest, ids);
+    },
+    [manifest, loadTiles],
+  );
 
   if (error) {
     return (
@@ -42,7 +117,7 @@ export default function CosmosPage() {
     );
   }
 
-  if (!data) {
+  if (!manifest || tiles.length === 0) {
     return (
       <div className="flex h-[calc(100vh-57px)] items-center justify-center">
         <div className="text-center">
@@ -57,7 +132,12 @@ export default function CosmosPage() {
 
   return (
     <div className="h-[calc(100vh-57px)] w-full">
-      <CosmosView data={data} />
+      <CosmosView
+        problems={problems}
+        manifest={manifest}
+        loadedTiles={loadedTiles}
+        onRequestTiles={requestTiles}
+      />
     </div>
   );
 }
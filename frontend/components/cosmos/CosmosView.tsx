@@ -4,9 +4,10 @@ import { useState, useCallback, useMemo, useRef, useEffect } from "react";
 import { Canvas, useThree, useFrame } from "@react-three/fiber";
 import { OrbitControls } from "@react-three/drei";
 import * as THREE from "three";
-import type { CosmosProblem, CosmosData } from "@/lib/types";
+import type { CosmosManifest, CosmosProblem, CosmosTile } from "@/lib/types";
 import type { GraphNeighbor } from "@/lib/types";
 import { api } from "@/lib/api";
+import { tilesToRefine } from "@/lib/cosmos";
 import { ProblemCloud } from "./ProblemCloud";
 import { ProblemEdges } from "./ProblemEdges";
 import { CosmosSearch } from "./CosmosSearch";
@@ -45,6 +46,48 @@ function CameraController({
   return null;
 }
 
+/** Seconds between viewport checks for tiles that need refining */
+const REFINE_INTERVAL_S = 0.5;
+
+/** Requests finer LOD tiles for the part of the cloud the camera is looking at */
+function TileRefiner({
+  manifest,
+  loadedTiles,
+  onRequestTiles,
+}: {
+  manifest: CosmosManifest;
+  loadedTiles: Set<string>;
+  onRequestTiles: (ids: string[]) => void;
+}) {
+  const { camera } = useThree();
+  const lastCheck = useRef(-Infinity);
+  const frustum = useMemo(() => new THREE.Frustum(), []);
+  const box = useMemo(() => new THREE.Box3(), []);
+  const matrix = useMemo(() => new THREE.Matrix4(), []);
+
+  useFrame(({ clock }) => {
+    const now = clock.getElapsedTime();
+    if (now - lastCheck.current < REFINE_INTERVAL_S) return;
+    lastCheck.current = now;
+
+    matrix.multiplyMatrices(camera.projectionMatrix, camera.matrixWorldInverse);
+    frustum.setFromProjectionMatrix(matrix);
+    const inView = (tile: CosmosTile) =>
+      frustum.intersectsBox(
+        box.set(new THREE.Vector3(...tile.min), new THREE.Vector3(...tile.max)),
+      );
+    const ids = tilesToRefine(
+      manifest,
+      loadedTiles,
+      [camera.position.x, camera.position.y, camera.position.z],
+      inView,
+    );
+    if (ids.length > 0) onRequestTiles(ids);
+  });
+
+  return null;
+}
+
 /** Background star particles */
 function Starfield() {
   const geometry = useMemo(() => {
@@ -78,10 +121,19 @@ function Starfield() {
 }
 
 interface CosmosViewProps {
-  data: CosmosData;
+  /** Problems decoded from the tiles loaded so far */
+  problems: CosmosProblem[];
+  manifest: CosmosManifest;
+  loadedTiles: Set<string>;
+  onRequestTiles: (ids: string[]) => void;
 }
 
-export function CosmosView({ data }: CosmosViewProps) {
+export function CosmosView({
+  problems,
+  manifest,
+  loadedTiles,
+  onRequestTiles,
+}: CosmosViewProps) {
   const [hoveredProblem, setHoveredProblem] = useState<CosmosProblem | null>(null);
   const [hoveredScreenPos, setHoveredScreenPos] = useState<{ x: number; y: number } | null>(null);
   const [selectedProblem, setSelectedProblem] = useState<CosmosProblem | null>(null);
@@ -92,11 +144,11 @@ export function CosmosView({ data }: CosmosViewProps) {
   // Build lookup map: "contestId/index" -> problem
   const problemMap = useMemo(() => {
     const map = new Map<string, CosmosProblem>();
-    for (const p of data.problems) {
+    for (const p of problems) {
       map.set(p.id, p);
     }
     return map;
-  }, [data.problems]);
+  }, [problems]);
 
   // Fetch neighbors when a problem is selected/hovered
   const fetchNeighbors = useCallback(async (problem: CosmosProblem) => {
@@ -128,6 +180,8 @@ export function CosmosView({ data }: CosmosViewProps) {
 
   const handleClick = useCallback(
     (problem: CosmosProblem) => {
+      // IDs arrive with the names table; nothing to select before that
+      if (!problem.id) return;
       if (selectedProblem?.id === problem.id) {
         // Double-click: open on Codeforces
         const url = `https://codeforces.com/problemset/problem/${problem.id}`;
@@ -164,14 +218,19 @@ export function CosmosView({ data }: CosmosViewProps) {
       onMouseMove={handleMouseMove}
     >
       {/* Search overlay */}
-      <CosmosSearch problems={data.problems} onSelect={handleSearch} />
+      <CosmosSearch problems={problems} onSelect={handleSearch} />
 
       {/* Stats overlay */}
       <div className="absolute right-4 top-4 z-10 rounded-lg border border-border bg-[#0a0a0f]/80 px-4 py-2.5 text-[12px] text-dim backdrop-blur-sm">
         <span className="font-mono text-foreground">
-          {data.meta.total.toLocaleString()}
+          {manifest.total.toLocaleString()}
         </span>{" "}
         problems
+        {problems.length < manifest.total && (
+          <span className="ml-1 text-dim/60">
+            ({problems.length.toLocaleString()} loaded)
+          </span>
+        )}
       </div>
 
       {/* Selected problem info */}
@@ -244,7 +303,7 @@ export function CosmosView({ data }: CosmosViewProps) {
         <Starfield />
 
         <ProblemCloud
-          problems={data.problems}
+          problems={problems}
           highlightedId={activeProblem?.id ?? null}
           onHover={handleHover}
           onClick={handleClick}
@@ -258,6 +317,12 @@ export function CosmosView({ data }: CosmosViewProps) {
           />
         )}
 
+        <TileRefiner
+          manifest={manifest}
+          loadedTiles={loadedTiles}
+          onRequestTiles={onRequestTiles}
+        />
+
         <CameraController
           target={flyTarget}
           onArrived={() => setFlyTarget(null)}
@@ -1,6 +1,6 @@
 "use client";
 
-import { useRef, useMemo, useCallback } from "react";
+import { useRef, useMemo, useCallback, useEffect } from "react";
 import { useFrame, useThree, type ThreeEvent } from "@react-three/fiber";
 import * as THREE from "three";
 import type { CosmosProblem } from "@/lib/types";
@@ -100,15 +100,41 @@ export function ProblemCloud({
   const materialRef = useRef<THREE.ShaderMaterial>(null);
   const { camera, raycaster } = useThree();
 
-  // Build buffer attributes
-  const { positions, colors, sizes, geometry } = useMemo(() => {
+  // Point buffers, grown by doubling. Tiles only ever append problems, so an
+  // update usually writes just the new tail instead of rebuilding everything.
+  const cloudRef = useRef<{
+    geometry: THREE.BufferGeometry;
+    capacity: number;
+    written: CosmosProblem[];
+  } | null>(null);
+
+  const geometry = useMemo(() => {
     const count = problems.length;
-    const pos = new Float32Array(count * 3);
-    const col = new Float32Array(count * 3);
-    const siz = new Float32Array(count);
+    let cloud = cloudRef.current;
+    let from = 0;
+    if (cloud && count <= cloud.capacity) {
+      const prev = cloud.written.length;
+      if (prev <= count && (prev === 0 || problems[prev - 1] === cloud.written[prev - 1])) from = prev;
+    } else {
+      const capacity = Math.max(count, 2 * (cloud?.capacity ?? 0));
+      const geo = new THREE.BufferGeometry();
+      geo.setAttribute("position", new THREE.BufferAttribute(new Float32Array(capacity * 3), 3));
+      geo.setAttribute("aColor", new THREE.BufferAttribute(new Float32Array(capacity * 3), 3));
+      geo.setAttribute("aSize", new THREE.BufferAttribute(new Float32Array(capacity), 1));
+      cloud = { geometry: geo, capacity, written: [] };
+      cloudRef.current = cloud;
+    }
+
+    const geo = cloud.geometry;
+    const position = geo.getAttribute("position") as THREE.BufferAttribute;
+    const color = geo.getAttribute("aColor") as THREE.BufferAttribute;
+    const size = geo.getAttribute("aSize") as THREE.BufferAttribute;
+    const pos = position.array as Float32Array;
+    const col = color.array as Float32Array;
+    const siz = size.array as Float32Array;
     const tmpColor = new THREE.Color();
 
-    for (let i = 0; i < count; i++) {
+    for (let i = from; i < count; i++) {
       const p = problems[i];
       pos[i * 3] = p.x;
       pos[i * 3 + 1] = p.y;
@@ -122,14 +148,27 @@ export function ProblemCloud({
       siz[i] = ratingToSize(p.rating);
     }
 
-    const geo = new THREE.BufferGeometry();
-    geo.setAttribute("position", new THREE.BufferAttribute(pos, 3));
-    geo.setAttribute("aColor", new THREE.BufferAttribute(col, 3));
-    geo.setAttribute("aSize", new THREE.BufferAttribute(siz, 1));
+    // Upload only the rows written above
+    for (const attr of [position, color, size]) {
+      attr.clearUpdateRanges();
+      attr.addUpdateRange(from * attr.itemSize, (count - from) * attr.itemSize);
+      attr.needsUpdate = true;
+    }
+    geo.setDrawRange(0, count);
+    if (from === 0 || !geo.boundingSphere) {
+      geo.computeBoundingSphere();
+    } else {
+      const v = new THREE.Vector3();
+      for (let i = from; i < count; i++) geo.boundingSphere.expandByPoint(v.fromArray(pos, i * 3));
+    }
 
-    return { positions: pos, colors: col, sizes: siz, geometry: geo };
+    cloud.written = problems;
+    return geo;
   }, [problems]);
 
+  // The buffers are replaced when they outgrow their capacity; free the old GPU buffers
+  useEffect(() => () => geometry.dispose(), [geometry]);
+
   // Highlight effect: pulse the highlighted point
   useFrame(({ clock }) => {
     if (!materialRef.current) return;
@@ -5,7 +5,7 @@ import { useContests, useUpsolve } from "@/lib/hooks";
 import { ProgressBar } from "@/components/progress-bar";
 
 export function VirtualContestsPanel() {
-  const { contests, loading: cLoading } = useContests();
+  const { contests, total, loading: cLoading } = useContests();
   const { queue, stats, loading: uLoading } = useUpsolve();
   const [expanded, setExpanded] = useState(false);
 
@@ -29,7 +29,7 @@ export function VirtualContestsPanel() {
             {loading
               ? "Loading..."
               : stats
-                ? `${contests.length} contests logged • ${stats.total_pending} problems pending`
+                ? `${total} contests logged • ${stats.total_pending} problems pending`
                 : "Track virtual contest performance"}
           </p>
         </div>
@@ -78,7 +78,7 @@ export function VirtualContestsPanel() {
                 <div className="grid grid-cols-3 gap-3">
                   <div className="rounded-md border border-border bg-background p-3 text-center">
                     <div className="text-[20px] font-bold text-foreground">
-                      {contests.length}
+                      {total}
                     </div>
                     <div className="text-[10px] text-muted">Contests</div>
                   </div>
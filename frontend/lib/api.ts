@@ -7,10 +7,16 @@ import type {
   LCSyncResult,
   GraphMeta,
   GraphNeighbor,
+  KHopResponse,
+  SimilarityPath,
   CuratedSubgraph,
+  GraphClusters,
+  GraphClusterDetail,
   CosmosData,
   ComposeResponse,
+  TrioCoverageResponse,
   VirtualContest,
+  ContestPage,
   ContestCreatePayload,
   ContestUpdatePayload,
   TrendsResponse,
@@ -29,6 +35,7 @@ import type {
   WeeklySummaryResponse,
   CustomTag,
   ProblemNote,
+  NoteSearchResult,
   TopicJournal,
   NoteRecommendation,
   CustomJournalTopic,
@@ -38,6 +45,12 @@ import type {
   ComboRanking,
   SuggestResponse,
   ComboTimelineResponse,
+  SearchHit,
+  SearchResponse,
+  HealthResponse,
+  CosmosManifest,
+  CosmosNames,
+  CosmosQueryResponse,
 } from "./types";
 
 async function fetchJSON<T>(path: string, init?: RequestInit): Promise<T> {
@@ -62,7 +75,7 @@ export function parseProblemId(id: string): {
 }
 
 export const api = {
-  health: () => fetchJSON<{ status: string }>("/api/health"),
+  health: () => fetchJSON<HealthResponse>("/api/health"),
 
   getProblems: () => fetchJSON<Problem[]>("/api/problems/"),
 
@@ -101,12 +114,95 @@ export const api = {
       `/api/graph/neighbors/${contestId}/${index}?limit=${limit}`,
     ),
 
+  getKHop: (contestId: number, index: string, k = 2, minScore = 0, limit = 200) =>
+    fetchJSON<KHopResponse>(
+      `/api/graph/khop/${contestId}/${index}?k=${k}&min_score=${minScore}&limit=${limit}`,
+    ),
+
+  getSimilarityPath: (source: string, target: string, minScore = 0) =>
+    fetchJSON<SimilarityPath>(
+      `/api/graph/path?source=${encodeURIComponent(source)}&target=${encodeURIComponent(target)}&min_score=${minScore}`,
+    ),
+
+  getClusters: () => fetchJSON<GraphClusters>("/api/graph/clusters"),
+
+  getCluster: (clusterId: number, limit = 500) =>
+    fetchJSON<GraphClusterDetail>(`/api/graph/clusters/${clusterId}?limit=${limit}`),
+
   getCosmosData: () => fetchJSON<CosmosData>("/api/graph/cosmos"),
 
+  getCosmosManifest: () => fetchJSON<CosmosManifest>("/api/graph/cosmos/manifest"),
+
+  getCosmosNames: () => fetchJSON<CosmosNames>("/api/graph/cosmos/names"),
+
+  /** Box / radius / k-nearest query in 3D UMAP space */
+  queryCosmos: (
+    query:
+      | { mode: "box"; min: [number, number, number]; max: [number, number, number] }
+      | { mode: "radius"; center?: [number, number, number]; problemId?: string; r: number }
+      | { mode: "knn"; center?: [number, number, number]; problemId?: string; k?: number },
+    limit?: number,
+  ) => {
+    const params = new URLSearchParams({ mode: query.mode });
+    if (query.mode === "box") {
+      params.set("min", query.min.join(","));
+      params.set("max", query.max.join(","));
+    } else {
+      if (query.center) params.set("center", query.center.join(","));
+      if (query.problemId) params.set("problem_id", query.problemId);
+      if (query.mode === "radius") params.set("r", query.r.toString());
+      if (query.mode === "knn" && query.k) params.set("k", query.k.toString());
+    }
+    if (limit) params.set("limit", limit.toString());
+    return fetchJSON<CosmosQueryResponse>(`/api/graph/cosmos/query?${params}`);
+  },
+
+  /** Raw tile bytes; decode with decodeCosmosTile from lib/cosmos */
+  getCosmosTile: async (tileId: string, version: string): Promise<ArrayBuffer> => {
+    const res = await fetch(`/api/graph/cosmos/tiles/${tileId}?v=${encodeURIComponent(version)}`);
+    if (!res.ok) {
+      const text = await res.text().catch(() => "Unknown error");
+      throw new Error(`API error ${res.status}: ${text}`);
+    }
+    return res.arrayBuffer();
+  },
+
   compose: () =>
     fetchJSON<ComposeResponse>("/api/team/compose", { method: "POST" }),
 
-  getContests: () => fetchJSON<VirtualContest[]>("/api/contests/"),
+  getTrioCoverage: (memberIds?: number[], limit = 50) => {
+    const params = new URLSearchParams({ limit: String(limit) });
+    memberIds?.forEach((id) => params.append("member_ids", String(id)));
+    return fetchJSON<TrioCoverageResponse>(`/api/team/trio-coverage?${params}`);
+  },
+
+  getContests: async (options?: {
+    cursor?: string;
+    limit?: number;
+    dateFrom?: string;
+    dateTo?: string;
+    teamLabel?: string;
+  }): Promise<ContestPage> => {
+    const params = new URLSearchParams();
+    if (options?.cursor) params.set("cursor", options.cursor);
+    if (options?.limit) params.set("limit", options.limit.toString());
+    if (options?.dateFrom) params.set("date_from", options.dateFrom);
+    if (options?.dateTo) params.set("date_to", options.dateTo);
+    if (options?.teamLabel) params.set("team_label", options.teamLabel);
+
+    const query = params.toString();
+    const res = await fetch(`/api/contests/${query ? `?${query}` : ""}`);
+    if (!res.ok) {
+      const text = await res.text().catch(() => "Unknown error");
+      throw new Error(`API error ${res.status}: ${text}`);
+    }
+    const contests = (await res.json()) as VirtualContest[];
+    return {
+      contests,
+      nextCursor: res.headers.get("X-Next-Cursor"),
+      total: Number(res.headers.get("X-Total-Count") ?? contests.length),
+    };
+  },
 
   getContest: (id: string) => fetchJSON<VirtualContest>(`/api/contests/${id}`),
 
@@ -134,9 +230,20 @@ export const api = {
   getCFContestInfo: (contestId: number) =>
     fetchJSON<CFContestInfo>(`/api/codeforces/contest/${contestId}`),
 
-  getUpsolveQueue: () => fetchJSON<UpsolveQueueResponse>("/api/upsolve/"),
+  getUpsolveQueue: (options?: { memberId?: number; offset?: number; limit?: number }) => {
+    const params = new URLSearchParams();
+    if (options?.memberId !== undefined) params.set("member_id", options.memberId.toString());
+    if (options?.offset) params.set("offset", options.offset.toString());
+    if (options?.limit) params.set("limit", options.limit.toString());
 
-  getUpsolveStats: () => fetchJSON<UpsolveStatsResponse>("/api/upsolve/stats"),
+    const query = params.toString();
+    return fetchJSON<UpsolveQueueResponse>(`/api/upsolve/${query ? `?${query}` : ""}`);
+  },
+
+  getUpsolveStats: (memberId?: number) =>
+    fetchJSON<UpsolveStatsResponse>(
+      `/api/upsolve/stats${memberId !== undefined ? `?member_id=${memberId}` : ""}`
+    ),
 
   dismissUpsolve: (contestId: string, problemIndex: string) =>
     fetchJSON<{ status: string }>("/api/upsolve/dismiss", {
@@ -200,9 +307,9 @@ export const api = {
       `/api/regionals/recommendations?top_n=${topN}`
     ),
 
-  refreshRegionals: (limit: number = 50) =>
+  refreshRegionals: (limit: number = 50, restart = false) =>
     fetchJSON<{ message: string; metadata: any }>(
-      `/api/regionals/refresh?limit=${limit}`,
+      `/api/regionals/refresh?limit=${limit}${restart ? "&restart=true" : ""}`,
       { method: "POST" }
     ),
 
@@ -305,6 +412,18 @@ export const api = {
       method: "DELETE",
     }),
 
+  searchNotes: (
+    query: string,
+    options?: { memberId?: number; problemId?: string; limit?: number },
+  ) => {
+    const params = new URLSearchParams({ q: query });
+    if (options?.memberId !== undefined)
+      params.set("member_id", options.memberId.toString());
+    if (options?.problemId) params.set("problem_id", options.problemId);
+    if (options?.limit) params.set("limit", options.limit.toString());
+    return fetchJSON<NoteSearchResult[]>(`/api/notes/search?${params}`);
+  },
+
   getNoteRecommendations: (memberId: number, problemId: string, limit = 10) =>
     fetchJSON<NoteRecommendation[]>(
       `/api/notes/member/${memberId}/problem/${problemId}/recommend?limit=${limit}`,
@@ -405,6 +524,20 @@ export const api = {
     );
   },
 
+  // --- Hybrid Search ---
+
+  search: (
+    query: string,
+    options?: { kinds?: SearchHit["kind"][]; memberId?: number; limit?: number },
+  ) => {
+    const params = new URLSearchParams({ q: query });
+    options?.kinds?.forEach((k) => params.append("kinds", k));
+    if (options?.memberId !== undefined)
+      params.set("member_id", options.memberId.toString());
+    if (options?.limit) params.set("limit", options.limit.toString());
+    return fetchJSON<SearchResponse>(`/api/search/?${params}`);
+  },
+
   // --- Solve Quality ---
 
   getSolveQuality: (memberId: number) =>
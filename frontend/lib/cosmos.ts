@@ -0,0 +1,91 @@
+import type { CosmosManifest, CosmosNames, CosmosProblem, CosmosTile } from "./types";
+
+/** Columns of one decoded tile (little-endian, as served by the API) */
+export interface DecodedTile {
+  tile: CosmosTile;
+  xyz: Float32Array;
+  tagMask: Uint32Array;
+  rating: Uint16Array;
+}
+
+/** Split a tile payload into its xyz / tag bitmask / rating columns */
+export function decodeCosmosTile(
+  manifest: CosmosManifest,
+  tile: CosmosTile,
+  buffer: ArrayBuffer,
+): DecodedTile {
+  const n = tile.count;
+  const words = manifest.tag_words;
+  const tagsOffset = n * 3 * 4;
+  const ratingOffset = tagsOffset + n * words * 4;
+  return {
+    tile,
+    xyz: new Float32Array(buffer, 0, n * 3),
+    tagMask: new Uint32Array(buffer, tagsOffset, n * words),
+    rating: new Uint16Array(buffer, ratingOffset, n),
+  };
+}
+
+/** Expand decoded tiles into CosmosProblems; IDs/names are blank until the names table loads */
+export function tilesToProblems(
+  manifest: CosmosManifest,
+  tiles: DecodedTile[],
+  names: CosmosNames | null,
+): CosmosProblem[] {
+  const words = manifest.tag_words;
+  const problems: CosmosProblem[] = [];
+  for (const { tile, xyz, tagMask, rating } of tiles) {
+    for (let i = 0; i < tile.count; i++) {
+      const tags: string[] = [];
+      for (let b = 0; b < manifest.tags.length; b++) {
+        if ((tagMask[i * words + (b >> 5)] >>> (b & 31)) & 1) tags.push(manifest.tags[b]);
+      }
+      const row = tile.start + i;
+      problems.push({
+        id: names?.ids[row] ?? "",
+        name: names?.names[row] ?? "",
+        rating: rating[i],
+        tags,
+        x: xyz[i * 3],
+        y: xyz[i * 3 + 1],
+        z: xyz[i * 3 + 2],
+      });
+    }
+  }
+  return problems;
+}
+
+/** A tile is refined once the camera is within this many tile widths of it */
+const REFINE_DISTANCE = 3;
+
+/**
+ * Children of loaded tiles that should be fetched next: inside the view
+ * (`inView` tests the tile's bounding box) and close enough to the camera
+ * that the parent's sample looks sparse. Nearest first.
+ */
+export function tilesToRefine(
+  manifest: CosmosManifest,
+  loaded: Set<string>,
+  camera: [number, number, number],
+  inView: (tile: CosmosTile) => boolean,
+): string[] {
+  const byId = new Map(manifest.tiles.map((t) => [t.id, t]));
+  const wanted: { id: string; dist: number }[] = [];
+  for (const id of Array.from(loaded)) {
+    for (const childId of byId.get(id)?.children ?? []) {
+      const child = byId.get(childId);
+      if (!child || loaded.has(childId) || !inView(child)) continue;
+      // Distance from the camera to the child's box (0 inside it)
+      let d2 = 0;
+      for (let k = 0; k < 3; k++) {
+        const c = Math.max(child.min[k] - camera[k], 0, camera[k] - child.max[k]);
+        d2 += c * c;
+      }
+      const dist = Math.sqrt(d2);
+      if (dist <= REFINE_DISTANCE * (child.max[0] - child.min[0])) {
+        wanted.push({ id: childId, dist });
+      }
+    }
+  }
+  return wanted.sort((a, b) => a.dist - b.dist).map((w) => w.id);
+}
@@ -70,16 +70,25 @@ export function useTeam() {
   return { members, loading, error, refetch: fetchTeam };
 }
 
+const CONTEST_PAGE_SIZE = 20;
+
 export function useContests() {
   const [contests, setContests] = useState<VirtualContest[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const fetchContests = useCallback(() => {
     setLoading(true);
     api
-      .getContests()
-      .then(setContests)
+      .getContests({ limit: CONTEST_PAGE_SIZE })
+      .then((page) => {
+        setContests(page.contests);
+        setNextCursor(page.nextCursor);
+        setTotal(page.total);
+      })
       .catch((e: Error) => setError(e.message))
       .finally(() => setLoading(false));
   }, []);
@@ -88,7 +97,30 @@ export function useContests() {
     fetchContests();
   }, [fetchContests]);
 
-  return { contests, loading, error, refetch: fetchContests };
+  const loadMore = useCallback(() => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    api
+      .getContests({ cursor: nextCursor, limit: CONTEST_PAGE_SIZE })
+      .then((page) => {
+        setContests((prev) => [...prev, ...page.contests]);
+        setNextCursor(page.nextCursor);
+        setTotal(page.total);
+      })
+      .catch((e: Error) => setError(e.message))
+      .finally(() => setLoadingMore(false));
+  }, [nextCursor]);
+
+  return {
+    contests,
+    total,
+    hasMore: nextCursor !== null,
+    loading,
+    loadingMore,
+    error,
+    refetch: fetchContests,
+    loadMore,
+  };
 }
 
 export function useUpsolve() {
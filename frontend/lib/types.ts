@@ -95,6 +95,45 @@ export interface GraphNeighbor {
   shared_tags: string[];
 }
 
+/** Node within k hops, from GET /api/graph/khop/{contest_id}/{index} */
+export interface KHopNode {
+  id: string;
+  hops: number;
+  /** Previous-hop node it was reached from */
+  via: string;
+  /** Score of the via -> id edge */
+  score: number;
+  name: string | null;
+  rating: number | null;
+}
+
+/** Response from GET /api/graph/khop/{contest_id}/{index} */
+export interface KHopResponse {
+  source: string;
+  k: number;
+  min_score: number;
+  total: number;
+  nodes: KHopNode[];
+}
+
+/** Step on a similarity path; score is the edge from the previous step (null at the start) */
+export interface PathStep {
+  id: string;
+  name: string | null;
+  rating: number | null;
+  score: number | null;
+}
+
+/** Response from GET /api/graph/path */
+export interface SimilarityPath {
+  source: string;
+  target: string;
+  hops: number;
+  /** Product of the edge scores along the path */
+  similarity: number;
+  path: PathStep[];
+}
+
 /** Node in the curated subgraph from GET /api/graph/curated-subgraph */
 export interface SubgraphNode {
   id: string;
@@ -116,6 +155,38 @@ export interface CuratedSubgraph {
   edges: SubgraphEdge[];
 }
 
+/** Community from GET /api/graph/clusters (ids ordered by size, largest = 0) */
+export interface GraphCluster {
+  id: number;
+  size: number;
+  /** Top two tags, e.g. "dp / greedy" */
+  label: string;
+  top_tags: { tag: string; count: number; share: number }[];
+  rating: { min: number; median: number; max: number } | null;
+  curated: { count: number; share: number };
+  representative: { id: string; name: string | null };
+}
+
+/** Response from GET /api/graph/clusters */
+export interface GraphClusters {
+  meta: {
+    algorithm: string;
+    iterations: number;
+    total_problems: number;
+    total_clusters: number;
+    singletons: number;
+    built_at: string;
+  };
+  clusters: GraphCluster[];
+  /** Graph key ("1352/C") -> cluster id */
+  assignments: Record<string, number>;
+}
+
+/** Response from GET /api/graph/clusters/{cluster_id} */
+export interface GraphClusterDetail extends GraphCluster {
+  members: { id: string; name: string | null; rating: number | null }[];
+}
+
 /** Problem with 3D position from UMAP projection */
 export interface CosmosProblem {
   id: string;
@@ -137,6 +208,44 @@ export interface CosmosData {
   problems: CosmosProblem[];
 }
 
+/** One octree level-of-detail tile in the Cosmos manifest */
+export interface CosmosTile {
+  id: string;
+  depth: number;
+  min: [number, number, number];
+  max: [number, number, number];
+  /** Row range [start, start + count) in stored point order */
+  start: number;
+  count: number;
+  children: string[];
+}
+
+/** Response from GET /api/graph/cosmos/manifest */
+export interface CosmosManifest {
+  version: string;
+  total: number;
+  tile_points: number;
+  tags: string[];
+  tag_words: number;
+  columns: Record<"xyz" | "tags" | "rating", { offset: number; dtype: string; width: number }>;
+  tiles: CosmosTile[];
+}
+
+/** Response from GET /api/graph/cosmos/names (stored point order) */
+export interface CosmosNames {
+  ids: string[];
+  names: string[];
+}
+
+/** Response from GET /api/graph/cosmos/query */
+export interface CosmosQueryResponse {
+  mode: "box" | "radius" | "knn";
+  total: number;
+  truncated: boolean;
+  /** radius/knn results are nearest first and carry their distance */
+  problems: (CosmosProblem & { distance?: number })[];
+}
+
 /** Month plan entry (frontend-only static data) */
 export interface MonthPlan {
   month: string;
@@ -169,6 +278,21 @@ export interface ComposeResponse {
   suggestion: TeamSuggestion;
 }
 
+/** One trio's precomputed cluster coverage */
+export interface TrioCoverage {
+  member_ids: number[];
+  member_names: string[];
+  coverage: Record<string, number>;
+  total: number;
+}
+
+/** Response from GET /api/team/trio-coverage */
+export interface TrioCoverageResponse {
+  clusters: string[];
+  total_trios: number;
+  trios: TrioCoverage[];
+}
+
 /** A sub-team participating in a virtual contest */
 export interface ContestTeamEntry {
   label: string;
@@ -199,6 +323,13 @@ export interface VirtualContest {
   solve_counts_by_team: Record<string, number>;
 }
 
+/** One page of GET /api/contests/ (cursor and total come from response headers) */
+export interface ContestPage {
+  contests: VirtualContest[];
+  nextCursor: string | null;
+  total: number;
+}
+
 /** Payload for creating a contest (POST /api/contests/) */
 export interface ContestCreatePayload {
   cf_contest_id: number;
@@ -288,6 +419,7 @@ export interface UpsolveContestGroup {
 /** Full upsolve queue response from GET /api/upsolve/ */
 export interface UpsolveQueueResponse {
   contests: UpsolveContestGroup[];
+  total_contests: number;
   total_items: number;
   total_solved: number;
   total_pending: number;
@@ -434,6 +566,8 @@ export interface RegionalsResponse {
     total_problems: number;
     successful: number;
     failed: number;
+    /** Contests carried over from an interrupted refresh */
+    resumed?: number;
     data_source?: string;
   };
 }
@@ -526,6 +660,12 @@ export interface ProblemNote {
   updated_at: string;
 }
 
+/** A note from GET /api/notes/search, with author and relevance score */
+export interface NoteSearchResult extends ProblemNote {
+  member_name: string;
+  score: number;
+}
+
 /** Single journal entry */
 export interface JournalEntry {
   id: string;
@@ -680,3 +820,37 @@ export interface ComboTimelinePoint {
 export interface ComboTimelineResponse {
   combos: Record<string, ComboTimelinePoint[]>;
 }
+
+/** One hit from GET /api/search/ (hybrid keyword + semantic search) */
+export interface SearchHit {
+  kind: "note" | "journal" | "editorial" | "statement";
+  id: string;
+  title: string;
+  snippet: string;
+  member_id: number | null;
+  problem_id: string | null;
+  url: string | null;
+  score: number;
+  keyword_rank: number | null;
+  semantic_rank: number | null;
+}
+
+/** Response from GET /api/search/ */
+export interface SearchResponse {
+  query: string;
+  semantic: boolean;
+  results: SearchHit[];
+}
+
+/** One background warm-up component in GET /api/health */
+export interface WarmupComponent {
+  status: "pending" | "loading" | "ready" | "failed";
+  seconds: number | null;
+  error: string | null;
+}
+
+/** Response from GET /api/health */
+export interface HealthResponse {
+  status: "ok" | "starting" | "degraded";
+  components: Record<string, WarmupComponent>;
+}
@@ -6,6 +6,7 @@ Usage:
     python scripts/build_graph.py --step fetch  # Only fetch from CF API
     python scripts/build_graph.py --step scrape # Only scrape statements
     python scripts/build_graph.py --step embed  # Only generate embeddings + build graph
+    python scripts/build_graph.py --step cluster # Only detect communities in the built graph
     python scripts/build_graph.py --workers 5   # Use 5 parallel scraper threads (default: 3)
 """
 
@@ -20,6 +21,8 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from backend.services.cf_client import CFClient
+from backend.services import graph_clusters
+from backend.services.curated_subgraph import ensure as build_curated_subgraph
 from backend.services.embeddings import (
     apply_boosts,
     build_faiss_index,
@@ -130,6 +133,8 @@ def step_embed(problems: list[dict], statements: dict[str, str], k: int = 20) ->
 
     print("\nSaving artifacts...")
     save_artifacts(embeddings, problem_ids, graph)
+    if build_curated_subgraph() is not None:
+        print("  Saved curated_subgraph.json")
 
     # Quality check: spot-check a few neighbors
     print("\n" + "-" * 40)
@@ -142,9 +147,30 @@ def step_embed(problems: list[dict], statements: dict[str, str], k: int = 20) ->
                 print(f"    {n['id']} (score: {n['score']}, tags: {n['shared_tags']})")
 
 
+def step_cluster() -> None:
+    """Step 4: Detect communities in the graph and summarize each one."""
+    print("\n" + "=" * 60)
+    print("STEP 4: Detecting graph communities")
+    print("=" * 60)
+
+    start = time.time()
+    if graph_clusters.ensure() is None:
+        print("No graph.json found. Run --step embed first.")
+        sys.exit(1)
+    clusters = graph_clusters.load()
+    meta = clusters["meta"]
+    print(f"  {meta['total_clusters']} clusters over {meta['total_problems']} problems "
+          f"({meta['iterations']} label propagation passes, {time.time() - start:.1f}s)")
+    print(f"  Singletons: {meta['singletons']}")
+    for c in clusters["clusters"][:10]:
+        rating = c["rating"] or {}
+        print(f"    #{c['id']:<4} {c['size']:>5} problems  {rating.get('min', '?')}-{rating.get('max', '?')}  "
+              f"curated {c['curated']['count']:>3}  {c['label']}")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Build the Codeforces problem graph")
-    parser.add_argument("--step", choices=["fetch", "scrape", "embed"], help="Run only a specific step")
+    parser.add_argument("--step", choices=["fetch", "scrape", "embed", "cluster"], help="Run only a specific step")
     parser.add_argument("--skip-scrape", action="store_true", help="Skip scraping, use cached statements")
     parser.add_argument("--workers", type=int, default=3, help="Number of parallel scraper threads (default: 3)")
     parser.add_argument("--k", type=int, default=20, help="Number of neighbors per problem (default: 20)")
@@ -169,6 +195,8 @@ def main() -> None:
         scraper = StatementScraper()
         statements = scraper.get_cached_statements()
         step_embed(problems, statements, k=args.k)
+    elif args.step == "cluster":
+        step_cluster()
     else:
         # Full pipeline
         problems = client.load_raw_problems()
@@ -185,6 +213,7 @@ def main() -> None:
             statements = step_scrape(problems, workers=args.workers)
 
         step_embed(problems, statements, k=args.k)
+        step_cluster()
 
     elapsed = time.time() - start
     mins = int(elapsed // 60)
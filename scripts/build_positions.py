@@ -1,13 +1,20 @@
 """Compute 3D positions for all CF problems using UMAP on embeddings.
 
+The fitted reducer is saved next to positions.json. Later runs keep every
+existing position and only `transform` problems that are new in
+embeddings.npy into the same layout; a full refit happens with --refit,
+when no reducer is saved, or when the UMAP settings change.
+
 Usage:
-    python scripts/build_positions.py                  # Default settings
+    python scripts/build_positions.py                  # Place new problems (fits on first run)
+    python scripts/build_positions.py --refit          # Refit UMAP on all embeddings
     python scripts/build_positions.py --neighbors 15   # UMAP n_neighbors
     python scripts/build_positions.py --min-dist 0.1   # UMAP min_dist
 """
 
 import argparse
 import json
+import pickle
 import sys
 import time
 from pathlib import Path
@@ -16,6 +23,32 @@ import numpy as np
 
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "backend" / "data"
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.artifacts import write_compressed
+from backend.services.cosmos_tiles import MANIFEST_FILE, NAMES_FILE, POINTS_FILE, write_artifacts
+
+REDUCER_PATH = DATA_DIR / "umap_reducer.pkl"
+
+
+def fit_layout(embeddings: np.ndarray, params: dict) -> dict:
+    """Fit UMAP on all embeddings; returns the reducer plus its normalization bounds."""
+    from umap import UMAP
+
+    reducer = UMAP(n_components=3, metric="cosine", random_state=42, verbose=True, **params)
+    positions_3d = reducer.fit_transform(embeddings)
+    return {
+        "reducer": reducer,
+        "params": params,
+        "lo": positions_3d.min(axis=0),
+        "hi": positions_3d.max(axis=0),
+        "raw": positions_3d,
+    }
+
+
+def normalize(positions_3d: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Map the fitted UMAP range to roughly [-50, 50] for good 3D scene scale."""
+    return (positions_3d - lo) / (hi - lo) * 100 - 50
 
 
 def main() -> None:
@@ -23,6 +56,7 @@ def main() -> None:
     parser.add_argument("--neighbors", type=int, default=15, help="UMAP n_neighbors (default: 15)")
     parser.add_argument("--min-dist", type=float, default=0.1, help="UMAP min_dist (default: 0.1)")
     parser.add_argument("--spread", type=float, default=1.0, help="UMAP spread (default: 1.0)")
+    parser.add_argument("--refit", action="store_true", help="Refit UMAP on all embeddings instead of placing new ones")
     args = parser.parse_args()
 
     start = time.time()
@@ -63,27 +97,46 @@ def main() -> None:
         key = f"{p['contestId']}/{p['index']}"
         meta_lookup[key] = p
 
-    # Run UMAP
-    print(f"\nRunning UMAP (n_neighbors={args.neighbors}, min_dist={args.min_dist}, spread={args.spread})...")
-    from umap import UMAP
-
-    reducer = UMAP(
-        n_components=3,
-        n_neighbors=args.neighbors,
-        min_dist=args.min_dist,
-        spread=args.spread,
-        metric="cosine",
-        random_state=42,
-        verbose=True,
-    )
-    positions_3d = reducer.fit_transform(embeddings)
-    print(f"  UMAP output shape: {positions_3d.shape}")
+    params = {"n_neighbors": args.neighbors, "min_dist": args.min_dist, "spread": args.spread}
+    out_path = DATA_DIR / "positions.json"
 
-    # Normalize to roughly [-50, 50] range for good 3D scene scale
-    for dim in range(3):
-        col = positions_3d[:, dim]
-        col_min, col_max = col.min(), col.max()
-        positions_3d[:, dim] = (col - col_min) / (col_max - col_min) * 100 - 50
+    saved = None
+    if not args.refit and REDUCER_PATH.exists() and out_path.exists():
+        with open(REDUCER_PATH, "rb") as f:
+            saved = pickle.load(f)
+        if saved["params"] != params:
+            print("\nUMAP settings changed since the last fit; refitting.")
+            saved = None
+
+    if saved is None:
+        print(f"\nFitting UMAP on {len(problem_ids)} problems ({params})...")
+        t0 = time.time()
+        fitted = fit_layout(embeddings, params)
+        positions_3d = normalize(fitted.pop("raw"), fitted["lo"], fitted["hi"])
+        with open(REDUCER_PATH, "wb") as f:
+            pickle.dump(fitted, f)
+        mode = "refit"
+        print(f"  UMAP fit: {time.time() - t0:.1f}s, saved reducer to {REDUCER_PATH}")
+    else:
+        # Keep existing coordinates; only place problems that are new since the last run
+        with open(out_path, "r", encoding="utf-8") as f:
+            previous = {p["id"]: p for p in json.load(f)["problems"]}
+        new_rows = [i for i, pid in enumerate(problem_ids) if pid not in previous]
+        positions_3d = np.zeros((len(problem_ids), 3), dtype=np.float32)
+        for i, pid in enumerate(problem_ids):
+            if pid in previous:
+                p = previous[pid]
+                positions_3d[i] = (p["x"], p["y"], p["z"])
+        removed = len(previous) - (len(problem_ids) - len(new_rows))
+        print(f"\nIncremental update: {len(new_rows)} new, {removed} removed, "
+              f"{len(problem_ids) - len(new_rows)} kept")
+        t0 = time.time()
+        if new_rows:
+            placed = saved["reducer"].transform(embeddings[new_rows])
+            positions_3d[new_rows] = normalize(placed, saved["lo"], saved["hi"])
+        mode = "incremental"
+        print(f"  UMAP transform: {time.time() - t0:.1f}s for {len(new_rows)} problems")
+    print(f"  Positions shape: {positions_3d.shape}")
 
     # Build output
     problems_out = []
@@ -104,18 +157,26 @@ def main() -> None:
             "total": len(problems_out),
             "n_neighbors": args.neighbors,
             "min_dist": args.min_dist,
+            "mode": mode,
         },
         "problems": problems_out,
     }
 
-    out_path = DATA_DIR / "positions.json"
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(output, f, ensure_ascii=False)
 
     size_mb = out_path.stat().st_size / (1024 * 1024)
-    elapsed = time.time() - start
     print(f"\nSaved {out_path} ({size_mb:.1f} MB, {len(problems_out)} problems)")
-    print(f"Total time: {int(elapsed)}s")
+
+    # Binary columns + octree LOD tiles for the Cosmos view
+    manifest = write_artifacts(problems_out)
+    print(f"Saved {POINTS_FILE} ({POINTS_FILE.stat().st_size / 1024:.0f} KB, {len(manifest['tiles'])} tiles)")
+
+    # Pre-compressed copies of the JSON payloads
+    for path in (out_path, MANIFEST_FILE, NAMES_FILE):
+        for written in write_compressed(path):
+            print(f"Saved {written} ({written.stat().st_size / 1024:.0f} KB)")
+    print(f"Total time ({mode}): {time.time() - start:.1f}s")
 
 
 if __name__ == "__main__":
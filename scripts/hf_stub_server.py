@@ -0,0 +1,95 @@
+"""Offline stand-in for the HuggingFace feature-extraction endpoint.
+
+Answers the same requests InferenceClient.feature_extraction sends
+({"inputs": str | [str, ...]}). It returns deterministic hashed
+bag-of-words vectors, so texts that share words come out similar. It can
+add latency and fail a share of requests with 503, so batching and
+retries can be exercised without a token or network.
+
+Usage:
+    python scripts/hf_stub_server.py                          # Listen on 127.0.0.1:8765
+    python scripts/hf_stub_server.py --latency 0.3 --fail-rate 0.2
+    HF_API_TOKEN=stub HF_INFERENCE_URL=http://127.0.0.1:8765 uvicorn main:app   # (in backend/)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def embed(text: str, dim: int) -> list[float]:
+    """Hashed bag-of-words vector: each word adds +-1 to one dimension."""
+    vec = [0.0] * dim
+    for word in text.lower().split():
+        h = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:8], "little")
+        vec[h % dim] += 1.0 if h >> 63 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+def make_handler(dim: int, latency: float, fail_rate: float) -> type[BaseHTTPRequestHandler]:
+    stats = {"requests": 0, "texts": 0, "failed": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, payload: object) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self) -> None:
+            try:
+                inputs = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))["inputs"]
+            except (ValueError, KeyError, TypeError):
+                self._reply(400, {"error": "expected {\"inputs\": str | list[str]}"})
+                return
+            texts = inputs if isinstance(inputs, list) else [inputs]
+            if latency:
+                time.sleep(latency)
+            with lock:
+                stats["requests"] += 1
+                failed = random.random() < fail_rate
+                stats["failed"] += failed
+                stats["texts"] += 0 if failed else len(texts)
+                print(f"  #{stats['requests']}: {len(texts)} texts{' -> 503' if failed else ''} "
+                      f"(served {stats['texts']} texts, {stats['failed']} failures)")
+            if failed:
+                self._reply(503, {"error": "Model is currently loading", "estimated_time": 1.0})
+                return
+            vectors = [embed(t, dim) for t in texts]
+            self._reply(200, vectors if isinstance(inputs, list) else vectors[0])
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline stand-in for HF feature extraction")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (default: 384, as all-MiniLM-L6-v2)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.dim, args.latency, args.fail_rate))
+    print(f"HF stand-in on http://{args.host}:{args.port} (dim={args.dim}, latency={args.latency}s, "
+          f"fail rate={args.fail_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
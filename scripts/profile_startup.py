@@ -0,0 +1,95 @@
+"""Report API startup cost: import time per module, then lifespan time.
+
+Runs `import main` in a fresh interpreter with `python -X importtime` and
+summarizes the result, so regressions in cold start (e.g. a router pulling in
+numpy or huggingface_hub at import time) show up without a profiler.
+
+Usage:
+    python scripts/profile_startup.py              # Top 25 modules by cumulative time
+    python scripts/profile_startup.py --top 50     # Show more modules
+    python scripts/profile_startup.py --lifespan   # Also time the app's startup hook
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+BACKEND_DIR = PROJECT_ROOT / "backend"
+
+# Dependencies that should only load on first use, not when the API boots
+DEFERRED_MODULES = ["numpy", "scipy", "faiss", "huggingface_hub", "cloudscraper", "bs4", "requests", "umap"]
+
+LIFESPAN_SNIPPET = """
+import asyncio, time
+import main
+start = time.perf_counter()
+async def run():
+    async with main.lifespan(main.app):
+        pass
+asyncio.run(run())
+print(f"LIFESPAN {time.perf_counter() - start:.6f}")
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """(module, self_us, cumulative_us, depth) for every line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile API startup imports")
+    parser.add_argument("--top", type=int, default=25, help="Modules to list (default: 25)")
+    parser.add_argument("--lifespan", action="store_true", help="Also run and time the lifespan hook")
+    args = parser.parse_args()
+
+    check = "import main, sys; print('LOADED', ' '.join(m for m in %r if m in sys.modules))" % DEFERRED_MODULES
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr)
+        sys.exit(proc.returncode)
+
+    rows = parse_importtime(proc.stderr)
+    main_row = next((r for r in rows if r[0] == "main"), None)
+    total_us = main_row[2] if main_row else sum(r[1] for r in rows)
+    print(f"import main: {total_us / 1000:.1f} ms ({len(rows)} modules)")
+
+    print(f"\nTop {args.top} modules by cumulative import time:")
+    print(f"  {'cumulative':>12}  {'self':>10}  module")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: -r[2])[:args.top]:
+        print(f"  {cumulative_us / 1000:>9.1f} ms  {self_us / 1000:>7.1f} ms  {name}")
+
+    routers = [r for r in rows if r[0].startswith("routers.")]
+    if routers:
+        print("\nRouters (cumulative, including the services they pull in):")
+        for name, _, cumulative_us, _ in sorted(routers, key=lambda r: -r[2]):
+            print(f"  {cumulative_us / 1000:>9.1f} ms  {name}")
+
+    loaded = proc.stdout.strip().split()[1:]
+    print(f"\nHeavy dependencies loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.lifespan:
+        proc = subprocess.run(
+            [sys.executable, "-c", LIFESPAN_SNIPPET],
+            cwd=BACKEND_DIR, capture_output=True, text=True,
+        )
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("LIFESPAN")), None)
+        if line is None:
+            print(proc.stderr)
+            sys.exit(1)
+        print(f"lifespan startup: {float(line.split()[1]) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()